@@ -0,0 +1,87 @@
+"""
+Import time of the generated model modules, with the star imports and with explicit_imports
+
+    python -m benchmark.import_time_benchmark --tables 200 --columns 20
+
+The project is generated once per mode, then every run imports all the model modules in a new interpreter. The
+modules shared by both modes (sqlalchemy, the dialect, pydantic, fastapi and the common package) are imported
+before the clock starts, so only the model modules are measured. The time is the best of --repeat runs
+"""
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import warnings
+from typing import Dict
+
+from src.fastapi_quickcrud_codegen import crud_router_builder
+from .generator_benchmark import DATABASE_URL, _db_model_list, load_schema
+
+IMPORT_MODEL_MODULES = """
+import json
+import sys
+import time
+
+import fastapi, pydantic, sqlalchemy, sqlalchemy.dialects.postgresql
+import common.db, common.typing, common.utils
+
+names = sys.argv[1:]
+start = time.perf_counter()
+modules = [__import__(f"model.{name}", fromlist=["*"]) for name in names]
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "module_names": sum(len(vars(i)) for i in modules) / len(modules)}))
+"""
+
+
+def _import_model_modules(project_directory: str, model_names: list) -> dict:
+    result = subprocess.run([sys.executable, "-c", IMPORT_MODEL_MODULES, *model_names], cwd=project_directory,
+                            stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(*, tables: int, columns: int, repeat: int = 5) -> dict:
+    """
+    :return: {"modes": {"star_imports" | "explicit_imports": {"seconds", "module_names"}}, "speedup"}
+
+    module_names is the average number of names in the namespace of a model module
+    """
+    work_directory = tempfile.mkdtemp()
+    try:
+        models = load_schema(tables, columns, work_directory)
+        model_names = [i.__tablename__ for i in models]
+        modes: Dict[str, dict] = {}
+        for mode, explicit_imports in [("star_imports", False), ("explicit_imports", True)]:
+            project_directory = tempfile.mkdtemp(dir=work_directory)
+            with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                crud_router_builder(db_model_list=_db_model_list(models), is_async=False,
+                                    database_url=DATABASE_URL, output_directory=project_directory,
+                                    explicit_imports=explicit_imports)
+            results = [_import_model_modules(project_directory, model_names) for _ in range(repeat)]
+            modes[mode] = {"seconds": min(i["seconds"] for i in results),
+                           "module_names": results[0]["module_names"]}
+    finally:
+        shutil.rmtree(work_directory)
+    return {
+        "parameters": {"tables": tables, "columns": columns, "repeat": repeat},
+        "modes": modes,
+        "speedup": modes["star_imports"]["seconds"] / modes["explicit_imports"]["seconds"],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the import time of the generated model modules")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(tables=args.tables, columns=args.columns, repeat=args.repeat), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
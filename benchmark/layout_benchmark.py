@@ -0,0 +1,91 @@
+"""
+Import time of the generated app, with a module per table and with layout="bundle"
+
+    python -m benchmark.layout_benchmark --tables 500 --columns 10
+
+The project is generated once per layout, then every run imports the routes of every table (and so the models) in
+a new interpreter. The modules shared by both layouts (sqlalchemy, the dialect, pydantic, fastapi and the common
+modules but the session) are imported before the clock starts. The time is the best of --repeat runs
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import warnings
+from typing import Dict
+
+from src.fastapi_quickcrud_codegen import crud_router_builder
+from .generator_benchmark import DATABASE_URL, _db_model_list, load_schema
+
+IMPORT_ROUTE_MODULES = """
+import json
+import sys
+import time
+
+import fastapi, pydantic, sqlalchemy, sqlalchemy.dialects.postgresql
+import common.db, common.http_exception, common.typing, common.utils
+
+names = sys.argv[1:]
+start = time.perf_counter()
+for name in names:
+    __import__(name)
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds,
+                  "project_modules": len([i for i in sys.modules if i.split(".")[0] in ("model", "route", "models",
+                                                                                       "routes")])}))
+"""
+
+
+def _import_route_modules(project_directory: str, module_names: list) -> dict:
+    result = subprocess.run([sys.executable, "-c", IMPORT_ROUTE_MODULES, *module_names], cwd=project_directory,
+                            stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(*, tables: int, columns: int, repeat: int = 5) -> dict:
+    """
+    :return: {"layouts": {"modules" | "bundle": {"seconds", "project_modules", "files"}}, "speedup"}
+
+    project_modules is the number of model and route modules imported, files the number of files of the project
+    """
+    work_directory = tempfile.mkdtemp()
+    try:
+        models = load_schema(tables, columns, work_directory)
+        route_modules = {"modules": [f"route.{i.__tablename__}" for i in models], "bundle": ["routes"]}
+        layouts: Dict[str, dict] = {}
+        for layout in ["modules", "bundle"]:
+            project_directory = tempfile.mkdtemp(dir=work_directory)
+            with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                crud_router_builder(db_model_list=_db_model_list(models), is_async=False,
+                                    database_url=DATABASE_URL, output_directory=project_directory, layout=layout)
+            results = [_import_route_modules(project_directory, route_modules[layout]) for _ in range(repeat)]
+            layouts[layout] = {"seconds": min(i["seconds"] for i in results),
+                               "project_modules": results[0]["project_modules"],
+                               "files": sum(len(files) for _, _, files in os.walk(project_directory))}
+    finally:
+        shutil.rmtree(work_directory)
+    return {
+        "parameters": {"tables": tables, "columns": columns, "repeat": repeat},
+        "layouts": layouts,
+        "speedup": layouts["modules"]["seconds"] / layouts["bundle"]["seconds"],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the import time of the generated project layouts")
+    parser.add_argument("--tables", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(tables=args.tables, columns=args.columns, repeat=args.repeat), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,8 +37,12 @@ if __name__ == '__main__':
         package_data={
             '': ['*.jinja2'],
             'src.fastapi_quickcrud_codegen.model.template.common': ['*.jinja2'],
+            'fastapi_quickcrud_codegen.model': ['template_compiled/*.py', 'template_compiled/*.json'],
         },
         package_dir={'': 'src'},
+        entry_points={
+            'console_scripts': ['fastapi-crud-codegen=fastapi_quickcrud_codegen.cli:main'],
+        },
         setup_requires=["setuptools>=31.6.0"],
         classifiers=[
             "Operating System :: OS Independent",
@@ -1,3 +1,32 @@
-from .crud_generator import crud_router_builder
+from typing import TYPE_CHECKING
 
+# the public names are imported on first access (PEP 562), importing the package does not import sqlalchemy,
+# pydantic, jinja2 or fastapi
+_LAZY_ATTRIBUTES = {
+    "crud_router_builder": ".crud_generator",
+    "crud_router_code_builder": ".crud_generator",
+    "crud_router_builder_from_metadata": ".reflection",
+    "DbModel": ".db_model",
+    "CrudMethods": ".misc.type",
+}
 
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if TYPE_CHECKING:
+    from .crud_generator import crud_router_builder, crud_router_code_builder
+    from .db_model import DbModel
+    from .reflection import crud_router_builder_from_metadata
+    from .misc.type import CrudMethods
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,218 @@
+"""
+Command line of the generator
+
+    fastapi-crud-codegen watch my_project.models --database-url sqlite:// --output-directory ./generated
+    fastapi-crud-codegen serve --port 8000
+
+The target is a module name or a path to a python file, the module defines the list of DbModel
+(db_model_list by default) and optionally is_async and database_url. serve runs the generator as a service, see
+service.py
+"""
+import argparse
+import importlib
+import inspect
+import linecache
+import os
+import sys
+import time
+import traceback
+import warnings
+from types import ModuleType
+from typing import Dict, List, Optional
+
+from .misc.constant import GENERATION_FOLDER
+from .utils.progress import progress
+
+DEFAULT_ATTRIBUTE = "db_model_list"
+
+
+def load_module(target: str) -> ModuleType:
+    if target.endswith(".py"):
+        directory, file_name = os.path.split(os.path.abspath(target))
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+        target = os.path.splitext(file_name)[0]
+    elif os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    return importlib.import_module(target)
+
+
+def _forget_declarative_classes(module: ModuleType) -> None:
+    """
+    Remove the tables of the declarative classes of the module from their MetaData, so that the module can be
+    executed again with the same declarative base
+    """
+    for value in list(vars(module).values()):
+        table = getattr(value, "__table__", None)
+        if not inspect.isclass(value) or value.__module__ != module.__name__ or table is None:
+            continue
+        if table.metadata.tables.get(table.key) is table:
+            table.metadata.remove(table)
+
+
+class ModelWatcher:
+    """
+    Regenerate the project when the source of the DbModel list module or of the declarative classes changes
+
+    Only the changed modules are reloaded, so the declarative classes of the other modules keep their cached
+    schema, and the generation is incremental, so only the models whose source or metadata changed are generated
+    again. The template registry lives as long as the process
+    """
+
+    def __init__(self, target: str, *,
+                 attribute: str = DEFAULT_ATTRIBUTE,
+                 is_async: Optional[bool] = None,
+                 database_url: Optional[str] = None,
+                 output_directory: Optional[str] = None,
+                 workers: Optional[int] = None):
+        self.module = load_module(target)
+        self.attribute = attribute
+        self.is_async = is_async
+        self.database_url = database_url
+        self.output_directory = output_directory
+        self.workers = workers
+        self._modification_times: Dict[str, int] = {}
+
+    def _setting(self, name: str):
+        value = getattr(self, name)
+        if value is None:
+            value = getattr(self.module, name, None)
+        if value is None:
+            raise ValueError(f"{name} is neither given nor defined in {self.module.__name__}")
+        return value
+
+    def db_model_list(self) -> list:
+        return getattr(self.module, self.attribute)
+
+    def watched_modules(self) -> Dict[str, ModuleType]:
+        """
+        :return: {source file: module} of the DbModel list module and of the modules of the declarative classes
+        """
+        modules = [self.module] + [sys.modules.get(i.db_model.__module__) for i in self.db_model_list()]
+        watched = {}
+        for module in modules:
+            path = getattr(module, "__file__", None)
+            if path and path.endswith(".py"):
+                watched[os.path.abspath(path)] = module
+        return watched
+
+    def _snapshot(self) -> Dict[str, int]:
+        snapshot = {}
+        for path in self.watched_modules():
+            try:
+                snapshot[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return snapshot
+
+    def changed_modules(self) -> List[ModuleType]:
+        snapshot = self._snapshot()
+        return [module for path, module in self.watched_modules().items()
+                if snapshot.get(path) != self._modification_times.get(path)]
+
+    def reload(self, modules: List[ModuleType]) -> None:
+        # the DbModel list module is always executed again and last, so that it refers to the reloaded classes
+        model_modules = [i for i in modules if i is not self.module]
+        linecache.checkcache()
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="This declarative base already contains a class")
+            for module in model_modules + [self.module]:
+                _forget_declarative_classes(module)
+                importlib.reload(module)
+
+    def generate(self) -> None:
+        from .crud_generator import crud_router_builder
+        self._modification_times = self._snapshot()
+        crud_router_builder(db_model_list=self.db_model_list(),
+                            is_async=self._setting("is_async"),
+                            database_url=self._setting("database_url"),
+                            workers=self.workers,
+                            incremental=True,
+                            output_directory=self.output_directory)
+
+    def poll(self) -> bool:
+        """
+        Regenerate the project if a watched module changed
+
+        :return: True if the project was generated
+        """
+        modules = self.changed_modules()
+        if not modules:
+            return False
+        self._modification_times = self._snapshot()
+        self.reload(modules)
+        self.generate()
+        return True
+
+    def watch(self, interval: float = 1.0) -> None:
+        self.generate()
+        progress(f"\nWatching {', '.join(self.watched_modules())}")
+        while True:
+            time.sleep(interval)
+            try:
+                if self.poll():
+                    progress(f"\nWatching {', '.join(self.watched_modules())}")
+            except Exception:
+                # keep watching, the next save may fix it
+                traceback.print_exc()
+
+
+def _watch(args: argparse.Namespace) -> int:
+    watcher = ModelWatcher(args.target,
+                           attribute=args.attribute,
+                           is_async=args.is_async,
+                           database_url=args.database_url,
+                           output_directory=args.output_directory or os.path.join(os.getcwd(), GENERATION_FOLDER),
+                           workers=args.workers)
+    try:
+        watcher.watch(interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    import uvicorn
+    from .service import create_app
+
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="fastapi-crud-codegen",
+                                     description="FastAPI's CRUD project generator for SQLAlchemy")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    watch = commands.add_parser("watch", help="generate the project and regenerate the changed models on save")
+    watch.add_argument("target", help="module name or path of the python file which defines the DbModel list")
+    watch.add_argument("--attribute", default=DEFAULT_ATTRIBUTE,
+                       help=f"name of the DbModel list in the module, default to {DEFAULT_ATTRIBUTE}")
+    watch.add_argument("--database-url", default=None,
+                       help="default to the database_url of the module")
+    async_group = watch.add_mutually_exclusive_group()
+    async_group.add_argument("--async", dest="is_async", action="store_const", const=True, default=None,
+                             help="generate async api, default to the is_async of the module")
+    async_group.add_argument("--sync", dest="is_async", action="store_const", const=False)
+    watch.add_argument("--output-directory", default=None,
+                       help=f"default to {GENERATION_FOLDER} in the current directory")
+    watch.add_argument("--workers", type=int, default=None)
+    watch.add_argument("--interval", type=float, default=1.0, help="seconds between two checks of the files")
+    watch.set_defaults(handler=_watch)
+
+    serve = commands.add_parser("serve", help="run the generator as a service, POST /generate returns the project "
+                                              "as a zip archive")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.set_defaults(handler=_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
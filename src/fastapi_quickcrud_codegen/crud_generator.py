@@ -1,35 +1,343 @@
+import contextvars
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import \
+    Callable, \
+    Dict, \
     List, \
+    Tuple, \
     TypeVar, Optional
 
-import sqlalchemy
 from pydantic import \
     BaseModel
 
 from .db_model import DbModel
+from .generator.code_generator import get_template_root_directory
 from .generator.common_module_template_generator import CommonModuleTemplateGenerator
-from .misc.type import SqlType
+from .generator.output_sink import OutputSink, FileSystemOutputSink
+from .misc.constant import COMMON, INDEX_DDL, INDEX_REPORT, MODELS_BUNDLE, OPENAPI
+from .misc.type import SqlType, GenerationPhase, CrudMethods, Pagination, ProjectLayout
 from .model.common_builder import CommonCodeGen
+from .model.template_registry import get_template_registry
+from .utils.bundle import bundle_modules
+from .utils.database_url import resolve_database_url
+from .utils.index_advisor import advise_indexes, render_index_ddl, render_index_report
+from .utils.instrumentation import GenerationInstrumentation, PhaseEvent, logger, profiled
+from .utils.manifest import GenerationManifest, compute_digest, db_model_digest, db_model_manifest_key, \
+    db_model_output_files, generator_digest
+from .utils.progress import progress
+from .utils.static_openapi import render_openapi_document, write_openapi_document
 
 CRUDModelType = TypeVar("CRUDModelType", bound=BaseModel)
 CompulsoryQueryModelType = TypeVar("CompulsoryQueryModelType", bound=BaseModel)
 OnConflictModelType = TypeVar("OnConflictModelType", bound=BaseModel)
 
 
+def _gen_db_model(db_model_info: DbModel, is_async: bool, sql_type: SqlType, explicit_imports: bool = False,
+                  shared_models: bool = False) -> Tuple[List[dict], Dict[str, str], List[PhaseEvent]]:
+    # the code and the timings are handed back instead of written / emitted, so that the workers never touch the
+    # project folder and the event callback is always called from the calling thread
+    sink = OutputSink()
+    instrumentation = GenerationInstrumentation()
+    db_model_info.gen(is_async=is_async, sql_type=sql_type, sink=sink, instrumentation=instrumentation,
+                      explicit_imports=explicit_imports, shared_models=shared_models)
+    return db_model_info.get_model_list(), sink.artifacts, instrumentation.events
+
+
+def _gen_db_model_in_context(context: contextvars.Context,
+                             *args) -> Tuple[List[dict], Dict[str, str], List[PhaseEvent]]:
+    # the threads of the pool do not inherit the context of the caller, e.g. its progress handler
+    return context.run(_gen_db_model, *args)
+
+
+# the modules generated in the project root instead of the common package
+ROOT_FILES = ("app.py", "startup_probe.py")
+
+
+def _is_common_module_up_to_date(manifest: Optional[GenerationManifest], file_name: str, digest: str) -> bool:
+    if manifest is None:
+        return False
+    key = f"common:{file_name}"
+    digest = compute_digest({"template": digest, "generator": generator_digest()})
+    files = [os.path.join(COMMON, file_name) if file_name not in ROOT_FILES else file_name]
+    if manifest.is_up_to_date(key, digest):
+        progress(f"\t\tSkip {file_name}, it is up to date")
+        return True
+    manifest.record(key, digest, files)
+    return False
+
+
+def _build_project(
+        *,
+        db_model_list: List[DbModel],
+        is_async: Optional[bool],
+        database_url: Optional[str],
+        sink: OutputSink,
+        workers: Optional[int],
+        use_process_pool: bool,
+        manifest: Optional[GenerationManifest],
+        instrumentation: GenerationInstrumentation,
+        static_openapi: bool = False,
+        startup_probe: bool = False,
+        startup_budget: Optional[float] = None,
+        explicit_imports: bool = False,
+        shared_models: bool = False,
+        index_report: bool = False,
+        index_ddl: bool = False,
+        layout: str = ProjectLayout.modules,
+) -> None:
+    sql_type, is_in_memory_db = resolve_database_url(database_url)
+    bundle = ProjectLayout(layout) == ProjectLayout.bundle
+    if bundle:
+        if startup_probe:
+            raise ValueError("startup_probe measures the model and route module of every table, it does not "
+                             "support layout='bundle'")
+        class_names = [i.db_model.__name__ for i in db_model_list]
+        if len(set(class_names)) != len(class_names):
+            raise ValueError("the declarative classes of layout='bundle' must have different names")
+    if is_in_memory_db:
+        progress("\nThis is in-memory db")
+
+    progress(f"\ndatabase type: {sql_type}")
+
+    # : Optional[SqlType]
+    model_list = []
+
+    common_module_template_generator = CommonModuleTemplateGenerator(sink)
+    template_registry = get_template_registry()
+
+    progress("\nStart generate model and router module...")
+    # the modules of the bundle are assembled in memory once every table is generated
+    model_sink = OutputSink() if bundle else sink
+    model_info_list: List[Optional[List[dict]]] = [None] * len(db_model_list)
+    pending_db_model_index = []
+    for index, db_model_info in enumerate(db_model_list):
+        if manifest is not None and not bundle:
+            key = db_model_manifest_key(db_model_info)
+            digest = db_model_digest(db_model_info, is_async=is_async, sql_type=sql_type,
+                                     template_digest=template_registry.digest(), explicit_imports=explicit_imports,
+                                     shared_models=shared_models)
+            files = db_model_output_files(db_model_info.get_model_info()["model_name"])
+            if manifest.is_up_to_date(key, digest):
+                progress(f"\n\t\tSkip db_model:{db_model_info.db_model}, it is up to date")
+                model_info_list[index] = [db_model_info.get_model_info()]
+                continue
+            manifest.record(key, digest, files)
+        pending_db_model_index.append(index)
+
+    pending_db_model_list = [db_model_list[i] for i in pending_db_model_index]
+    if workers and workers > 1:
+        executor_class = ProcessPoolExecutor if use_process_pool else ThreadPoolExecutor
+        with executor_class(max_workers=workers) as executor:
+            # map() keeps the input order, so the generated project does not depend on scheduling
+            argument_list = [pending_db_model_list,
+                             [is_async] * len(pending_db_model_list),
+                             [sql_type] * len(pending_db_model_list),
+                             [explicit_imports] * len(pending_db_model_list),
+                             [shared_models] * len(pending_db_model_list)]
+            if use_process_pool:
+                generated_result_list = list(executor.map(_gen_db_model, *argument_list))
+            else:
+                generated_result_list = list(executor.map(_gen_db_model_in_context,
+                                                          [contextvars.copy_context() for _ in pending_db_model_list],
+                                                          *argument_list))
+    else:
+        # generated straight into the sink as chunks, the sink writes them out on the flush
+        generated_result_list = []
+        for db_model_info in pending_db_model_list:
+            db_model_info.gen(is_async=is_async, sql_type=sql_type, sink=model_sink, instrumentation=instrumentation,
+                              explicit_imports=explicit_imports, shared_models=shared_models)
+            generated_result_list.append((db_model_info.get_model_list(), {}, []))
+    for index, (db_model_info_list, artifacts, events) in zip(pending_db_model_index, generated_result_list):
+        model_info_list[index] = db_model_info_list
+        model_sink.merge(artifacts)
+        for event in events:
+            instrumentation.emit(event)
+    for db_model_info_list in model_info_list:
+        model_list += db_model_info_list
+    if bundle:
+        with instrumentation.phase(GenerationPhase.common_module_rendering, MODELS_BUNDLE):
+            common_module_template_generator.add_bundle(bundle_modules(model_sink.artifacts, model_list))
+
+    progress("\nStart generate common module")
+    # type generation
+    if not _is_common_module_up_to_date(manifest, "typing.py",
+                                        template_registry.source_digest('common/typing.jinja2')):
+        progress("\t\tStart generate type module")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "typing.py"):
+            common_code_builder = CommonCodeGen()
+            common_code_builder.build_type()
+            common_code_builder.gen(common_module_template_generator.add_type)
+
+    # module generation
+    if not _is_common_module_up_to_date(manifest, "utils.py",
+                                        template_registry.source_digest('common/utils.jinja2')):
+        progress("\t\tStart generate utils module")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "utils.py"):
+            common_utils_code_builder = CommonCodeGen()
+            common_utils_code_builder.build_utils()
+            common_utils_code_builder.gen(common_module_template_generator.add_utils)
+
+    # http_exception generation
+    if not _is_common_module_up_to_date(manifest, "http_exception.py",
+                                        template_registry.source_digest('common/http_exception.jinja2')):
+        progress("\t\tStart generate http exception module")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "http_exception.py"):
+            common_http_exception_code_builder = CommonCodeGen()
+            common_http_exception_code_builder.build_http_exception()
+            common_http_exception_code_builder.gen(common_module_template_generator.add_http_exception)
+
+    # pagination generation, only the cursor pagination uses it
+    if any(i.pagination == Pagination.cursor for i in db_model_list) and not _is_common_module_up_to_date(
+            manifest, "pagination.py", template_registry.source_digest('common/pagination.jinja2')):
+        progress("\t\tStart generate pagination module")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "pagination.py"):
+            common_pagination_code_builder = CommonCodeGen()
+            common_pagination_code_builder.build_pagination()
+            common_pagination_code_builder.gen(common_module_template_generator.add_pagination)
+
+    # fast response generation, only the read routes with fast_response and the export routes use it
+    if any(i.fast_response or CrudMethods.EXPORT in i.crud_methods for i in db_model_list) \
+            and not _is_common_module_up_to_date(
+            manifest, "fast_response.py", template_registry.source_digest('common/fast_response.jinja2')):
+        progress("\t\tStart generate fast response module")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "fast_response.py"):
+            common_fast_response_code_builder = CommonCodeGen()
+            common_fast_response_code_builder.build_fast_response()
+            common_fast_response_code_builder.gen(common_module_template_generator.add_fast_response)
+
+    # export generation, only the export routes use it
+    if any(CrudMethods.EXPORT in i.crud_methods for i in db_model_list) and not _is_common_module_up_to_date(
+            manifest, "export.py", template_registry.source_digest('common/export.jinja2')):
+        progress("\t\tStart generate export module")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "export.py"):
+            common_export_code_builder = CommonCodeGen()
+            common_export_code_builder.build_export()
+            common_export_code_builder.gen(common_module_template_generator.add_export)
+
+    # db generation
+    if not _is_common_module_up_to_date(manifest, "db.py",
+                                        template_registry.source_digest('common/db.jinja2')):
+        progress("\t\tStart generate db module")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "db.py"):
+            common_db_code_builder = CommonCodeGen()
+            common_db_code_builder.build_db()
+            common_db_code_builder.gen(common_module_template_generator.add_db)
+
+    # sql session
+    if not _is_common_module_up_to_date(manifest, "sql_session.py",
+                                        compute_digest([template_registry.source_digest(
+                                            'common/memory_sql_session.jinja2'), model_list, is_async,
+                                            database_url, is_in_memory_db, bundle])):
+        progress("\t\tStart generate session module")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "sql_session.py"):
+            common_db_session_code_builder = CommonCodeGen()
+            common_db_session_code_builder.build_db_session(model_list=model_list, is_async=is_async,
+                                                            database_url=database_url,
+                                                            is_in_memory_db=is_in_memory_db, bundle=bundle)
+            common_db_session_code_builder.gen(common_module_template_generator.add_memory_sql_session)
+
+    # app py
+    if not _is_common_module_up_to_date(manifest, "app.py",
+                                        compute_digest([template_registry.source_digest('common/app.jinja2'),
+                                                        model_list, static_openapi, bundle])):
+        progress("\t\tStart generate app.py")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "app.py"):
+            common_app_code_builder = CommonCodeGen()
+            common_app_code_builder.build_app(model_list=model_list, static_openapi=static_openapi, bundle=bundle)
+            common_app_code_builder.gen(common_module_template_generator.add_app)
+
+    # startup probe
+    if startup_probe and not _is_common_module_up_to_date(
+            manifest, "startup_probe.py",
+            compute_digest([template_registry.source_digest('common/startup_probe.jinja2'), model_list,
+                            startup_budget])):
+        progress("\t\tStart generate startup_probe.py")
+        with instrumentation.phase(GenerationPhase.common_module_rendering, "startup_probe.py"):
+            common_startup_probe_code_builder = CommonCodeGen()
+            common_startup_probe_code_builder.build_startup_probe(model_list=model_list,
+                                                                  startup_budget=startup_budget)
+            common_startup_probe_code_builder.gen(common_module_template_generator.add_startup_probe)
+
+    # index advice, it is cheap so it is not recorded in the manifest
+    if index_report or index_ddl:
+        with instrumentation.phase(GenerationPhase.common_module_rendering, INDEX_REPORT):
+            advice_list = advise_indexes(db_model_list, sql_type)
+        if advice_list:
+            progress(f"\n{len(advice_list)} filterable or sortable columns without index support")
+        if index_report:
+            sink.add(INDEX_REPORT, render_index_report(advice_list))
+        if index_ddl:
+            sink.add(INDEX_DDL, render_index_ddl(advice_list))
+
+
 def crud_router_builder(
         *,
         db_model_list: List[DbModel],
         is_async: Optional[bool],
         database_url: Optional[str],
+        workers: Optional[int] = None,
+        use_process_pool: bool = False,
+        incremental: bool = False,
+        output_directory: Optional[str] = None,
+        on_event: Optional[Callable[[PhaseEvent], None]] = None,
+        profile: Optional[str] = None,
+        static_openapi: bool = False,
+        startup_probe: bool = False,
+        startup_budget: Optional[float] = None,
+        explicit_imports: bool = False,
+        shared_models: bool = False,
+        index_report: bool = False,
+        index_ddl: bool = False,
+        layout: str = ProjectLayout.modules,
 ):
     """
         Generate project from sqlalchemy model
 
-        :param database_url: a database URL. The URL is passed directly to SQLAlchemy's create_engine() method so
-                                                please refer to SQLAlchemy's documentation for instructions on how to
-                                                construct a proper URL.
+        :param database_url: a database URL. The URL is passed directly to SQLAlchemy's create_engine() method in
+                                                the generated project so please refer to SQLAlchemy's documentation
+                                                for instructions on how to construct a proper URL. The generator
+                                                only parses it, the database driver does not need to be installed.
         :param is_async: True for async; False for sync
         :param db_model_list: model list of dict for code generate
+        :param workers: generate the models on a pool of this many workers; the models are generated one by one
+                        if it is not set
+        :param use_process_pool: use a process pool instead of a thread pool for the workers, the declarative
+                                 classes must be importable by the worker processes
+        :param incremental: only generate the files whose inputs changed since the last run, the inputs of every
+                            file are recorded in a manifest in the generated project
+        :param output_directory: the folder of the generated project, default to the fastapi_quick_crud_template
+                                 folder next to the running script
+        :param on_event: called with a PhaseEvent (phase, table or file name, seconds) after every generation
+                         phase: schema extraction, pydantic model rendering and route rendering of each model,
+                         rendering of each common module and the file writing. The events are also logged on the
+                         fastapi_quickcrud_codegen logger at DEBUG level
+        :param profile: run the generation under cProfile and dump the pstats into this path
+        :param static_openapi: build openapi.json of the generated project at generation time, the generated app.py
+                               serves it instead of building the OpenAPI document on the first request. The
+                               generated app is imported in a subprocess to build it, so the database driver must
+                               be installed; "python app.py --regenerate-openapi" builds it again
+        :param startup_probe: generate startup_probe.py, it measures the cold startup of the generated app table by
+                              table (model import, route import, router registration) under -X importtime and
+                              writes a JSON report
+        :param startup_budget: the default budget of the startup probe in seconds, the probe exits with 1 if the
+                               startup takes longer
+        :param explicit_imports: import only the names each model module uses, instead of the star imports of
+                                 sqlalchemy and of the dialect and the fixed set of typing, datetime, pydantic and
+                                 fastapi names
+        :param shared_models: generate one response model of every table, {table}ResponseModel, the response
+                              models of the crud methods are aliases of it if they have the same fields, or
+                              subclasses which override the different fields; the list response models of the
+                              same shape are aliases of each other. It cuts the number of pydantic classes, so the
+                              memory and the startup time of the generated app
+        :param index_report: write index_report.txt, the columns the generated api filters (range, list, pattern)
+                             or sorts by which do not lead an index, the primary key or a unique constraint
+        :param index_ddl: write index_advice.sql, the CREATE INDEX statements of these columns: btree, and gin
+                          trigram indexes for the pattern filters on PostgreSQL
+        :param layout: ProjectLayout.modules (default) generates a model and a route module of every table,
+                       ProjectLayout.bundle ("bundle") generates every model into models.py and every route into
+                       routes.py with one import header each, so the app imports two modules instead of two per
+                       table. The declarative classes must have different names, it does not support startup_probe
 
         Raises:
             RuntimeError: only support DeclarativeMeta Class
@@ -38,6 +346,7 @@ def crud_router_builder(
                 Only support one unique constraint/ Use unique constraint and composite unique constraint at same time
             ColumnTypeNotSupportedException:
                 The type of db column is not supported
+            ValueError: the database type of database_url is not supported
 
         Examples:
             >>> crud_router_builder(db_model_list=[
@@ -63,170 +372,97 @@ def crud_router_builder(
                 )
 
     """
-    print("Start Fastapi's CRUD project generation")
-    engine = sqlalchemy.create_engine(database_url)
-    is_in_memory_db = False
-    if engine and engine.url and not engine.url.host and not engine.url.port:
-        print("\nThis is in-memory db")
-        is_in_memory_db = True
+    progress("Start Fastapi's CRUD project generation")
+    instrumentation = GenerationInstrumentation(on_event)
+    with profiled(profile):
+        template_root_directory = output_directory or get_template_root_directory()
+        sink = FileSystemOutputSink(template_root_directory, workers=workers)
+        manifest = GenerationManifest(template_root_directory) if incremental else None
+        try:
+            _build_project(db_model_list=db_model_list, is_async=is_async, database_url=database_url, sink=sink,
+                           workers=workers, use_process_pool=use_process_pool, manifest=manifest,
+                           instrumentation=instrumentation, static_openapi=static_openapi,
+                           startup_probe=startup_probe, startup_budget=startup_budget,
+                           explicit_imports=explicit_imports, shared_models=shared_models,
+                           index_report=index_report, index_ddl=index_ddl,
+                           layout=layout)
 
-    sql_type = SqlType(engine.dialect.name)
-    print(f"\ndatabase type: {sql_type}")
+            progress("\nWrite generated files")
+            with instrumentation.phase(GenerationPhase.file_io):
+                sink.flush()
 
-    # : Optional[SqlType]
-    model_list = []
+                if manifest is not None:
+                    manifest.prune()
+                    manifest.save()
+                else:
+                    # a later incremental run would compare against the files of an older run
+                    GenerationManifest.remove(template_root_directory)
+        except BaseException:
+            # the project of the previous run is left as it was
+            sink.discard()
+            raise
 
-    common_module_template_generator = CommonModuleTemplateGenerator()
-
-    print("\nStart generate model and router module...")
-    for db_model_info in db_model_list:
-        db_model_info.gen(is_async=is_async, sql_type=sql_type)
-        model_list += db_model_info.get_model_list()
-        #
-        # db_model = db_model_info["db_model"]
-        # prefix = db_model_info["prefix"]
-        # tags = db_model_info["tags"]
-        # exclude_columns = db_model_info.get("exclude_columns", [])
-        # crud_methods = db_model_info.get("crud_methods", CrudMethods.get_full_crud_method())
-        # print(f"\n\t\tGenerating db_model:{db_model} prefix:{prefix} tags:{tags}")
-        # this_modeL_is_table = is_table(db_model)
-        # if this_modeL_is_table:
-        #     raise RuntimeError("only support declarative from Sqlalchemy, you can try to give the table a fake pk"
-        #                        " to work around")
-        # table_name = db_model.__name__
-        #
-        # model_name = get_table_name(db_model)
-        #
-        # model_list.append({"model_name": model_name, "file_name": table_name})
-        #
-        # # code gen
-        # crud_code_generator = CrudCodeGen(tags=tags, prefix=prefix)
-        # # create a file
-        # crud_template_generator = CrudTemplateGenerator()
-        #
-        # constraints = db_model.__table__.constraints
-        #
-        # print(f"\t\tfollowing api method will be generated:{crud_methods} ")
-        #
-        # # model generation
-        # print("\t\tGenerating model for API")
-        # crud_models_builder: CRUDModel = sqlalchemy_to_pydantic
-        # crud_models: CRUDModel = crud_models_builder(db_model=db_model,
-        #                                              constraints=constraints,
-        #                                              crud_methods=crud_methods,
-        #                                              exclude_columns=exclude_columns,
-        #                                              sql_type=sql_type)
-        # print("\t\tGenerating model success")
-        # methods_dependencies = crud_models.get_available_request_method()
-        # primary_name = crud_models.PRIMARY_KEY_NAME
-        # path = '/{' + primary_name + '}'
-        #
-        # # router generation
-        # def find_one_api():
-        #     print("\t\tGenerating find one API")
-        #     crud_code_generator.build_find_one_route(is_async=is_async, path=path, file_name=model_name, model_name=table_name)
-        #     print("\t\tfind one API generate successfully")
-        #
-        # def find_many_api():
-        #     print("\t\tGenerating find many API")
-        #     crud_code_generator.build_find_many_route(is_async=is_async, path="", file_name=model_name, model_name=table_name)
-        #     print("\t\tfind many API generate successfully")
-        #
-        # def create_one_api():
-        #     print("\t\tGenerating insert one API")
-        #     crud_code_generator.build_insert_one_route(is_async=is_async, path="", file_name=model_name, model_name=table_name)
-        #     print("\t\tinsert one API generate successfully")
-        #
-        # def create_many_api():
-        #     print("\t\tGenerating insert many API")
-        #     crud_code_generator.build_insert_many_route(is_async=is_async, path="", file_name=model_name, model_name=table_name)
-        #     print("\t\tinsert many API generate successfully")
-        #
-        # def update_one_api():
-        #     print("\t\tGenerating update one API")
-        #     crud_code_generator.build_update_one_route(is_async=is_async, path=path, file_name=model_name, model_name=table_name)
-        #     print("\t\tupdate one API generate successfully")
-        #
-        # def update_many_api():
-        #     print("\t\tGenerating update many API")
-        #     crud_code_generator.build_update_many_route(is_async=is_async, path="", file_name=model_name, model_name=table_name)
-        #     print("\t\tupdate many API generate successfully")
-        #
-        # def patch_one_api():
-        #     print("\t\tGenerating patch one API")
-        #     crud_code_generator.build_patch_one_route(is_async=is_async, path=path, file_name=model_name, model_name=table_name)
-        #     print("\t\tpatch one API generate successfully")
-        #
-        # def patch_many_api():
-        #     print("\t\tGenerating patch many API")
-        #     crud_code_generator.build_patch_many_route(is_async=is_async, path="", file_name=model_name, model_name=table_name)
-        #     print("\t\tpatch many API generate successfully")
-        #
-        # def delete_one_api():
-        #     print("\t\tGenerating delete one API")
-        #     crud_code_generator.build_delete_one_route(is_async=is_async, path=path, file_name=model_name, model_name=table_name)
-        #     print("\t\tdelete one API generate successfully")
-        #
-        # def delete_many_api():
-        #     print("\t\tGenerating delete many API")
-        #     crud_code_generator.build_delete_many_route(is_async=is_async, path="", file_name=model_name, model_name=table_name)
-        #     print("\t\tdelete many API generate successfully")
-        #
-        # api_register = {
-        #     CrudMethods.FIND_ONE.value: find_one_api,
-        #     CrudMethods.FIND_MANY.value: find_many_api,
-        #     CrudMethods.CREATE_ONE.value: create_one_api,
-        #     CrudMethods.CREATE_MANY.value: create_many_api,
-        #     CrudMethods.UPDATE_ONE.value: update_one_api,
-        #     CrudMethods.UPDATE_MANY.value: update_many_api,
-        #     CrudMethods.PATCH_ONE.value: patch_one_api,
-        #     CrudMethods.PATCH_MANY.value: patch_many_api,
-        #     CrudMethods.DELETE_ONE.value: delete_one_api,
-        #     CrudMethods.DELETE_MANY.value: delete_many_api,
-        # }
-        # for request_method in methods_dependencies:
-        #     value_of_dict_crud_model = crud_models.get_model_by_request_method(request_method)
-        #     crud_model_of_this_request_methods = value_of_dict_crud_model.keys()
-        #     for crud_model_of_this_request_method in crud_model_of_this_request_methods:
-        #         api_register[crud_model_of_this_request_method.value]()
-        # crud_code_generator.gen(template_generator=crud_template_generator, file_name=model_name)
-
-    print("\nStart generate common module")
-    # type generation
-    print("\t\tStart generate type module")
-    common_code_builder = CommonCodeGen()
-    common_code_builder.build_type()
-    common_code_builder.gen(common_module_template_generator.add_type)
+        if static_openapi:
+            progress("\nGenerate openapi.json")
+            with instrumentation.phase(GenerationPhase.openapi_generation):
+                write_openapi_document(template_root_directory)
+    logger.info("generation time by phase: %s", instrumentation.summary())
 
-    # module generation
-    print("\t\tStart generate utils module")
-    common_utils_code_builder = CommonCodeGen()
-    common_utils_code_builder.build_utils()
-    common_utils_code_builder.gen(common_module_template_generator.add_utils)
+    progress("\nProject generation completed successfully")
 
-    # http_exception generation
-    print("\t\tStart generate http exception module")
-    common_http_exception_code_builder = CommonCodeGen()
-    common_http_exception_code_builder.build_http_exception()
-    common_http_exception_code_builder.gen(common_module_template_generator.add_http_exception)
 
-    # db generation
-    print("\t\tStart generate db module")
-    common_db_code_builder = CommonCodeGen()
-    common_db_code_builder.build_db()
-    common_db_code_builder.gen(common_module_template_generator.add_db)
+def crud_router_code_builder(
+        *,
+        db_model_list: List[DbModel],
+        is_async: Optional[bool],
+        database_url: Optional[str],
+        workers: Optional[int] = None,
+        use_process_pool: bool = False,
+        on_event: Optional[Callable[[PhaseEvent], None]] = None,
+        profile: Optional[str] = None,
+        static_openapi: bool = False,
+        startup_probe: bool = False,
+        startup_budget: Optional[float] = None,
+        explicit_imports: bool = False,
+        shared_models: bool = False,
+        index_report: bool = False,
+        index_ddl: bool = False,
+        layout: str = ProjectLayout.modules,
+) -> Dict[str, str]:
+    """
+        Generate project from sqlalchemy model without writing any file
 
-    # sql session
-    print("\t\tStart generate session module")
-    common_db_session_code_builder = CommonCodeGen()
-    common_db_session_code_builder.build_db_session(model_list=model_list, is_async=is_async, database_url=database_url,
-                                                    is_in_memory_db=is_in_memory_db)
-    common_db_session_code_builder.gen(common_module_template_generator.add_memory_sql_session)
+        Same arguments as crud_router_builder except incremental and output_directory, the generated project is
+        returned instead of written, so it can be used in a long-running process or to diff against the committed
+        code
 
-    # app py
-    print("\t\tStart generate app.py")
-    common_app_code_builder = CommonCodeGen()
-    common_app_code_builder.build_app(model_list=model_list)
-    common_app_code_builder.gen(common_module_template_generator.add_app)
+        :return: {path relative to the project root: generated source}
 
-    print("\nProject generation completed successfully")
+        Examples:
+            >>> project = crud_router_code_builder(db_model_list=[DbModel(db_model=SampleTable,
+                                                                          prefix="/my_first_api",
+                                                                          tags=["sample api"])],
+                                                   is_async=False,
+                                                   database_url="sqlite://")
+            >>> print(project["route/test_build_myself.py"])
+
+    """
+    progress("Start Fastapi's CRUD project generation")
+    instrumentation = GenerationInstrumentation(on_event)
+    sink = OutputSink()
+    with profiled(profile):
+        _build_project(db_model_list=db_model_list, is_async=is_async, database_url=database_url, sink=sink,
+                       workers=workers, use_process_pool=use_process_pool, manifest=None,
+                       instrumentation=instrumentation, static_openapi=static_openapi,
+                       startup_probe=startup_probe, startup_budget=startup_budget,
+                       explicit_imports=explicit_imports, shared_models=shared_models,
+                       index_report=index_report, index_ddl=index_ddl,
+                       layout=layout)
+        if static_openapi:
+            with instrumentation.phase(GenerationPhase.openapi_generation):
+                openapi_document = render_openapi_document(sink.artifacts)
+            if openapi_document is not None:
+                sink.add(OPENAPI, openapi_document)
+    logger.info("generation time by phase: %s", instrumentation.summary())
+    progress("\nProject generation completed successfully")
+    return dict(sink.artifacts)
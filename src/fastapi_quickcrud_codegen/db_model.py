@@ -1,22 +1,26 @@
-from typing import List
+from typing import List, Optional, TYPE_CHECKING
 
-from sqlalchemy.orm import decl_api
-
-from .generator.crud_template_generator import CrudTemplateGenerator
-from .misc.crud_model import CRUDModel
+from .generator.code_generator import get_template_root_directory
+from .generator.output_sink import OutputSink, FileSystemOutputSink
 from .misc.get_table_name import get_table_name
-from .misc.type import CrudMethods, SqlType
-from .model.crud_builder import CrudCodeGen
-from .utils.is_table import is_table
-from .utils.sqlalchemy_to_pydantic import sqlalchemy_to_pydantic
+from .misc.type import CrudMethods, SqlType, GenerationPhase, CountStrategy, Pagination
+from .utils.instrumentation import GenerationInstrumentation
+from .utils.progress import progress
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import decl_api
 
 
 class DbModel:
-    def __init__(self, db_model: decl_api.DeclarativeMeta,
+    def __init__(self, db_model: "decl_api.DeclarativeMeta",
                  prefix: str,
                  tags: List[str],
                  exclude_columns: List[str] = None,
-                 crud_methods: List[CrudMethods] = None):
+                 crud_methods: List[CrudMethods] = None,
+                 count_strategy: CountStrategy = CountStrategy.fetch_all,
+                 pagination: Pagination = Pagination.offset,
+                 projection: bool = False,
+                 fast_response: bool = False):
 
         self.db_model = db_model
         self.prefix = prefix
@@ -29,106 +33,183 @@ class DbModel:
         if crud_methods is None:
             crud_methods = CrudMethods.get_full_crud_method()
         self.crud_methods = crud_methods
+        self.count_strategy = CountStrategy(count_strategy)
+        self.pagination = Pagination(pagination)
+        self.projection = projection
+        self.fast_response = fast_response
+        if self.pagination == Pagination.cursor and self.count_strategy != CountStrategy.fetch_all:
+            raise ValueError("the cursor pagination does not count the total, it does not take a count_strategy")
         self.model_list = []
 
     def get_model_list(self) -> List[dict]:
         return self.model_list
 
-    def gen(self, is_async: bool, sql_type: SqlType) -> None:
-
-        print(f"\n\t\tGenerating db_model:{self.db_model} prefix:{self.prefix} tags:{self.tags}")
+    def get_deferred_fields(self) -> List[str]:
+        """
+        The large columns (text, json, binary), the list api with projection only selects them on request
+        """
+        from .utils.column_schema import DEFERRED_DATA_TYPES
+
+        return [i.name for i in self.db_model.__table__.c
+                if isinstance(i.type, DEFERRED_DATA_TYPES) and i.name not in self.exclude_columns]
+
+    def get_nullable_fields(self) -> List[str]:
+        """
+        The columns which may be NULL, the cursor pagination does not sort by them
+        """
+        return [i.name for i in self.db_model.__table__.c if i.nullable and i.name not in self.exclude_columns]
+
+    def get_model_info(self) -> dict:
+        return {"model_name": get_table_name(self.db_model), "file_name": self.db_model.__name__}
+
+    def gen(self, is_async: bool, sql_type: SqlType, sink: OutputSink = None,
+            instrumentation: Optional[GenerationInstrumentation] = None, explicit_imports: bool = False,
+            shared_models: bool = False) -> None:
+        """
+        Generate the model and router module of this db model
+
+        :param sink: where the generated code goes, the code is written into the project folder if it is not set
+        :param instrumentation: receive the timing of the generation phases of this db model
+        :param explicit_imports: import only the names the model module uses instead of the star imports
+        :param shared_models: derive the response models from one response model of the table
+        """
+        # the builders pull in sqlalchemy, pydantic and jinja2, they are imported when the code is generated so that
+        # importing DbModel stays cheap
+        from .generator.crud_template_generator import CrudTemplateGenerator
+        from .misc.crud_model import CRUDModel
+        from .model.crud_builder import CrudCodeGen
+        from .utils.is_table import is_table
+        from .utils.sqlalchemy_to_pydantic import sqlalchemy_to_pydantic
+
+        if instrumentation is None:
+            instrumentation = GenerationInstrumentation()
+        if sink is None:
+            sink = FileSystemOutputSink(get_template_root_directory())
+            try:
+                self.gen(is_async=is_async, sql_type=sql_type, sink=sink, instrumentation=instrumentation,
+                         explicit_imports=explicit_imports, shared_models=shared_models)
+                with instrumentation.phase(GenerationPhase.file_io, get_table_name(self.db_model)):
+                    sink.flush()
+            except BaseException:
+                sink.discard()
+                raise
+            return
+
+        progress(f"\n\t\tGenerating db_model:{self.db_model} prefix:{self.prefix} tags:{self.tags}")
+        if self.count_strategy == CountStrategy.concurrent and not is_async:
+            raise ValueError(f"count_strategy {CountStrategy.concurrent} of {self.db_model.__name__} needs is_async")
         this_modeL_is_table = is_table(self.db_model)
         if this_modeL_is_table:
             raise RuntimeError("only support declarative from Sqlalchemy, you can try to give the table a fake pk"
                                " to work around")
-        table_name = self.db_model.__name__
+        model_info = self.get_model_info()
+        table_name = model_info["file_name"]
+        model_name = model_info["model_name"]
 
-        model_name = get_table_name(self.db_model)
-
-        self.model_list.append({"model_name": model_name, "file_name": table_name})
+        # reset on every run, so that the same DbModel can be generated more than once
+        self.model_list = [model_info]
 
         # code gen
         crud_code_generator = CrudCodeGen(tags=self.tags, prefix=self.prefix)
         # create a file
-        crud_template_generator = CrudTemplateGenerator()
+        crud_template_generator = CrudTemplateGenerator(sink)
 
         constraints = self.db_model.__table__.constraints
 
-        print(f"\t\tfollowing api method will be generated:{self.crud_methods} ")
+        progress(f"\t\tfollowing api method will be generated:{self.crud_methods} ")
 
         # model generation
-        print("\t\tGenerating model for API")
+        progress("\t\tGenerating model for API")
         crud_models_builder: CRUDModel = sqlalchemy_to_pydantic
         crud_models: CRUDModel = crud_models_builder(db_model=self.db_model,
                                                      constraints=constraints,
                                                      crud_methods=self.crud_methods,
                                                      exclude_columns=self.exclude_columns,
-                                                     sql_type=sql_type)
-        print("\t\tGenerating model success")
+                                                     sql_type=sql_type,
+                                                     sink=sink,
+                                                     instrumentation=instrumentation,
+                                                     explicit_imports=explicit_imports,
+                                                     shared_models=shared_models,
+                                                     count_strategy=self.count_strategy,
+                                                     pagination=self.pagination,
+                                                     projection=self.projection)
+        progress("\t\tGenerating model success")
         methods_dependencies = crud_models.get_available_request_method()
         primary_name = crud_models.PRIMARY_KEY_NAME
         path = '/{' + primary_name + '}'
 
         # router generation
         def find_one_api():
-            print("\t\tGenerating find one API")
+            progress("\t\tGenerating find one API")
             crud_code_generator.build_find_one_route(is_async=is_async, path=path, file_name=model_name,
-                                                     model_name=table_name)
-            print("\t\tfind one API generate successfully")
+                                                     model_name=table_name, projection=self.projection,
+                                                     fast_response=self.fast_response)
+            progress("\t\tfind one API generate successfully")
 
         def find_many_api():
-            print("\t\tGenerating find many API")
+            progress("\t\tGenerating find many API")
             crud_code_generator.build_find_many_route(is_async=is_async, path="", file_name=model_name,
-                                                      model_name=table_name)
-            print("\t\tfind many API generate successfully")
+                                                      model_name=table_name, count_strategy=self.count_strategy,
+                                                      pagination=self.pagination, primary_key_name=primary_name,
+                                                      projection=self.projection,
+                                                      deferred_fields=self.get_deferred_fields(),
+                                                      fast_response=self.fast_response,
+                                                      nullable_fields=self.get_nullable_fields())
+            progress("\t\tfind many API generate successfully")
+
+        def export_api():
+            progress("\t\tGenerating export API")
+            crud_code_generator.build_export_route(is_async=is_async, path="/export", file_name=model_name,
+                                                   model_name=table_name)
+            progress("\t\texport API generate successfully")
 
         def create_one_api():
-            print("\t\tGenerating insert one API")
+            progress("\t\tGenerating insert one API")
             crud_code_generator.build_insert_one_route(is_async=is_async, path="", file_name=model_name,
                                                        model_name=table_name)
-            print("\t\tinsert one API generate successfully")
+            progress("\t\tinsert one API generate successfully")
 
         def create_many_api():
-            print("\t\tGenerating insert many API")
+            progress("\t\tGenerating insert many API")
             crud_code_generator.build_insert_many_route(is_async=is_async, path="", file_name=model_name,
                                                         model_name=table_name)
-            print("\t\tinsert many API generate successfully")
+            progress("\t\tinsert many API generate successfully")
 
         def update_one_api():
-            print("\t\tGenerating update one API")
+            progress("\t\tGenerating update one API")
             crud_code_generator.build_update_one_route(is_async=is_async, path=path, file_name=model_name,
                                                        model_name=table_name)
-            print("\t\tupdate one API generate successfully")
+            progress("\t\tupdate one API generate successfully")
 
         def update_many_api():
-            print("\t\tGenerating update many API")
+            progress("\t\tGenerating update many API")
             crud_code_generator.build_update_many_route(is_async=is_async, path="", file_name=model_name,
                                                         model_name=table_name)
-            print("\t\tupdate many API generate successfully")
+            progress("\t\tupdate many API generate successfully")
 
         def patch_one_api():
-            print("\t\tGenerating patch one API")
+            progress("\t\tGenerating patch one API")
             crud_code_generator.build_patch_one_route(is_async=is_async, path=path, file_name=model_name,
                                                       model_name=table_name)
-            print("\t\tpatch one API generate successfully")
+            progress("\t\tpatch one API generate successfully")
 
         def patch_many_api():
-            print("\t\tGenerating patch many API")
+            progress("\t\tGenerating patch many API")
             crud_code_generator.build_patch_many_route(is_async=is_async, path="", file_name=model_name,
                                                        model_name=table_name)
-            print("\t\tpatch many API generate successfully")
+            progress("\t\tpatch many API generate successfully")
 
         def delete_one_api():
-            print("\t\tGenerating delete one API")
+            progress("\t\tGenerating delete one API")
             crud_code_generator.build_delete_one_route(is_async=is_async, path=path, file_name=model_name,
                                                        model_name=table_name)
-            print("\t\tdelete one API generate successfully")
+            progress("\t\tdelete one API generate successfully")
 
         def delete_many_api():
-            print("\t\tGenerating delete many API")
+            progress("\t\tGenerating delete many API")
             crud_code_generator.build_delete_many_route(is_async=is_async, path="", file_name=model_name,
                                                         model_name=table_name)
-            print("\t\tdelete many API generate successfully")
+            progress("\t\tdelete many API generate successfully")
 
         api_register = {
             CrudMethods.FIND_ONE.value: find_one_api,
@@ -141,10 +222,14 @@ class DbModel:
             CrudMethods.PATCH_MANY.value: patch_many_api,
             CrudMethods.DELETE_ONE.value: delete_one_api,
             CrudMethods.DELETE_MANY.value: delete_many_api,
+            CrudMethods.EXPORT.value: export_api,
         }
-        for request_method in methods_dependencies:
-            value_of_dict_crud_model = crud_models.get_model_by_request_method(request_method)
-            crud_model_of_this_request_methods = value_of_dict_crud_model.keys()
-            for crud_model_of_this_request_method in crud_model_of_this_request_methods:
-                api_register[crud_model_of_this_request_method.value]()
-        crud_code_generator.gen(template_generator=crud_template_generator, file_name=model_name)
+        with instrumentation.phase(GenerationPhase.route_rendering, model_name):
+            for request_method in methods_dependencies:
+                value_of_dict_crud_model = crud_models.get_model_by_request_method(request_method)
+                crud_model_of_this_request_methods = value_of_dict_crud_model.keys()
+                # the export route goes first, /export would be taken as a primary key by the find one route
+                for crud_model_of_this_request_method in sorted(crud_model_of_this_request_methods,
+                                                                key=lambda i: i != CrudMethods.EXPORT):
+                    api_register[crud_model_of_this_request_method.value]()
+            crud_code_generator.gen(template_generator=crud_template_generator, file_name=model_name)
@@ -1,12 +1,16 @@
 import os
 import sys
 
+from .output_sink import OutputSink
 from ..misc.constant import GENERATION_FOLDER
 
 
+def get_template_root_directory() -> str:
+    dirname, _ = os.path.split(os.path.abspath(sys.argv[0]))
+    return os.path.join(dirname, GENERATION_FOLDER)
+
+
 class CodeGenerator:
-    def __init__(self):
-        dirname, _ = os.path.split(os.path.abspath(sys.argv[0]))
-        self.current_directory = dirname
-        self.template_root_directory = os.path.join(self.current_directory, GENERATION_FOLDER)
-        self.module_path_map = {}
\ No newline at end of file
+    def __init__(self, sink: OutputSink):
+        self.sink = sink
+        self.module_path_map = {}
@@ -1,76 +1,51 @@
-import os
-
 from .code_generator import CodeGenerator
+from .output_sink import OutputSink
 from ..misc.constant import COMMON
-from ..utils.create_file import create_folder, create_file_and_add_code_into_there
 
 
 class CommonModuleTemplateGenerator(CodeGenerator):
-    def __init__(self):
-        super(CommonModuleTemplateGenerator, self).__init__()
+    def __init__(self, sink: OutputSink):
+        super(CommonModuleTemplateGenerator, self).__init__(sink)
 
     def add_type(self, code):
-        template_module_directory = os.path.join(self.template_root_directory, COMMON)
-        create_folder(template_module_directory)
-
-        path = f'{template_module_directory}/__init__.py'
-        create_file_and_add_code_into_there(path, "")
-
-        path = f'{template_module_directory}/typing.py'
-        create_file_and_add_code_into_there(path, code)
+        self.sink.add(f'{COMMON}/__init__.py', "")
+        self.sink.add(f'{COMMON}/typing.py', code)
 
     def add_utils(self, code):
-        template_module_directory = os.path.join(self.template_root_directory, COMMON)
-        create_folder(template_module_directory)
-
-        path = f'{template_module_directory}/__init__.py'
-        create_file_and_add_code_into_there(path, "")
-
-        path = f'{template_module_directory}/utils.py'
-        create_file_and_add_code_into_there(path, code)
+        self.sink.add(f'{COMMON}/__init__.py', "")
+        self.sink.add(f'{COMMON}/utils.py', code)
 
     def add_http_exception(self, code):
-        template_module_directory = os.path.join(self.template_root_directory, COMMON)
-        create_folder(template_module_directory)
-
-        path = f'{template_module_directory}/__init__.py'
-        create_file_and_add_code_into_there(path, "")
+        self.sink.add(f'{COMMON}/__init__.py', "")
+        self.sink.add(f'{COMMON}/http_exception.py', code)
 
-        path = f'{template_module_directory}/http_exception.py'
-        create_file_and_add_code_into_there(path, code)
+    def add_pagination(self, code):
+        self.sink.add(f'{COMMON}/__init__.py', "")
+        self.sink.add(f'{COMMON}/pagination.py', code)
 
-    def add_db(self, code):
-        template_module_directory = os.path.join(self.template_root_directory, COMMON)
-        create_folder(template_module_directory)
+    def add_fast_response(self, code):
+        self.sink.add(f'{COMMON}/__init__.py', "")
+        self.sink.add(f'{COMMON}/fast_response.py', code)
 
-        path = f'{template_module_directory}/__init__.py'
-        create_file_and_add_code_into_there(path, "")
+    def add_export(self, code):
+        self.sink.add(f'{COMMON}/__init__.py', "")
+        self.sink.add(f'{COMMON}/export.py', code)
 
-        path = f'{template_module_directory}/db.py'
-        create_file_and_add_code_into_there(path, code)
+    def add_db(self, code):
+        self.sink.add(f'{COMMON}/__init__.py', "")
+        self.sink.add(f'{COMMON}/db.py', code)
 
     def add_memory_sql_session(self, code):
-
-        template_module_directory = os.path.join(self.template_root_directory, COMMON)
-        create_folder(template_module_directory)
-
-        path = f'{template_module_directory}/__init__.py'
-        create_file_and_add_code_into_there(path, "")
-
-        path = f'{template_module_directory}/sql_session.py'
-        create_file_and_add_code_into_there(path, code)
-
+        self.sink.add(f'{COMMON}/__init__.py', "")
+        self.sink.add(f'{COMMON}/sql_session.py', code)
 
     def add_app(self, code):
+        self.sink.add('__init__.py', "")
+        self.sink.add('app.py', code)
 
-        template_module_directory = os.path.join(self.template_root_directory)
-        create_folder(template_module_directory)
-
-        path = f'{template_module_directory}/__init__.py'
-        create_file_and_add_code_into_there(path, "")
-
-        path = f'{template_module_directory}/app.py'
-        create_file_and_add_code_into_there(path, code)
-
-
+    def add_startup_probe(self, code):
+        self.sink.add('startup_probe.py', code)
 
+    def add_bundle(self, bundle):
+        for path, code in bundle.items():
+            self.sink.add(path, code)
@@ -1,22 +1,14 @@
-import os
-
 from .code_generator import CodeGenerator
+from .output_sink import OutputSink
 from ..misc.constant import MODEL
-from ..utils.create_file import create_folder, create_file_and_add_code_into_there
 
 
 class ModelTemplateGenerator(CodeGenerator):
-    def __init__(self):
-        super(ModelTemplateGenerator, self).__init__()
+    def __init__(self, sink: OutputSink):
+        super(ModelTemplateGenerator, self).__init__(sink)
 
     def add_model(self, model_name, code):
-        template_model_directory = os.path.join(self.template_root_directory, MODEL)
-        create_folder(template_model_directory)
-
-        path = f'{template_model_directory}/__init__.py'
-        create_file_and_add_code_into_there(path, "")
-
-        path = f'{template_model_directory}/{model_name}.py'
-        create_file_and_add_code_into_there(path, code)
+        path = f'{MODEL}/{model_name}.py'
+        self.sink.add(f'{MODEL}/__init__.py', "")
+        self.sink.add(path, code)
         self.module_path_map[model_name] = {'model': path}
-
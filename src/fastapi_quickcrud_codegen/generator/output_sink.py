@@ -0,0 +1,88 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+from ..utils.create_file import create_folder, write_file_atomically
+
+Code = Union[str, Iterable[str]]
+
+
+class OutputSink:
+    """
+    Collects the generated code in memory, keyed by the path of the file relative to the project root
+
+    Code added to the same path is concatenated, so a package's __init__.py added by every module is
+    written once only. The code is a string or an iterable of chunks, e.g. a CodeBuffer
+    """
+
+    def __init__(self):
+        self.artifacts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, path: str, code: Code) -> None:
+        if not isinstance(code, str):
+            code = "".join(code)
+        with self._lock:
+            self.artifacts[path] = self.artifacts.get(path, "") + code
+
+    def merge(self, artifacts: Dict[str, str]) -> None:
+        for path, code in artifacts.items():
+            self.add(path, code)
+
+    def flush(self) -> None:
+        pass
+
+    def discard(self) -> None:
+        with self._lock:
+            self.artifacts = {}
+
+
+class FileSystemOutputSink(OutputSink):
+    """
+    Keeps the chunks of every file until flush(), which creates each folder once and replaces each file atomically
+    (temporary file + os.replace), optionally on a thread pool. The chunks are written one by one instead of being
+    joined first, but the code of every added file is in memory until the flush. A reader never sees a partially
+    written file and a re-run never appends to the file of the previous run
+    """
+
+    def __init__(self, root_directory: str, workers: Optional[int] = None):
+        super(FileSystemOutputSink, self).__init__()
+        self.root_directory = root_directory
+        self.workers = workers
+        self._chunks: Dict[str, List[str]] = {}
+
+    def add(self, path: str, code: Code) -> None:
+        with self._lock:
+            chunks = self._chunks.setdefault(path, [])
+            if isinstance(code, str):
+                chunks.append(code)
+            else:
+                chunks.extend(code)
+
+    def _write(self, path: str, chunks: List[str]) -> None:
+        path = os.path.join(self.root_directory, path)
+        # an empty package marker only needs to exist
+        if not any(chunks) and os.path.isfile(path) and not os.path.getsize(path):
+            return
+        write_file_atomically(path, chunks)
+
+    def flush(self) -> None:
+        with self._lock:
+            files, self._chunks = self._chunks, {}
+        for directory in {os.path.dirname(os.path.join(self.root_directory, i)) for i in files}:
+            create_folder(directory)
+        if self.workers and self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for _ in executor.map(self._write, files.keys(), files.values()):
+                    pass
+        else:
+            for path, chunks in files.items():
+                self._write(path, chunks)
+
+    def discard(self) -> None:
+        """
+        Drop the files which are not flushed yet, the files of the previous run are left as they are
+        """
+        with self._lock:
+            self._chunks = {}
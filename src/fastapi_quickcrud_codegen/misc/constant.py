@@ -2,3 +2,8 @@ GENERATION_FOLDER = "fastapi_quick_crud_template"
 MODEL = "model"
 ROUTE = "route"
 COMMON = "common"
+OPENAPI = "openapi.json"
+INDEX_REPORT = "index_report.txt"
+INDEX_DDL = "index_advice.sql"
+MODELS_BUNDLE = "models.py"
+ROUTES_BUNDLE = "routes.py"
@@ -1,10 +1,3 @@
-from fastapi import HTTPException
-
-
-class FindOneApiNotRegister(HTTPException):
-    pass
-
-
 class CRUDBuilderException(BaseException):
     pass
 
@@ -45,9 +38,3 @@ class ColumnTypeNotSupportedException(CRUDBuilderException):
 #     def __init__(self, Collection: Type[ModelType], model: BaseModel):
 #         detail = "was already existed"
 #         super().__init__(Collection, model, detail)
-
-class FDDRestHTTPException(HTTPException):
-    """Baseclass for all HTTP exceptions in FDD Rest API.  This exception can be called as WSGI
-        application to render a default error page or you can catch the subclasses
-        of it independently and render nicer error messages.
-        """
@@ -1,9 +1,12 @@
-from sqlalchemy.orm import decl_api
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from sqlalchemy.orm import decl_api
 
-def get_table_name_from_model(table: decl_api.DeclarativeMeta):
+
+def get_table_name_from_model(table: "decl_api.DeclarativeMeta"):
     return table.__tablename__
 
 
-def get_table_name(table: decl_api.DeclarativeMeta):
+def get_table_name(table: "decl_api.DeclarativeMeta"):
     return get_table_name_from_model(table)
@@ -0,0 +1,12 @@
+from fastapi import HTTPException
+
+
+class FindOneApiNotRegister(HTTPException):
+    pass
+
+
+class FDDRestHTTPException(HTTPException):
+    """Baseclass for all HTTP exceptions in FDD Rest API.  This exception can be called as WSGI
+        application to render a default error page or you can catch the subclasses
+        of it independently and render nicer error messages.
+        """
@@ -11,6 +11,40 @@ class SqlType(StrEnum):
     mssql = auto()
 
 
+class GenerationPhase(StrEnum):
+    schema_extraction = auto()
+    model_rendering = auto()
+    route_rendering = auto()
+    common_module_rendering = auto()
+    file_io = auto()
+    openapi_generation = auto()
+
+
+class ProjectLayout(StrEnum):
+    # a model and a route module of every table
+    modules = auto()
+    # every model in models.py and every route in routes.py
+    bundle = auto()
+
+
+class CountStrategy(StrEnum):
+    # fetch every matching row and count them
+    fetch_all = auto()
+    # a SELECT count(*) of the filters
+    count = auto()
+    # a count(*) OVER () column of the page query
+    window = auto()
+    # the SELECT count(*) and the page query on two connections at the same time, async only
+    concurrent = auto()
+
+
+class Pagination(StrEnum):
+    # limit and offset
+    offset = auto()
+    # limit and the opaque cursor of the last row of the previous page
+    cursor = auto()
+
+
 class Ordering(StrEnum):
     DESC = auto()
     ASC = auto()
@@ -27,6 +61,7 @@ class CrudMethods(Enum):
     CREATE_MANY = "CREATE_MANY"
     DELETE_ONE = "DELETE_ONE"
     DELETE_MANY = "DELETE_MANY"
+    EXPORT = "EXPORT"
 
     @staticmethod
     def get_full_crud_method():
@@ -72,6 +107,8 @@ class CRUDRequestMapping(Enum):
     DELETE_ONE = RequestMethods.DELETE
     DELETE_MANY = RequestMethods.DELETE
 
+    EXPORT = RequestMethods.GET
+
     GET_VIEW = RequestMethods.GET
     POST_REDIRECT_GET = RequestMethods.POST
 
@@ -1,14 +1,11 @@
-from pathlib import Path
-from typing import ClassVar
-
-import jinja2
-
+from .template_registry import get_template
+from ..utils.code_buffer import CodeBuffer
 from ..utils.import_builder import ImportBuilder
 
 
 class CommonCodeGen:
     def __init__(self):
-        self.code = ""
+        self.code = CodeBuffer()
         self.model_code = ""
         self.import_list = ""
         self.import_helper = ImportBuilder()
@@ -18,81 +15,49 @@ class CommonCodeGen:
         template_generator_method(self.code)
 
     def build_type(self) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'common/typing.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'typing.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render()
-        self.code += code
+        template = get_template('common/typing.jinja2')
+        self.code.render(template)
 
     def build_utils(self) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'common/utils.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'utils.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
+        template = get_template('common/utils.jinja2')
         self.import_helper.add(import_=set(["QueryOperatorNotFound", "UnknownColumn"]),
                                from_="common.http_exception")
         self.import_helper.add(
             import_=set(["ExtraFieldType", "ExtraFieldTypePrefix", "process_type_map", "process_map"]),
             from_="common.typing")
 
-        code = template.render({"import": self.import_helper.to_code()})
-
-        self.code += code
+        self.code.render(template, {"import": self.import_helper.to_code()})
 
     def build_http_exception(self) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'common/http_exception.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
+        template = get_template('common/http_exception.jinja2')
+        self.code.render(template)
 
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'http_exception.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render()
-        self.code += code
+    def build_pagination(self) -> None:
+        template = get_template('common/pagination.jinja2')
+        self.code.render(template)
 
-    def build_db(self) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'common/db.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'db.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render()
-        self.code += code
-
-    def build_db_session(self, model_list: dict, is_async: bool, database_url: str, is_in_memory_db: bool) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'common/memory_sql_session.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
+    def build_fast_response(self) -> None:
+        template = get_template('common/fast_response.jinja2')
+        self.code.render(template)
 
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'memory_sql_session.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render({"model_list": model_list, "is_async": is_async, "database_url": database_url,
-                                "is_in_memory_db": is_in_memory_db})
-        self.code += code
+    def build_export(self) -> None:
+        template = get_template('common/export.jinja2')
+        self.code.render(template)
 
-    def build_app(self, model_list) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'common/app.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'app.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render({"model_list": model_list})
-        self.code += code
+    def build_db(self) -> None:
+        template = get_template('common/db.jinja2')
+        self.code.render(template)
+
+    def build_db_session(self, model_list: dict, is_async: bool, database_url: str, is_in_memory_db: bool,
+                         bundle: bool = False) -> None:
+        template = get_template('common/memory_sql_session.jinja2')
+        self.code.render(template, {"model_list": model_list, "is_async": is_async, "database_url": database_url,
+                                    "is_in_memory_db": is_in_memory_db, "bundle": bundle})
+
+    def build_app(self, model_list, static_openapi: bool = False, bundle: bool = False) -> None:
+        template = get_template('common/app.jinja2')
+        self.code.render(template, {"model_list": model_list, "static_openapi": static_openapi, "bundle": bundle})
+
+    def build_startup_probe(self, model_list, startup_budget: float = None) -> None:
+        template = get_template('common/startup_probe.jinja2')
+        self.code.render(template, {"model_list": model_list, "startup_budget": startup_budget})
@@ -1,15 +1,17 @@
-from pathlib import Path
-from typing import ClassVar
-
-import jinja2
+from itertools import chain
+from typing import List
 
+from .template_registry import get_template
 from ..generator.crud_template_generator import CrudTemplateGenerator
+from ..misc.type import CountStrategy, Pagination
+from ..utils.code_buffer import CodeBuffer
 from ..utils.import_builder import ImportBuilder
 
 
 class CrudCodeGen():
     def __init__(self, tags, prefix):
-        self.code = "\n" + "api = APIRouter(tags=" + str(tags) + ',' + "prefix=" + '"' + prefix + '")' + "\n\n\n"
+        self.code = CodeBuffer(
+            "\n" + "api = APIRouter(tags=" + str(tags) + ',' + "prefix=" + '"' + prefix + '")' + "\n\n\n")
         self.import_helper = ImportBuilder()
         self.import_helper.add(import_="HTTPStatus", from_="http")
         self.import_helper.add(import_=set(["List", "Union"]), from_="typing")
@@ -20,38 +22,63 @@ class CrudCodeGen():
         self.import_helper.add(import_=set(["db_session"]), from_="common.sql_session")
 
     def gen(self, *, template_generator: CrudTemplateGenerator, file_name: str) -> None:
-        template_generator.add_route(file_name, self.import_helper.to_code() + self.code)
-
-    def build_find_one_route(self, *, is_async: bool, path: str, file_name: str, model_name: str) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/find_one.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'find_one.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
-            {"model_name": model_name, "path": path, "is_async": is_async})
+        # the imports are only known once every route is built, the header is the first chunk of the file
+        template_generator.add_route(file_name, chain([self.import_helper.to_code()], self.code))
+
+    def _add_projection_imports(self) -> None:
+        self.import_helper.add(import_="Query", from_="fastapi")
+        self.import_helper.add(import_="Optional", from_="typing")
+        self.import_helper.add(import_="UnknownColumn", from_="common.http_exception")
+
+    def build_find_one_route(self, *, is_async: bool, path: str, file_name: str, model_name: str,
+                             projection: bool = False, fast_response: bool = False) -> None:
+        template = get_template('route/find_one.jinja2')
+        self.code.render(template,
+            {"model_name": model_name, "path": path, "is_async": is_async, "projection": projection,
+             "fast_response": fast_response})
+        if projection:
+            self._add_projection_imports()
+        if fast_response:
+            self.import_helper.add(import_="FastJSONResponse", from_="common.fast_response")
         self.import_helper.add(import_=set([
             f"{model_name}FindOneResponseModel",
             f"{model_name}FindOneRequestBodyModel",
             f"{model_name}PrimaryKeyModel",
             f"{model_name}"]
         ), from_=f"model.{file_name}")
-        self.code += code + "\n\n"
-
-    def build_find_many_route(self, *, is_async: bool, path: str, file_name: str, model_name: str) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/find_many.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'find_many.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
-            {"model_name": model_name, "path": path, "is_async": is_async})
+        self.code.write("\n\n")
+
+    def build_find_many_route(self, *, is_async: bool, path: str, file_name: str, model_name: str,
+                              count_strategy: CountStrategy = CountStrategy.fetch_all,
+                              pagination: Pagination = Pagination.offset, primary_key_name: str = None,
+                              projection: bool = False, deferred_fields: List[str] = None,
+                              fast_response: bool = False, nullable_fields: List[str] = None) -> None:
+        if projection:
+            self._add_projection_imports()
+        if fast_response:
+            self.import_helper.add(import_="FastJSONResponse", from_="common.fast_response")
+        if pagination == Pagination.cursor:
+            template = get_template('route/find_many_cursor.jinja2')
+            self.code.render(template, {"model_name": model_name, "path": path, "is_async": is_async,
+                                        "primary_key_name": primary_key_name, "projection": projection,
+                                        "deferred_fields": deferred_fields, "fast_response": fast_response,
+                                        "nullable_fields": nullable_fields})
+            self.import_helper.add(import_=set(["encode_cursor", "decode_cursor", "seek_condition"]),
+                                   from_="common.pagination")
+            if nullable_fields:
+                self.import_helper.add(import_="NullableSortColumn", from_="common.pagination")
+        else:
+            template = get_template('route/find_many.jinja2')
+            self.code.render(template,
+                {"model_name": model_name, "path": path, "is_async": is_async,
+                 "count_strategy": None if count_strategy == CountStrategy.fetch_all else str(count_strategy),
+                 "projection": projection, "deferred_fields": deferred_fields, "fast_response": fast_response})
+        if count_strategy != CountStrategy.fetch_all:
+            self.import_helper.add(import_="Query", from_="fastapi")
+            self.import_helper.add(import_="func", from_="sqlalchemy")
+        if count_strategy == CountStrategy.concurrent:
+            self.import_helper.add(import_="asyncio")
+            self.import_helper.add(import_="AsyncSession", from_="sqlalchemy.ext.asyncio")
 
         self.import_helper.add(import_=set([
             f"{model_name}FindManyResponseModel",
@@ -64,18 +91,30 @@ class CrudCodeGen():
                                from_="common.http_exception")
         self.import_helper.add(import_=set(["Ordering"]), from_="common.typing")
 
-        self.code += code + "\n\n"
+        self.code.write("\n\n")
+
+    def build_export_route(self, *, is_async: bool, path: str, file_name: str, model_name: str) -> None:
+        template = get_template('route/export.jinja2')
+        self.code.render(template,
+            {"model_name": model_name, "path": path, "is_async": is_async})
+        self.import_helper.add(import_="Query", from_="fastapi")
+        self.import_helper.add(import_="StreamingResponse", from_="fastapi.responses")
+        self.import_helper.add(import_=set(["ExportFormat", "EXPORT_MEDIA_TYPES",
+                                            "stream_rows_async" if is_async else "stream_rows"]),
+                               from_="common.export")
+        self.import_helper.add(import_=set([
+            f"{model_name}ExportResponseModel",
+            f"{model_name}ExportQueryParamModel",
+            f"{model_name}"]
+        ), from_=f"model.{file_name}")
+        self.import_helper.add(import_=set(["UnknownOrderType", "UnknownColumn"]),
+                               from_="common.http_exception")
+        self.import_helper.add(import_=set(["Ordering"]), from_="common.typing")
+        self.code.write("\n\n")
 
     def build_insert_one_route(self, *, is_async: bool, path: str, file_name: str, model_name: str) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/insert_one.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'insert_one.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+        template = get_template('route/insert_one.jinja2')
+        self.code.render(template,
             {"model_name": model_name, "path": path, "is_async": is_async})
         self.import_helper.add(import_="IntegrityError", from_="sqlalchemy.exc")
         self.import_helper.add(import_="parse_obj_as", from_="pydantic")
@@ -89,18 +128,11 @@ class CrudCodeGen():
             f"{model_name}CreateOneRequestBodyModel",
             f"{model_name}"]
         ), from_=f"model.{file_name}")
-        self.code += code + "\n\n"
+        self.code.write("\n\n")
 
     def build_insert_many_route(self, *, is_async: bool, path: str, file_name: str, model_name: str) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/insert_many.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'insert_many.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+        template = get_template('route/insert_many.jinja2')
+        self.code.render(template,
             {"model_name": model_name, "path": path, "is_async": is_async})
         self.import_helper.add(import_="IntegrityError", from_="sqlalchemy.exc")
         self.import_helper.add(import_="parse_obj_as", from_="pydantic")
@@ -114,18 +146,11 @@ class CrudCodeGen():
             f"{model_name}CreateManyItemListRequestModel",
             f"{model_name}"]
         ), from_=f"model.{file_name}")
-        self.code += code + "\n\n"
+        self.code.write("\n\n")
 
     def build_update_one_route(self, *, is_async: bool, path: str, file_name: str, model_name: str) -> None:
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/update_one.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'update_one.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+        template = get_template('route/update_one.jinja2')
+        self.code.render(template,
             {"model_name": model_name, "path": path, "is_async": is_async})
         self.import_helper.add(import_="IntegrityError", from_="sqlalchemy.exc")
         self.import_helper.add(import_="parse_obj_as", from_="pydantic")
@@ -141,18 +166,11 @@ class CrudCodeGen():
             f"{model_name}PrimaryKeyModel",
             f"{model_name}"]
         ), from_=f"model.{file_name}")
-        self.code += code + "\n\n"
+        self.code.write("\n\n")
 
     def build_update_many_route(self, *, is_async: bool, path: str, file_name: str, model_name: str):
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/update_many.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'update_many.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+        template = get_template('route/update_many.jinja2')
+        self.code.render(template,
             {"model_name": model_name, "path": path, "is_async": is_async})
         self.import_helper.add(import_="IntegrityError", from_="sqlalchemy.exc")
         self.import_helper.add(import_="parse_obj_as", from_="pydantic")
@@ -167,18 +185,11 @@ class CrudCodeGen():
             f"{model_name}UpdateManyItemListResponseModel",
             f"{model_name}"]
         ), from_=f"model.{file_name}")
-        self.code += code + "\n\n"
+        self.code.write("\n\n")
 
     def build_patch_one_route(self, *, is_async: bool, path: str, file_name: str, model_name: str):
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/patch_one.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'patch_one.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+        template = get_template('route/patch_one.jinja2')
+        self.code.render(template,
             {"model_name": model_name, "path": path, "is_async": is_async})
         self.import_helper.add(import_="IntegrityError", from_="sqlalchemy.exc")
         self.import_helper.add(import_="parse_obj_as", from_="pydantic")
@@ -189,18 +200,11 @@ class CrudCodeGen():
             f"{model_name}PrimaryKeyModel",
             f"{model_name}"]
         ), from_=f"model.{file_name}")
-        self.code += code + "\n\n"
+        self.code.write("\n\n")
 
     def build_patch_many_route(self, *, is_async: bool, path: str, file_name: str, model_name: str):
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/patch_many.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'patch_many.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+        template = get_template('route/patch_many.jinja2')
+        self.code.render(template,
             {"model_name": model_name, "path": path, "is_async": is_async})
         self.import_helper.add(import_="IntegrityError", from_="sqlalchemy.exc")
         self.import_helper.add(import_="parse_obj_as", from_="pydantic")
@@ -210,18 +214,11 @@ class CrudCodeGen():
             f"{model_name}PatchManyItemListResponseModel",
             f"{model_name}"]
         ), from_=f"model.{file_name}")
-        self.code += code + "\n\n"
+        self.code.write("\n\n")
 
     def build_delete_one_route(self, *, is_async: bool, path: str, file_name: str, model_name: str):
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/delete_one.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'delete_one.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+        template = get_template('route/delete_one.jinja2')
+        self.code.render(template,
             {"model_name": model_name, "path": path, "is_async": is_async})
         self.import_helper.add(import_="parse_obj_as", from_="pydantic")
         self.import_helper.add(import_=set([
@@ -230,18 +227,11 @@ class CrudCodeGen():
             f"{model_name}PrimaryKeyModel",
             f"{model_name}"]
         ), from_=f"model.{file_name}")
-        self.code += code + "\n\n"
+        self.code.write("\n\n")
 
     def build_delete_many_route(self, *, is_async: bool, path: str, file_name: str, model_name: str):
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'route/delete_many.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = 'delete_many.jinja2'
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+        template = get_template('route/delete_many.jinja2')
+        self.code.render(template,
             {"model_name": model_name, "path": path, "is_async": is_async})
         self.import_helper.add(import_="parse_obj_as", from_="pydantic")
         self.import_helper.add(import_=set([
@@ -249,4 +239,4 @@ class CrudCodeGen():
             f"{model_name}DeleteManyItemListResponseModel",
             f"{model_name}"]
         ), from_=f"model.{file_name}")
-        self.code += code + "\n\n"
+        self.code.write("\n\n")
@@ -1,20 +1,30 @@
-import inspect
-from pathlib import Path
-from typing import ClassVar, List, Tuple
+import re
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
 
-import jinja2
 from sqlalchemy.orm import decl_api
 
+from .template_registry import get_template
 from ..generator.model_template_generator import ModelTemplateGenerator
-from ..utils.import_builder import ImportBuilder
+from ..generator.output_sink import OutputSink
+from ..utils.code_buffer import CodeBuffer
+from ..utils.import_builder import ImportBuilder, referenced_names
+from ..utils.model_source import get_model_source
 
 
 class ModelCodeGen():
-    def __init__(self, file_name: str, db_type: str):
+    def __init__(self, file_name: str, db_type: str, sink: OutputSink, explicit_imports: bool = False,
+                 shared_models: bool = False):
         self.file_name = file_name
-        self.code = ""
+        self.explicit_imports = explicit_imports
+        self.shared_models = shared_models
+        # shared_models: the base response model, the aliases {alias: class} and the list models by shape
+        self.shared_response_model: Optional[Tuple[str, List[Tuple]]] = None
+        self.aliases: Dict[str, str] = {}
+        self.shared_list_models: Dict[tuple, str] = {}
+        self.code = CodeBuffer()
         self.model_code = ""
-        self.constant = ""
+        self.constant = CodeBuffer()
         self.import_helper = ImportBuilder()
         self.import_helper.add(import_=set(["dataclass", "field"]), from_="dataclasses")
         self.import_helper.add(import_=set(['datetime', 'timedelta', 'date', 'time']), from_="datetime")
@@ -34,85 +44,127 @@ class ModelCodeGen():
                                             'MatchingPatternInStringBase', 'RangeFromComparisonOperators']),
                                from_="common.typing")
         self.import_helper.add(import_="uuid")
-        self.model_template_gen = ModelTemplateGenerator()
+        self.model_template_gen = ModelTemplateGenerator(sink)
 
     def gen(self):
+        if self.explicit_imports:
+            # the module has to be complete to know which names it uses
+            code = "".join(chain(self.constant, ["\n", self.model_code, "\n\n"], self.code))
+            return self.model_template_gen.add_model(self.file_name,
+                                                     self.import_helper.to_code(referenced_names(code)) + code)
         return self.model_template_gen.add_model(self.file_name,
-                                                 self.import_helper.to_code() + self.constant + "\n" + self.model_code + "\n\n" + self.code)
+                                                 chain([self.import_helper.to_code()], self.constant,
+                                                       ["\n", self.model_code, "\n\n"], self.code))
 
     def gen_model(self, model: decl_api.DeclarativeMeta):
-        self.model_code = inspect.getsource(model)
+        self.model_code = get_model_source(model)
 
     def build_base_model(self, *, class_name: str, fields: List[Tuple], description: str = None, orm_mode: bool = True,
-                         value_of_list_to_str_columns: List[str] = None, filter_none: bool = None):
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'pydantic/BaseModel.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = "BaseModel.jinja2"
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+                         value_of_list_to_str_columns: List[str] = None, filter_none: bool = None,
+                         base_model: str = "BaseModel"):
+        template = get_template('pydantic/BaseModel.jinja2')
+        self.code.render(template,
             {"class_name": class_name, "fields": fields, "description": description, "orm_mode": orm_mode,
-             "value_of_list_to_str_columns": value_of_list_to_str_columns, "filter_none": filter_none})
-        self.code += code + "\n\n\n"
+             "value_of_list_to_str_columns": value_of_list_to_str_columns, "filter_none": filter_none,
+             "base_model": base_model})
+        self.code.write("\n\n\n")
+
+    def build_alias(self, *, class_name: str, target: str):
+        template = get_template('pydantic/alias.jinja2')
+        self.code.render(template, {"class_name": class_name, "target": target})
+        self.code.write("\n\n\n")
+        self.aliases[class_name] = target
+
+    def build_shared_response_model(self, *, class_name: str, fields: List[Tuple]):
+        """
+        The column-bearing response model of the table, the response models of the crud methods derive from it
+        """
+        self.shared_response_model = (class_name, fields)
+        self.build_base_model(class_name=class_name, fields=fields)
+
+    def build_response_model(self, *, class_name: str, fields: List[Tuple]):
+        """
+        A response model of a crud method. With shared_models, it is an alias of the shared response model if it
+        has the same fields, otherwise a subclass of it which overrides the different fields
+        """
+        if not self.shared_models or self.shared_response_model is None:
+            return self.build_base_model(class_name=class_name, fields=fields)
+        base_class_name, base_fields = self.shared_response_model
+        if [i[0] for i in fields] != [i[0] for i in base_fields]:
+            return self.build_base_model(class_name=class_name, fields=fields)
+        base_field_shapes = {i[0]: _field_shape(i) for i in base_fields}
+        overridden_fields = [i for i in fields if _field_shape(i) != base_field_shapes[i[0]]]
+        if not overridden_fields:
+            return self.build_alias(class_name=class_name, target=base_class_name)
+        self.build_base_model(class_name=class_name, fields=overridden_fields, orm_mode=False,
+                              base_model=base_class_name)
+
+    def _shared_list_model(self, class_name: str, shape: tuple) -> bool:
+        """
+        With shared_models, alias the list model if a list model of the same shape is already built
+
+        :return: True if the alias is built
+        """
+        if not self.shared_models:
+            return False
+        if shape in self.shared_list_models:
+            self.build_alias(class_name=class_name, target=self.shared_list_models[shape])
+            return True
+        self.shared_list_models[shape] = class_name
+        return False
 
     def build_base_model_paginate(self, *, class_name: str, field: List[Tuple], description: str = None,
                                   base_model: str = "BaseModel",
-                                  value_of_list_to_str_columns: List[str] = None, filter_none: bool = None):
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'pydantic/base_model_paginate.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = "base_model_paginate.jinja2"
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+                                  value_of_list_to_str_columns: List[str] = None, filter_none: bool = None,
+                                  optional_total: bool = False, cursor: bool = False):
+        field = (self.aliases.get(field[0], field[0]),) + tuple(field[1:])
+        if self._shared_list_model(class_name, ("paginate", field, description, base_model,
+                                                str(value_of_list_to_str_columns), filter_none, optional_total,
+                                                cursor)):
+            return
+        template = get_template('pydantic/base_model_paginate.jinja2')
+        self.code.render(template,
             {"class_name": class_name, "field": field, "description": description, "base_model": base_model,
-             "value_of_list_to_str_columns": value_of_list_to_str_columns, "filter_none": filter_none})
-        self.code += code + "\n\n\n"
+             "value_of_list_to_str_columns": value_of_list_to_str_columns, "filter_none": filter_none,
+             "optional_total": optional_total, "cursor": cursor})
+        self.code.write("\n\n\n")
 
     def build_base_model_root(self, *, class_name: str, field: List[Tuple], description: str = None,
                               base_model: str = "BaseModel",
                               value_of_list_to_str_columns: List[str] = None, filter_none: bool = None):
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'pydantic/BaseModel.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = "BaseModel_root.jinja2"
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render(
+        field = (self.aliases.get(field[0], field[0]),) + tuple(field[1:])
+        if self._shared_list_model(class_name, ("root", field, description, base_model,
+                                                str(value_of_list_to_str_columns), filter_none)):
+            return
+        template = get_template('pydantic/BaseModel_root.jinja2')
+        self.code.render(template,
             {"class_name": class_name, "field": field, "description": description, "base_model": base_model,
              "value_of_list_to_str_columns": value_of_list_to_str_columns, "filter_none": filter_none})
-        self.code += code + "\n\n\n"
+        self.code.write("\n\n\n")
 
     def build_dataclass(self, *, class_name: str, fields: List[str], description: str = None,
                         value_of_list_to_str_columns: List[str] = None,
                         filter_none: bool = None):
-        TEMPLATE_FILE_PATH: ClassVar[str] = 'pydantic/BaseModel.jinja2'
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = "dataclass.jinja2"
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render({"class_name": class_name, "fields": fields, "description": description,
-                                "value_of_list_to_str_columns": value_of_list_to_str_columns,
-                                "filter_none": filter_none})
-        self.code += code + "\n\n\n"
+        template = get_template('pydantic/dataclass.jinja2')
+        self.code.render(template, {"class_name": class_name, "fields": fields, "description": description,
+                                    "value_of_list_to_str_columns": value_of_list_to_str_columns,
+                                    "filter_none": filter_none})
+        self.code.write("\n\n\n")
 
     def build_constant(self, *, constants: List[Tuple]):
-        TEMPLATE_FILE_PATH: ClassVar[str] = ''
-        template_file_path = Path(TEMPLATE_FILE_PATH)
-        TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
-        templateLoader = jinja2.FileSystemLoader(str(TEMPLATE_DIR / template_file_path.parent))
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        TEMPLATE_FILE = "Constant.jinja2"
-        template = templateEnv.get_template(TEMPLATE_FILE)
-        code = template.render({"constants": constants})
-        self.constant += code
+        template = get_template('Constant.jinja2')
+        self.constant.render(template, {"constants": constants})
+
+
+def _field_shape(field: Tuple) -> Tuple:
+    """
+    The field with the equivalent defaults written the same way, Body(x, description=None) is Body(x) and
+    Body(None) is None
+    """
+    name, field_type = field[0], field[1]
+    default = field[2] if len(field) > 2 else None
+    if isinstance(default, str):
+        default = re.sub(r", description=None\)$", ")", default)
+        if default == "Body(None)":
+            default = None
+    return name, field_type, default
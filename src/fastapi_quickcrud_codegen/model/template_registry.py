@@ -0,0 +1,126 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import jinja2
+
+TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template'
+COMPILED_TEMPLATE_DIR: Path = Path(__file__).parents[0] / 'template_compiled'
+COMPILED_TEMPLATE_MANIFEST = 'manifest.json'
+TEMPLATE_SUFFIX = '.jinja2'
+
+
+class TemplateRegistry:
+    """
+    Process-wide store of the Jinja templates under model/template
+
+    Every template is parsed and compiled at most once per process. When an ahead-of-time
+    compiled bundle (see `compile`) exists and was built from the current template sources,
+    templates are loaded from the bundle and never parsed at all.
+    """
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR, compiled_template_dir: Path = COMPILED_TEMPLATE_DIR):
+        self.template_dir = Path(template_dir)
+        self.compiled_template_dir = Path(compiled_template_dir)
+        self._templates: Dict[str, jinja2.Template] = {}
+        self._environment: Optional[jinja2.Environment] = None
+        self._digest: Optional[str] = None
+        self._lock = threading.RLock()
+
+    def template_names(self) -> List[str]:
+        return sorted(path.relative_to(self.template_dir).as_posix()
+                      for path in self.template_dir.rglob(f'*{TEMPLATE_SUFFIX}'))
+
+    def digest(self) -> str:
+        """
+        Hash of every template source, changes whenever any template is edited
+        """
+        with self._lock:
+            if self._digest is None:
+                sha = hashlib.sha256()
+                for name in self.template_names():
+                    sha.update(name.encode())
+                    sha.update((self.template_dir / name).read_bytes())
+                self._digest = sha.hexdigest()
+            return self._digest
+
+    def source_digest(self, name: str) -> str:
+        return hashlib.sha256((self.template_dir / name).read_bytes()).hexdigest()
+
+    def _is_compiled_bundle_usable(self) -> bool:
+        manifest_path = self.compiled_template_dir / COMPILED_TEMPLATE_MANIFEST
+        if not manifest_path.is_file():
+            return False
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except ValueError:
+            return False
+        return manifest.get('digest') == self.digest()
+
+    @property
+    def environment(self) -> jinja2.Environment:
+        with self._lock:
+            if self._environment is None:
+                if self._is_compiled_bundle_usable():
+                    loader = jinja2.ModuleLoader(str(self.compiled_template_dir))
+                else:
+                    loader = jinja2.FileSystemLoader(str(self.template_dir))
+                # the templates ship with the package, so there is nothing to reload
+                self._environment = jinja2.Environment(loader=loader, auto_reload=False, cache_size=-1)
+            return self._environment
+
+    def get_template(self, name: str) -> jinja2.Template:
+        template = self._templates.get(name)
+        if template is None:
+            with self._lock:
+                template = self._templates.get(name)
+                if template is None:
+                    template = self.environment.get_template(name)
+                    self._templates[name] = template
+        return template
+
+    def preload(self) -> None:
+        for name in self.template_names():
+            self.get_template(name)
+
+    def compile(self, target: Path = None) -> Path:
+        """
+        Build the ahead-of-time compiled bundle of all templates
+
+        :param target: folder of the bundle, the default one is picked up by the registry automatically
+        :return: folder of the bundle
+        """
+        if target is None:
+            target = self.compiled_template_dir
+        target = Path(target)
+        target.mkdir(parents=True, exist_ok=True)
+        for stale_module in target.glob('tmpl_*.py'):
+            stale_module.unlink()
+        environment = jinja2.Environment(loader=jinja2.FileSystemLoader(str(self.template_dir)))
+        environment.compile_templates(str(target), zip=None, ignore_errors=False,
+                                      filter_func=lambda name: name.endswith(TEMPLATE_SUFFIX))
+        (target / COMPILED_TEMPLATE_MANIFEST).write_text(json.dumps({'digest': self.digest()}))
+        return target
+
+
+_registry: Optional[TemplateRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = TemplateRegistry()
+    return _registry
+
+
+def get_template(name: str) -> jinja2.Template:
+    return get_template_registry().get_template(name)
+
+
+if __name__ == '__main__':
+    print(f"Compiled templates into {get_template_registry().compile()}")
@@ -0,0 +1,253 @@
+import keyword
+import os
+import re
+import warnings
+from fnmatch import fnmatch
+from typing import Dict, List, Optional, Sequence
+
+import sqlalchemy
+from sqlalchemy.orm import declarative_base
+
+from .db_model import DbModel
+from .misc.type import CrudMethods
+from .utils.column_schema import get_column_schemas
+from .utils.database_url import resolve_database_url
+from .utils.model_source import CODEGEN_SOURCE_ATTRIBUTE
+
+REFLECTED_MODULE = "fastapi_quickcrud_codegen.reflected"
+
+
+def _reflection_url(source: str) -> sqlalchemy.engine.URL:
+    """
+    A database URL is used with its sync driver, anything else is the path of a SQLite file
+    """
+    if "://" not in source:
+        return sqlalchemy.engine.make_url(f"sqlite:///{os.path.abspath(source)}")
+    url = sqlalchemy.engine.make_url(source)
+    if url.get_dialect().is_async:
+        # the reflection runs on a sync engine, e.g. sqlite+aiosqlite is reflected through sqlite
+        return url.set(drivername=url.get_backend_name())
+    return url
+
+
+def _is_included(table_name: str, schema: Optional[str], include: Sequence[str], exclude: Sequence[str]) -> bool:
+    names = [table_name] if not schema else [table_name, f"{schema}.{table_name}"]
+    if not any(fnmatch(name, pattern) for name in names for pattern in include):
+        return False
+    return not any(fnmatch(name, pattern) for name in names for pattern in exclude)
+
+
+def _class_name(table_name: str, used_names: set) -> str:
+    class_name = "".join(i[:1].upper() + i[1:] for i in re.split(r"\W|_", table_name) if i) or "Table"
+    if not class_name.isidentifier():
+        class_name = f"Table{class_name}"
+    unique_class_name = class_name
+    index = 1
+    while unique_class_name in used_names or keyword.iskeyword(unique_class_name):
+        index += 1
+        unique_class_name = f"{class_name}{index}"
+    used_names.add(unique_class_name)
+    return unique_class_name
+
+
+def _attribute_name(column_name: str) -> str:
+    attribute_name = re.sub(r"\W", "_", column_name)
+    if not attribute_name.isidentifier() or keyword.iskeyword(attribute_name) or attribute_name.startswith("__"):
+        attribute_name = f"column_{attribute_name}"
+    return attribute_name
+
+
+def _render_column(column, included_tables: set) -> str:
+    arguments = []
+    attribute_name = _attribute_name(column.name)
+    if attribute_name != column.name:
+        arguments.append(repr(column.name))
+    arguments.append(repr(column.type))
+    for foreign_key in column.foreign_keys:
+        # the foreign key to a table which is not generated would break the metadata of the generated project
+        target_table_key, _ = foreign_key.target_fullname.rsplit(".", 1)
+        if target_table_key in included_tables:
+            arguments.append(f"ForeignKey({foreign_key.target_fullname!r})")
+    if column.primary_key:
+        arguments.append("primary_key=True")
+        if len(column.table.primary_key.columns) == 1 and isinstance(column.type, sqlalchemy.Integer) and \
+                column.autoincrement in ("auto", True) and not column.foreign_keys:
+            arguments.append("autoincrement=True")
+    arguments.append(f"nullable={column.nullable}")
+    if column.server_default is not None:
+        server_default = getattr(column.server_default, "arg", None)
+        server_default = getattr(server_default, "text", server_default)
+        if server_default is not None:
+            arguments.append(f"server_default=text({str(server_default)!r})")
+    if column.comment:
+        arguments.append(f"comment={column.comment!r}")
+    if attribute_name != column.name:
+        # the generator names the fields by the key of the table column, not by the mapped attribute
+        arguments.append(f"key={attribute_name!r}")
+    return f"    {attribute_name} = Column({', '.join(arguments)})"
+
+
+def render_declarative_source(table, class_name: str, included_tables: set) -> str:
+    """
+    Source of a declarative class of the table, in the form of the hand written classes
+    """
+    lines = [f"class {class_name}(Base):", f"    __tablename__ = {table.name!r}"]
+    table_args = [f"UniqueConstraint({', '.join(repr(i.name) for i in constraint.columns)})"
+                  for constraint in table.constraints if isinstance(constraint, sqlalchemy.UniqueConstraint)]
+    if table.schema:
+        table_args.append(f"{{'schema': {table.schema!r}}}")
+    if table_args:
+        lines.append(f"    __table_args__ = ({', '.join(table_args)},)")
+    lines += [_render_column(column, included_tables) for column in table.columns]
+    return "\n".join(lines) + "\n"
+
+
+def _unsupported_reason(table) -> Optional[str]:
+    if not table.name.isidentifier() or keyword.iskeyword(table.name):
+        return "the table name is not a valid python module name"
+    primary_key_count = len(table.primary_key.columns)
+    if primary_key_count == 0:
+        return "it has no primary key"
+    if primary_key_count > 1:
+        return "composite primary key is not supported"
+    if len([i for i in table.constraints if isinstance(i, sqlalchemy.UniqueConstraint)]) > 1:
+        return "multiple unique constraints are not supported"
+    return None
+
+
+def reflect_metadata(source: str, *, schemas: Sequence[Optional[str]] = (None,),
+                     include: Sequence[str] = ("*",), exclude: Sequence[str] = ()) -> sqlalchemy.MetaData:
+    """
+    Reflect the tables of the database in one pass per schema
+
+    :param source: database URL or path of a SQLite file
+    :param schemas: the schemas to reflect, None is the default schema
+    :param include: fnmatch patterns of the table names (or schema.table) to reflect
+    :param exclude: fnmatch patterns of the table names (or schema.table) not to reflect
+    """
+    metadata = sqlalchemy.MetaData()
+    engine = sqlalchemy.create_engine(_reflection_url(source))
+    try:
+        with engine.connect() as connection:
+            for schema in schemas:
+                def only(table_name, _, schema=schema):
+                    return _is_included(table_name, schema, include, exclude)
+
+                metadata.reflect(bind=connection, schema=schema, only=only, resolve_fks=False)
+    finally:
+        engine.dispose()
+    return metadata
+
+
+def db_models_from_metadata(metadata: sqlalchemy.MetaData, *,
+                            database_url: str,
+                            include: Sequence[str] = ("*",),
+                            exclude: Sequence[str] = (),
+                            crud_methods: Optional[List[CrudMethods]] = None,
+                            prefix: str = "/{table_name}",
+                            tags: Optional[List[str]] = None) -> List[DbModel]:
+    """
+    Build a DbModel of every table of the MetaData
+
+    The declarative classes are rendered from the tables and carry their source, so they are generated like the hand
+    written ones. The tables the generator can not handle (no or composite primary key, multiple unique constraints)
+    are skipped and the columns of unsupported types are excluded, both with a warning
+
+    :param database_url: the database URL of the generated project, its dialect is used to render the classes
+    :param prefix: prefix of the api of each table, {table_name} is replaced by the table name
+    :param tags: tags of the api of each table, default to [table name]
+    """
+    sql_type, _ = resolve_database_url(database_url)
+    tables = []
+    table_names = set()
+    for table in metadata.sorted_tables:
+        if not _is_included(table.name, table.schema, include, exclude):
+            continue
+        reason = _unsupported_reason(table)
+        if reason is None and table.name in table_names:
+            reason = "a table with the same name is already generated"
+        if reason:
+            warnings.warn(f"Skip table {table.key}: {reason}")
+            continue
+        tables.append(table)
+        table_names.add(table.name)
+
+    included_tables = {i.key for i in tables}
+    used_class_names = set()
+    sources: Dict[str, str] = {}
+    for table in tables:
+        class_name = _class_name(table.name, used_class_names)
+        sources[class_name] = render_declarative_source(table, class_name, included_tables)
+
+    # the classes are executed with the imports of the generated model module, so they are the same as the
+    # generated code
+    namespace = {"__name__": REFLECTED_MODULE}
+    exec(f"from sqlalchemy import *\nfrom sqlalchemy.dialects.{sql_type} import *\n", namespace)
+    namespace["Base"] = declarative_base(metadata=sqlalchemy.MetaData())
+    exec(compile("\n\n".join(sources.values()), f"<{REFLECTED_MODULE}>", "exec"), namespace)
+
+    db_model_list = []
+    for class_name, source in sources.items():
+        db_model = namespace[class_name]
+        setattr(db_model, CODEGEN_SOURCE_ATTRIBUTE, source)
+        table_name = db_model.__tablename__
+        column_schemas = get_column_schemas(db_model)
+        if any(i.is_primary and i.unsupported_reason for i in column_schemas):
+            warnings.warn(f"Skip table {table_name}: the type of the primary key is not supported")
+            continue
+        exclude_columns = []
+        for column_schema in column_schemas:
+            if column_schema.unsupported_reason:
+                warnings.warn(f"Exclude column {table_name}.{column_schema.column_name}: "
+                              f"{column_schema.unsupported_reason}")
+                exclude_columns.append(column_schema.name)
+        db_model_list.append(DbModel(db_model=db_model,
+                                     prefix=prefix.format(table_name=table_name),
+                                     tags=tags if tags is not None else [table_name],
+                                     exclude_columns=exclude_columns,
+                                     crud_methods=crud_methods))
+    return db_model_list
+
+
+def crud_router_builder_from_metadata(*,
+                                      database_url: str,
+                                      is_async: bool,
+                                      metadata: Optional[sqlalchemy.MetaData] = None,
+                                      source: Optional[str] = None,
+                                      schemas: Sequence[Optional[str]] = (None,),
+                                      include: Sequence[str] = ("*",),
+                                      exclude: Sequence[str] = (),
+                                      crud_methods: Optional[List[CrudMethods]] = None,
+                                      prefix: str = "/{table_name}",
+                                      tags: Optional[List[str]] = None,
+                                      **kwargs) -> List[DbModel]:
+    """
+        Generate project from an existing database
+
+        :param database_url: the database URL of the generated project
+        :param is_async: True for async; False for sync
+        :param metadata: an already reflected MetaData, the database is reflected if it is not set
+        :param source: database URL or path of a SQLite file to reflect, default to database_url
+        :param schemas: the schemas to reflect, None is the default schema
+        :param include: fnmatch patterns of the table names (or schema.table) to generate
+        :param exclude: fnmatch patterns of the table names (or schema.table) not to generate
+        :param crud_methods: the apis of every table, default to CrudMethods.get_full_crud_method()
+        :param prefix: prefix of the api of each table, {table_name} is replaced by the table name
+        :param tags: tags of the api of each table, default to [table name]
+        :param kwargs: the other arguments of crud_router_builder, e.g. output_directory, workers, incremental
+
+        :return: the generated DbModel list
+
+        Examples:
+            >>> crud_router_builder_from_metadata(database_url="sqlite:///./legacy.db",
+                                                  is_async=False,
+                                                  exclude=["alembic_version", "tmp_*"])
+    """
+    from .crud_generator import crud_router_builder
+
+    if metadata is None:
+        metadata = reflect_metadata(source or database_url, schemas=schemas, include=include, exclude=exclude)
+    db_model_list = db_models_from_metadata(metadata, database_url=database_url, include=include, exclude=exclude,
+                                            crud_methods=crud_methods, prefix=prefix, tags=tags)
+    crud_router_builder(db_model_list=db_model_list, is_async=is_async, database_url=database_url, **kwargs)
+    return db_model_list
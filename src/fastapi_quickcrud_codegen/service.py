@@ -0,0 +1,159 @@
+"""
+Generator as a service
+
+    fastapi-crud-codegen serve --host 0.0.0.0 --port 8000
+
+POST /generate with the source of the declarative classes and the DbModel list, the response is the generated
+project as a zip archive. The process keeps the compiled templates and the column schema of the recently used
+sources, and the independent requests are generated concurrently on the thread pool of the app
+
+The source is executed by the service, only expose it to trusted callers
+"""
+import hashlib
+import io
+import zipfile
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel, Field
+
+from .crud_generator import crud_router_code_builder
+from .db_model import DbModel
+from .misc.constant import GENERATION_FOLDER
+from .misc.exceptions import CRUDBuilderException
+from .misc.type import CountStrategy, CrudMethods, Pagination, ProjectLayout
+from .model.template_registry import get_template_registry
+from .utils.instrumentation import logger
+from .utils.model_source import CODEGEN_SOURCE_ATTRIBUTE, class_sources
+from .utils.progress import progress_handler
+
+SOURCE_MODULE = "fastapi_quickcrud_codegen.service_source"
+# the number of model sources whose classes (and so their column schema) are kept between the requests
+SOURCE_CACHE_SIZE = 64
+
+
+class DbModelSpec(BaseModel):
+    class_name: str = Field(..., description="name of the declarative class in the source")
+    prefix: Optional[str] = Field(None, description="prefix of the api, default to /{table name}")
+    tags: Optional[List[str]] = Field(None, description="tags of the api, default to [table name]")
+    exclude_columns: List[str] = []
+    crud_methods: Optional[List[CrudMethods]] = None
+    count_strategy: CountStrategy = CountStrategy.fetch_all
+    pagination: Pagination = Pagination.offset
+    projection: bool = False
+    fast_response: bool = False
+
+
+class GenerationRequest(BaseModel):
+    source: str = Field(..., description="python source which defines the declarative classes, imports included")
+    db_models: List[DbModelSpec]
+    database_url: str
+    is_async: bool = False
+    static_openapi: bool = False
+    startup_probe: bool = False
+    startup_budget: Optional[float] = None
+    explicit_imports: bool = False
+    shared_models: bool = False
+    index_report: bool = False
+    index_ddl: bool = False
+    layout: ProjectLayout = ProjectLayout.modules
+
+
+@lru_cache(maxsize=SOURCE_CACHE_SIZE)
+def load_declarative_classes(source: str) -> Dict[str, type]:
+    """
+    Execute the model source in a new namespace and return its declarative classes, each one carries its own source
+
+    The classes of the same source are reused, so their column schema is only extracted once
+    """
+    module_name = f"{SOURCE_MODULE}_{hashlib.sha256(source.encode()).hexdigest()[:16]}"
+    namespace = {"__name__": module_name}
+    exec(compile(source, f"<{module_name}>", "exec"), namespace)
+    declarative_classes = {}
+    for class_name, class_source in class_sources(source).items():
+        value = namespace.get(class_name)
+        if getattr(value, "__table__", None) is None or value.__module__ != module_name:
+            continue
+        setattr(value, CODEGEN_SOURCE_ATTRIBUTE, class_source)
+        declarative_classes[class_name] = value
+    return declarative_classes
+
+
+def _db_model_list(request: GenerationRequest) -> List[DbModel]:
+    try:
+        declarative_classes = load_declarative_classes(request.source)
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"the source can not be executed: {e!r}")
+    db_model_list = []
+    for spec in request.db_models:
+        db_model = declarative_classes.get(spec.class_name)
+        if db_model is None:
+            raise HTTPException(status_code=422,
+                                detail=f"{spec.class_name} is not a declarative class of the source")
+        table_name = db_model.__tablename__
+        try:
+            db_model_list.append(DbModel(db_model=db_model,
+                                         prefix=spec.prefix if spec.prefix is not None else f"/{table_name}",
+                                         tags=spec.tags if spec.tags is not None else [table_name],
+                                         exclude_columns=spec.exclude_columns,
+                                         crud_methods=spec.crud_methods,
+                                         count_strategy=spec.count_strategy,
+                                         pagination=spec.pagination,
+                                         projection=spec.projection,
+                                         fast_response=spec.fast_response))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f"{spec.class_name}: {e}")
+    return db_model_list
+
+
+def generate_archive(request: GenerationRequest) -> bytes:
+    """
+    Generate the project of the request in memory
+
+    :return: the zip archive of the project, the files are under the fastapi_quick_crud_template folder
+    """
+    db_model_list = _db_model_list(request)
+    try:
+        with progress_handler(logger.debug):
+            project = crud_router_code_builder(db_model_list=db_model_list,
+                                               is_async=request.is_async,
+                                               database_url=request.database_url,
+                                               static_openapi=request.static_openapi,
+                                               startup_probe=request.startup_probe,
+                                               startup_budget=request.startup_budget,
+                                               explicit_imports=request.explicit_imports,
+                                               shared_models=request.shared_models,
+                                               index_report=request.index_report,
+                                               index_ddl=request.index_ddl,
+                                               layout=request.layout)
+    except (CRUDBuilderException, RuntimeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"{type(e).__name__}: {e}")
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for path, code in sorted(project.items()):
+            zip_file.writestr(f"{GENERATION_FOLDER}/{path}", code)
+    return archive.getvalue()
+
+
+def warm_up() -> None:
+    """
+    Compile every template before the first request
+    """
+    get_template_registry().preload()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="FastAPI CRUD code generator")
+    app.add_event_handler("startup", warm_up)
+
+    # a sync endpoint, so the requests are generated concurrently on the thread pool
+    @app.post("/generate", response_class=Response,
+              responses={200: {"content": {"application/zip": {}}, "description": "the generated project"}})
+    def generate(request: GenerationRequest) -> Response:
+        return Response(content=generate_archive(request), media_type="application/zip",
+                        headers={"Content-Disposition": f'attachment; filename="{GENERATION_FOLDER}.zip"'})
+
+    return app
+
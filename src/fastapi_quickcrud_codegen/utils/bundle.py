@@ -0,0 +1,56 @@
+import ast
+from typing import Dict, List
+
+from .import_builder import ImportBuilder
+from .model_source import statement_sources
+from ..misc.constant import MODEL, MODELS_BUNDLE, ROUTE, ROUTES_BUNDLE
+
+# the constants of a model module, they describe one table so they are not kept in the bundle
+MODEL_MODULE_CONSTANTS = {"PRIMARY_KEY_NAME", "UNIQUE_LIST"}
+
+
+def _split_module(code: str, import_helper: ImportBuilder, module_map: Dict[str, str]) -> str:
+    """
+    Add the imports of the generated module to import_helper and return the rest of the module
+
+    :param module_map: {module: module it is imported from in the bundle}
+    """
+    body = []
+    for statement, statement_source in statement_sources(code):
+        if isinstance(statement, ast.ImportFrom):
+            import_helper.add(import_={i.name for i in statement.names},
+                              from_=module_map.get(statement.module, statement.module))
+        elif isinstance(statement, ast.Import):
+            import_helper.add(import_={i.name for i in statement.names})
+        elif isinstance(statement, ast.Assign) and \
+                {getattr(i, "id", None) for i in statement.targets} <= MODEL_MODULE_CONSTANTS:
+            continue
+        else:
+            body.append(statement_source)
+    return "".join(body).strip("\n")
+
+
+def bundle_modules(artifacts: Dict[str, str], model_list: List[dict]) -> Dict[str, str]:
+    """
+    Merge the model and the route module of every table into models.py and routes.py, each with one import header
+
+    The router of every table is bound to {model_name}_router in routes.py, the names of the models are prefixed by
+    their class name so they do not collide
+
+    :param artifacts: the generated model and route modules, {path relative to the project root: code}
+    :param model_list: the model info ({"model_name", "file_name"}) of every table, in the order of the bundle
+    """
+    model_import_helper = ImportBuilder()
+    route_import_helper = ImportBuilder()
+    model_bodies = []
+    route_bodies = []
+    module_map = {f"{MODEL}.{i['model_name']}": MODELS_BUNDLE[:-len(".py")] for i in model_list}
+    for model in model_list:
+        model_name = model["model_name"]
+        model_bodies.append(_split_module(artifacts[f"{MODEL}/{model_name}.py"], model_import_helper, module_map))
+        route_body = _split_module(artifacts[f"{ROUTE}/{model_name}.py"], route_import_helper, module_map)
+        route_bodies.append(f"{route_body}\n\n\n{model_name}_router = api")
+    return {
+        MODELS_BUNDLE: model_import_helper.to_code() + "\n\n" + "\n\n\n".join(model_bodies) + "\n",
+        ROUTES_BUNDLE: route_import_helper.to_code() + "\n\n" + "\n\n\n".join(route_bodies) + "\n",
+    }
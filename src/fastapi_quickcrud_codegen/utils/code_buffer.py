@@ -0,0 +1,25 @@
+from typing import Iterator, List, Optional
+
+from jinja2 import Template
+
+
+class CodeBuffer:
+    """
+    Generated code kept as a list of chunks, the templates are rendered chunk by chunk through Template.generate()
+    and the chunks are only joined (or written out one by one) at the end, instead of growing one string
+    """
+
+    def __init__(self, code: str = ""):
+        self._chunks: List[str] = [code] if code else []
+
+    def write(self, code: str) -> None:
+        self._chunks.append(code)
+
+    def render(self, template: Template, context: Optional[dict] = None) -> None:
+        self._chunks.extend(template.generate(context or {}))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._chunks)
+
+    def __str__(self) -> str:
+        return "".join(self._chunks)
@@ -0,0 +1,185 @@
+import threading
+import uuid
+from typing import Any, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import JSON, Column, LargeBinary, Text, UniqueConstraint
+from sqlalchemy.orm import decl_api
+
+UNSUPPORTED_DATA_TYPES = ["BLOB"]
+PARTIAL_SUPPORTED_DATA_TYPES = ["INTERVAL", "JSON", "JSONB"]
+# the columns of these types are not selected by the list apis with projection unless they are asked for
+DEFERRED_DATA_TYPES = (Text, JSON, LargeBinary)
+
+
+class ColumnCategory:
+    """
+    Decide which query parameters are generated for the column
+    """
+    STR = "str"
+    UUID = "uuid"
+    NUMBER = "number"
+    DATETIME = "datetime"
+    TIMEDELTA = "timedelta"
+    BOOL = "bool"
+    JSON = "json"
+    ARRAY = "array"
+
+
+_PYTHON_TYPE_CATEGORY = {
+    'str': ColumnCategory.STR,
+    'UUID': ColumnCategory.UUID,
+    'int': ColumnCategory.NUMBER,
+    'float': ColumnCategory.NUMBER,
+    'Decimal': ColumnCategory.NUMBER,
+    'date': ColumnCategory.DATETIME,
+    'time': ColumnCategory.DATETIME,
+    'datetime': ColumnCategory.DATETIME,
+    'timedelta': ColumnCategory.TIMEDELTA,
+    'bool': ColumnCategory.BOOL,
+    'dict': ColumnCategory.JSON,
+    'list': ColumnCategory.ARRAY,
+}
+
+
+class ColumnSchema:
+    """
+    Immutable description of a column, everything the CRUD method builders need to know about it
+
+    name: the attribute name of the column
+    column_name: the name of the column in the database
+    sql_type_name: str of the sqlalchemy type, e.g. VARCHAR
+    field_type: the python type in the generated code, e.g. str, uuid.UUID, List[int]
+    category: ColumnCategory of the column, None if the type is not supported
+    default: the default value in the generated code
+    description: the quoted comment of the column or None
+    foreign_keys: the target full names of the foreign keys
+    is_primary: the column is the primary key
+    is_unique: the column is unique or part of a unique constraint
+    is_partial_supported: the column can not be used as a query parameter
+    unsupported_reason: why the type of the column is not supported, None if it is supported
+    """
+    __slots__ = ('name', 'column_name', 'sql_type_name', 'field_type', 'category', 'default', 'description',
+                 'foreign_keys', 'is_primary', 'is_unique', 'is_partial_supported', 'unsupported_reason')
+
+    def __init__(self, *, name: str, column_name: str, sql_type_name: str, field_type: Optional[str],
+                 category: Optional[str], default: Any, description: Optional[str], foreign_keys: Tuple[str, ...],
+                 is_primary: bool, is_unique: bool, is_partial_supported: bool, unsupported_reason: Optional[str]):
+        for attribute, value in (('name', name), ('column_name', column_name), ('sql_type_name', sql_type_name),
+                                 ('field_type', field_type), ('category', category), ('default', default),
+                                 ('description', description), ('foreign_keys', foreign_keys),
+                                 ('is_primary', is_primary), ('is_unique', is_unique),
+                                 ('is_partial_supported', is_partial_supported),
+                                 ('unsupported_reason', unsupported_reason)):
+            object.__setattr__(self, attribute, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, item):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(name={self.name!r}, field_type={self.field_type!r}, " \
+               f"category={self.category!r})"
+
+
+def extra_default_value(column: Column) -> Any:
+    if not column.nullable:
+        if column.default is not None:
+            default = column.default.arg
+        elif column.server_default is not None:
+            default = "None"
+        elif column.primary_key and column.autoincrement is True:
+            default = "None"
+        else:
+            default = "..."
+    else:
+        if column.default is not None:
+            default = column.default.arg
+        else:
+            default = "None"
+    return default
+
+
+def get_field_description(column: Column) -> Optional[str]:
+    if not hasattr(column, 'comment') or not column.comment:
+        return None
+    return f'"{column.comment}"'
+
+
+def _build_column_schema(column: Column, unique_column_names: set) -> ColumnSchema:
+    name = str(column.key)
+    sql_type_name = str(column.type)
+    field_type = None
+    category = None
+    unsupported_reason = None
+    is_partial_supported = False
+    not_supported_message = f'The type of column {name} ({sql_type_name}) not supported yet'
+    try:
+        if sql_type_name == "UUID":
+            python_type = uuid.UUID
+        else:
+            python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+        unsupported_reason = not_supported_message
+
+    if python_type is not None:
+        is_partial_supported = sql_type_name in PARTIAL_SUPPORTED_DATA_TYPES
+        category = _PYTHON_TYPE_CATEGORY.get(python_type.__name__)
+        if sql_type_name in UNSUPPORTED_DATA_TYPES or category is None:
+            category = None
+            unsupported_reason = not_supported_message
+        elif category == ColumnCategory.UUID:
+            field_type = "uuid.UUID"
+        elif sql_type_name == "JSONB":
+            field_type = f'Union[{python_type.__name__}, list]'
+        else:
+            field_type = python_type.__name__
+
+        if category == ColumnCategory.ARRAY:
+            base_column_detail, = column.base_columns
+            if hasattr(base_column_detail.type, 'item_type'):
+                try:
+                    field_type = f"List[{base_column_detail.type.item_type.python_type.__name__}]"
+                except NotImplementedError:
+                    category = None
+                    field_type = None
+                    unsupported_reason = not_supported_message
+
+    return ColumnSchema(name=name,
+                        column_name=column.name,
+                        sql_type_name=sql_type_name,
+                        field_type=field_type,
+                        category=category,
+                        default=extra_default_value(column),
+                        description=get_field_description(column),
+                        foreign_keys=tuple(i.target_fullname for i in column.foreign_keys),
+                        is_primary=bool(column.primary_key),
+                        is_unique=bool(column.unique) or name in unique_column_names,
+                        is_partial_supported=is_partial_supported,
+                        unsupported_reason=unsupported_reason)
+
+
+_column_schema_cache: "WeakKeyDictionary[decl_api.DeclarativeMeta, Tuple[ColumnSchema, ...]]" = WeakKeyDictionary()
+_column_schema_cache_lock = threading.Lock()
+
+
+def get_column_schemas(db_model: decl_api.DeclarativeMeta) -> Tuple[ColumnSchema, ...]:
+    """
+    The ColumnSchema of every column of the model, computed once per model class
+
+    The unsupported columns are included, they are only an error if they are used by the generated api
+    """
+    with _column_schema_cache_lock:
+        column_schemas = _column_schema_cache.get(db_model)
+    if column_schemas is not None:
+        return column_schemas
+
+    table = db_model.__table__
+    unique_column_names = {str(column.key) for constraint in table.constraints
+                           if isinstance(constraint, UniqueConstraint) for column in constraint.columns}
+    column_schemas = tuple(_build_column_schema(column, unique_column_names) for column in table.c)
+    with _column_schema_cache_lock:
+        return _column_schema_cache.setdefault(db_model, column_schemas)
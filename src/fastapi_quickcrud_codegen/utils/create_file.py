@@ -1,11 +1,24 @@
 import os
+import threading
+from typing import Iterable
 
 
 def create_folder(path: str):
     if not os.path.exists(path):
-        os.makedirs(path)
+        os.makedirs(path, exist_ok=True)
 
 
-def create_file_and_add_code_into_there(path: str, code: str):
-    with open(path, 'a') as model_file:
-        model_file.write(code)
+def write_file_atomically(path: str, chunks: Iterable[str]):
+    """
+    Replace the file with the chunks in one step, a reader never sees a partially written file and
+    a re-run never appends to the file of the previous run
+    """
+    temporary_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(temporary_path, 'w') as temporary_file:
+            for chunk in chunks:
+                temporary_file.write(chunk)
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
@@ -0,0 +1,31 @@
+from typing import Tuple
+
+from sqlalchemy.engine import make_url
+
+from ..misc.type import SqlType
+
+# backend name of the URL (the part before "+driver") -> SqlType
+DIALECT_SQL_TYPE = {
+    "postgresql": SqlType.postgresql,
+    "mysql": SqlType.mysql,
+    "mariadb": SqlType.mariadb,
+    "sqlite": SqlType.sqlite,
+    "oracle": SqlType.oracle,
+    "mssql": SqlType.mssql,
+}
+
+
+def resolve_database_url(database_url: str) -> Tuple[SqlType, bool]:
+    """
+    Get the database type and whether it is an in-memory database from the URL only, the DBAPI driver is never
+    imported so the driver does not need to be installed on the machine running the generation
+
+    :return: (sql type, is in-memory db)
+    """
+    url = make_url(database_url)
+    backend_name = url.get_backend_name()
+    if backend_name not in DIALECT_SQL_TYPE:
+        raise ValueError(f"database type {backend_name} is not supported, "
+                         f"supported types: {', '.join(DIALECT_SQL_TYPE)}")
+    is_in_memory_db = not url.host and not url.port
+    return DIALECT_SQL_TYPE[backend_name], is_in_memory_db
@@ -1,4 +1,38 @@
-from typing import Union
+import ast
+import importlib
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Set, Union
+
+
+def referenced_names(code: str) -> Set[str]:
+    """
+    The global names the code may look up, i.e. every loaded name which is not defined at the module level
+
+    A name bound in a class or function body is still counted, at worst it is imported without being needed
+    """
+    tree = ast.parse(code)
+    defined_names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            defined_names.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                defined_names |= {i.id for i in ast.walk(target) if isinstance(i, ast.Name)}
+    return {node.id for node in ast.walk(tree)
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)} - defined_names
+
+
+@lru_cache(maxsize=None)
+def star_import_names(module_name: str) -> FrozenSet[str]:
+    """
+    The names bound by "from module_name import *"
+    """
+    module = importlib.import_module(module_name)
+    names = getattr(module, "__all__", None)
+    if names is None:
+        names = [i for i in dir(module) if not i.startswith("_")]
+    return frozenset(names)
 
 
 class ImportBuilder:
@@ -14,9 +48,37 @@ class ImportBuilder:
         else:
             self.import_list[from_] = import_
 
-    def to_code(self):
+    def _bound_names(self, used_names: Set[str]) -> Dict[Optional[str], Set[str]]:
+        """
+        {from path: the used names it binds}, a name is bound by the last import which provides it, like
+        the imports executed in order; the star imports are resolved to the names they actually provide
+        """
+        bound_names: Dict[Optional[str], Set[str]] = {i: set() for i in self.import_list}
+        for name in used_names:
+            for from_path, import_name in reversed(list(self.import_list.items())):
+                if not from_path:
+                    # "import a.b" binds a
+                    modules = {i for i in import_name if i.split(".")[0] == name}
+                    if modules:
+                        bound_names[from_path] |= modules
+                        break
+                    continue
+                provided = star_import_names(from_path) | import_name if "*" in import_name else import_name
+                if name in provided:
+                    bound_names[from_path].add(name)
+                    break
+        return bound_names
+
+    def to_code(self, used_names: Optional[Set[str]] = None):
+        """
+        :param used_names: only import these names, e.g. referenced_names() of the module, every star import is
+                           replaced by the names it provides. Everything is imported if it is not set
+        """
+        import_list = self.import_list if used_names is None else self._bound_names(used_names)
         code = ""
-        for from_path , import_name in self.import_list.items():
+        for from_path , import_name in import_list.items():
+            if not import_name:
+                continue
             sorted_list = list(import_name)
             sorted_list.sort()
             if not from_path:
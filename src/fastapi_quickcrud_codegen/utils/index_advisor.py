@@ -0,0 +1,141 @@
+import importlib
+from typing import Dict, List, NamedTuple, Sequence, Set, Tuple
+
+from sqlalchemy import Index, MetaData, PrimaryKeyConstraint, UniqueConstraint
+from sqlalchemy.schema import CreateIndex
+
+from .column_schema import ColumnCategory, get_column_schemas
+from ..misc.type import CrudMethods, SqlType
+
+# the crud methods whose generated api filters or sorts by the columns
+FILTER_CRUD_METHODS = {CrudMethods.FIND_ONE, CrudMethods.FIND_MANY, CrudMethods.UPDATE_ONE, CrudMethods.UPDATE_MANY,
+                       CrudMethods.PATCH_ONE, CrudMethods.PATCH_MANY, CrudMethods.DELETE_ONE,
+                       CrudMethods.DELETE_MANY, CrudMethods.EXPORT}
+SORT_CRUD_METHODS = {CrudMethods.FIND_MANY, CrudMethods.EXPORT}
+
+# the query parameters _get_fizzy_query_param generates for a column of the category, boolean columns are too
+# unselective to be worth an index
+_CATEGORY_FILTERS = {
+    ColumnCategory.STR: ("pattern", "list"),
+    ColumnCategory.UUID: ("list",),
+    ColumnCategory.NUMBER: ("range", "list"),
+    ColumnCategory.DATETIME: ("range", "list"),
+}
+_TRIGRAM_INDEX_METHODS = ("gin", "gist")
+
+
+class IndexAdvice(NamedTuple):
+    """
+    table: the table key, schema.table if it is in a schema
+    column: the column name in the database
+    usages: how the generated api uses the column: range, list, pattern (LIKE / ILIKE / regex) and sort
+    index_type: btree, or trigram for the pattern filters on PostgreSQL
+    ddl: the CREATE INDEX statement of the index
+    """
+    table: str
+    column: str
+    usages: Tuple[str, ...]
+    index_type: str
+    ddl: str
+
+
+def _dialect(sql_type: str):
+    return importlib.import_module(f"sqlalchemy.dialects.{sql_type}").dialect()
+
+
+def _leading_columns(table) -> Tuple[Set[str], Set[str]]:
+    """
+    :return: the column names which lead a btree index (an index, the primary key or a unique constraint) and the
+             column names with a gin / gist index of PostgreSQL
+    """
+    btree_columns = set()
+    trigram_columns = set()
+    for constraint in table.constraints:
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)) and constraint.columns:
+            btree_columns.add(list(constraint.columns)[0].name)
+    for index in table.indexes:
+        if not index.expressions or not hasattr(index.expressions[0], "name"):
+            continue
+        column_name = index.expressions[0].name
+        if index.dialect_options["postgresql"]["using"] in _TRIGRAM_INDEX_METHODS:
+            trigram_columns |= {i.name for i in index.columns}
+        else:
+            btree_columns.add(column_name)
+    return btree_columns, trigram_columns
+
+
+def _index_name(table_name: str, column_name: str, suffix: str = "") -> str:
+    return f"ix_{table_name}_{column_name}{suffix}"
+
+
+def advise_indexes(db_model_list: Sequence, sql_type: str) -> List[IndexAdvice]:
+    """
+    Compare the columns the generated api filters and sorts by with the indexes and the constraints of the tables
+
+    A column is supported if it leads an index, the primary key or a unique constraint. The pattern filters of a
+    string column on PostgreSQL need a trigram (gin_trgm_ops) index, a btree index only serves them without a
+    leading wildcard. The DDL is rendered from a copy of the table, the metadata of the models is not changed
+
+    :param db_model_list: the DbModel list of the generation
+    :param sql_type: the SqlType of the generated project
+    """
+    dialect = _dialect(sql_type)
+    advice_list = []
+    for db_model_info in db_model_list:
+        crud_methods = set(db_model_info.crud_methods)
+        filtered = bool(crud_methods & FILTER_CRUD_METHODS)
+        sorted_ = bool(crud_methods & SORT_CRUD_METHODS)
+        if not filtered and not sorted_:
+            continue
+        table = db_model_info.db_model.__table__
+        btree_columns, trigram_columns = _leading_columns(table)
+        table_copy = table.to_metadata(MetaData())
+        for column_schema in get_column_schemas(db_model_info.db_model):
+            if column_schema.name in db_model_info.exclude_columns or column_schema.unsupported_reason or \
+                    column_schema.is_partial_supported or column_schema.category == ColumnCategory.BOOL:
+                continue
+            usages = list(_CATEGORY_FILTERS.get(column_schema.category, ())) if filtered else []
+            if sorted_:
+                usages.append("sort")
+            column_name = column_schema.column_name
+            column = table_copy.c[column_name]
+            trigram = sql_type == SqlType.postgresql and "pattern" in usages
+            btree_usages = tuple(i for i in usages if not trigram or i != "pattern")
+            if btree_usages and column_name not in btree_columns:
+                index = Index(_index_name(table.name, column_name), column)
+                advice_list.append(IndexAdvice(table=table.key, column=column_name, usages=btree_usages,
+                                               index_type="btree",
+                                               ddl=str(CreateIndex(index).compile(dialect=dialect)).strip()))
+            if trigram and column_name not in trigram_columns:
+                index = Index(_index_name(table.name, column_name, "_trgm"), column, postgresql_using="gin",
+                              postgresql_ops={column_name: "gin_trgm_ops"})
+                advice_list.append(IndexAdvice(table=table.key, column=column_name, usages=("pattern",),
+                                               index_type="trigram",
+                                               ddl=str(CreateIndex(index).compile(dialect=dialect)).strip()))
+    return advice_list
+
+
+def render_index_report(advice_list: List[IndexAdvice]) -> str:
+    """
+    The filterable or sortable columns without index support, table by table
+    """
+    if not advice_list:
+        return "Every filterable and sortable column is supported by an index\n"
+    by_table: Dict[str, List[IndexAdvice]] = {}
+    for advice in advice_list:
+        by_table.setdefault(advice.table, []).append(advice)
+    lines = [f"{len(advice_list)} filterable or sortable columns without index support", ""]
+    for table_key, table_advice_list in by_table.items():
+        lines.append(table_key)
+        for advice in table_advice_list:
+            lines.append(f"    {advice.column:<32}{advice.index_type:<10}{', '.join(advice.usages)}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def render_index_ddl(advice_list: List[IndexAdvice]) -> str:
+    statements = []
+    if any(i.index_type == "trigram" for i in advice_list):
+        statements.append("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    statements += [i.ddl for i in advice_list]
+    return "".join(f"{i};\n" for i in statements)
@@ -0,0 +1,79 @@
+import cProfile
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from ..misc.type import GenerationPhase
+
+logger = logging.getLogger("fastapi_quickcrud_codegen")
+
+
+class PhaseEvent(NamedTuple):
+    """
+    phase: the GenerationPhase
+    target: the table name for the model and route phases, the file name for the common module phase
+    seconds: wall time of the phase
+    """
+    phase: GenerationPhase
+    target: Optional[str]
+    seconds: float
+
+
+class GenerationInstrumentation:
+    """
+    Time the phases of a generation run
+
+    Every PhaseEvent is kept in events, logged on the fastapi_quickcrud_codegen logger at DEBUG level and passed
+    to on_event
+    """
+
+    def __init__(self, on_event: Optional[Callable[[PhaseEvent], None]] = None):
+        self.on_event = on_event
+        self.events: List[PhaseEvent] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, phase: GenerationPhase, target: Optional[str] = None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.emit(PhaseEvent(phase, target, time.perf_counter() - start))
+
+    def emit(self, event: PhaseEvent) -> None:
+        with self._lock:
+            self.events.append(event)
+        logger.debug("%s %s %.6fs", event.phase, event.target or "", event.seconds)
+        if self.on_event:
+            self.on_event(event)
+
+    def summary(self) -> Dict[str, float]:
+        """
+        :return: {phase: total seconds}
+        """
+        total: Dict[str, float] = {}
+        for event in self.events:
+            total[event.phase] = total.get(event.phase, 0) + event.seconds
+        return total
+
+
+@contextmanager
+def profiled(profile: Optional[str]) -> Iterator[None]:
+    """
+    Run the block under cProfile and dump the pstats into the profile path, do nothing if it is not set
+
+    Only the calling thread is profiled, the workers of a pool are not
+    """
+    if not profile:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile)
+        logger.info("profile of the generation is written into %s", profile)
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.sql import ClauseElement
+
+from ..misc.constant import MODEL, ROUTE
+from ..misc.get_table_name import get_table_name
+from .model_source import get_model_source
+
+MANIFEST_FILE_NAME = ".codegen_manifest.json"
+# bump it whenever the format of the manifest changes
+MANIFEST_VERSION = 2
+GENERATOR_ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _stable_repr(value: Any) -> str:
+    """
+    repr of a column attribute that does not change between two runs (no memory address)
+    """
+    if value is None:
+        return "None"
+    if callable(value):
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', type(value).__name__)}"
+    if isinstance(value, ClauseElement):
+        return str(getattr(value, 'text', value))
+    return repr(value)
+
+
+def _column_metadata(db_model) -> List[dict]:
+    columns = []
+    for column in db_model.__table__.c:
+        columns.append({
+            "key": str(column.key),
+            "name": column.name,
+            "type": repr(column.type),
+            "nullable": column.nullable,
+            "primary_key": column.primary_key,
+            "autoincrement": _stable_repr(column.autoincrement),
+            "default": _stable_repr(column.default.arg if column.default is not None else None),
+            "server_default": _stable_repr(column.server_default.arg if column.server_default is not None else None),
+            "unique": column.unique,
+            "index": column.index,
+            "comment": column.comment,
+            "foreign_keys": sorted(i.target_fullname for i in column.foreign_keys),
+        })
+    return columns
+
+
+def _unique_constraints(db_model) -> List[List[str]]:
+    return [[str(column.key) for column in constraint.columns]
+            for constraint in db_model.__table__.constraints if isinstance(constraint, UniqueConstraint)]
+
+
+def compute_digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def generator_digest() -> str:
+    """
+    Digest of the python sources of the generator, the files generated by another version of the generator are
+    not up to date. The compiled templates are left out, the templates have a digest of their own
+    """
+    digest = hashlib.sha256()
+    for directory, directory_names, file_names in sorted(os.walk(GENERATOR_ROOT_DIRECTORY)):
+        directory_names[:] = [i for i in directory_names if i not in ("__pycache__", "template_compiled")]
+        for file_name in sorted(i for i in file_names if i.endswith(".py")):
+            path = os.path.join(directory, file_name)
+            digest.update(os.path.relpath(path, GENERATOR_ROOT_DIRECTORY).encode())
+            with open(path, "rb") as source_file:
+                digest.update(source_file.read())
+    return digest.hexdigest()
+
+
+def db_model_digest(db_model_info, *, is_async: bool, sql_type: str, template_digest: str,
+                    explicit_imports: bool = False, shared_models: bool = False) -> str:
+    db_model = db_model_info.db_model
+    return compute_digest({
+        "source": get_model_source(db_model),
+        "columns": _column_metadata(db_model),
+        "unique_constraints": _unique_constraints(db_model),
+        "prefix": db_model_info.prefix,
+        "tags": db_model_info.tags,
+        "exclude_columns": db_model_info.exclude_columns,
+        "crud_methods": [i.value for i in db_model_info.crud_methods],
+        "is_async": is_async,
+        "sql_type": str(sql_type),
+        "template": template_digest,
+        "generator": generator_digest(),
+        "explicit_imports": explicit_imports,
+        "shared_models": shared_models,
+        "count_strategy": str(db_model_info.count_strategy),
+        "pagination": str(db_model_info.pagination),
+        "projection": db_model_info.projection,
+        "fast_response": db_model_info.fast_response,
+    })
+
+
+def db_model_output_files(model_name: str) -> List[str]:
+    return [os.path.join(MODEL, f"{model_name}.py"), os.path.join(ROUTE, f"{model_name}.py")]
+
+
+def db_model_manifest_key(db_model_info) -> str:
+    return f"model:{get_table_name(db_model_info.db_model)}"
+
+
+class GenerationManifest:
+    """
+    Record of the inputs of every generated file, it allows a re-run to skip the files whose inputs did not change
+
+    entries: {key: {"digest": hash of the inputs, "files": [path relative to the project root]}}
+    """
+
+    def __init__(self, root_directory: str):
+        self.root_directory = root_directory
+        self.path = os.path.join(root_directory, MANIFEST_FILE_NAME)
+        self.entries: Dict[str, dict] = {}
+        self._seen_keys = set()
+        if os.path.isfile(self.path):
+            with open(self.path) as manifest_file:
+                try:
+                    manifest = json.load(manifest_file)
+                except ValueError:
+                    manifest = {}
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.entries = manifest.get("entries", {})
+
+    def is_up_to_date(self, key: str, digest: str) -> bool:
+        self._seen_keys.add(key)
+        entry: Optional[dict] = self.entries.get(key)
+        if not entry or entry["digest"] != digest:
+            return False
+        return all(os.path.isfile(os.path.join(self.root_directory, i)) for i in entry["files"])
+
+    def discard(self, key: str) -> None:
+        """
+        Remove the entry and its generated files
+        """
+        entry = self.entries.pop(key, None)
+        if not entry:
+            return
+        for stale_file in entry["files"]:
+            path = os.path.join(self.root_directory, stale_file)
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def record(self, key: str, digest: str, files: List[str]) -> None:
+        self._seen_keys.add(key)
+        self.entries[key] = {"digest": digest, "files": files}
+
+    def prune(self) -> None:
+        """
+        Remove the files of the entries which were not generated in this run, e.g. a model removed from the list
+        """
+        for key in [i for i in self.entries if i not in self._seen_keys]:
+            self.discard(key)
+
+    @staticmethod
+    def remove(root_directory: str) -> None:
+        """
+        Remove the manifest of the project, its entries are outdated once the files are generated by a full run
+        """
+        path = os.path.join(root_directory, MANIFEST_FILE_NAME)
+        if os.path.isfile(path):
+            os.remove(path)
+
+    def save(self) -> None:
+        content = json.dumps({"version": MANIFEST_VERSION, "entries": self.entries}, indent=2, sort_keys=True)
+        if os.path.isfile(self.path):
+            with open(self.path) as manifest_file:
+                if manifest_file.read() == content:
+                    return
+        os.makedirs(self.root_directory, exist_ok=True)
+        with open(self.path, 'w') as manifest_file:
+            manifest_file.write(content)
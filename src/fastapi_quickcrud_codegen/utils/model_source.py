@@ -0,0 +1,46 @@
+import ast
+import inspect
+from typing import Dict, List, Tuple
+
+CODEGEN_SOURCE_ATTRIBUTE = "__codegen_source__"
+
+
+def get_model_source(db_model) -> str:
+    """
+    Source code of the declarative class, the classes built at runtime (e.g. reflected from a database) carry
+    their rendered source in __codegen_source__ since inspect can not find it
+    """
+    source = vars(db_model).get(CODEGEN_SOURCE_ATTRIBUTE)
+    if source is not None:
+        return source
+    return inspect.getsource(db_model)
+
+
+def statement_sources(source: str) -> List[Tuple[ast.stmt, str]]:
+    """
+    The top level statements of the module source with their source code, decorators included; ast of python 3.7
+    has no end line number, so a statement ends where the next one starts and keeps the blank lines after it
+    """
+    lines = source.splitlines(keepends=True)
+    statements = ast.parse(source).body
+    start_lines = [min([i.lineno for i in getattr(statement, "decorator_list", [])] + [statement.lineno])
+                   for statement in statements] + [len(lines) + 1]
+    return [(statement, "".join(lines[start_lines[index] - 1:start_lines[index + 1] - 1]))
+            for index, statement in enumerate(statements)]
+
+
+def class_sources(source: str) -> Dict[str, str]:
+    """
+    Source code of every class defined at the top level of the module source, for the classes executed from a
+    string, whose source inspect can not find
+
+    :return: {class name: source of the class, decorators included}
+    """
+    sources = {}
+    for statement, statement_source in statement_sources(source):
+        if isinstance(statement, ast.ClassDef):
+            class_lines = statement_source.splitlines(keepends=True)
+            while class_lines and (not class_lines[-1].strip() or class_lines[-1].lstrip().startswith("#")):
+                class_lines.pop()
+            sources[statement.name] = "".join(class_lines).rstrip() + "\n"
+    return sources
@@ -0,0 +1,30 @@
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+_progress_handler: "contextvars.ContextVar[Optional[Callable[[str], None]]]" = \
+    contextvars.ContextVar("fastapi_quickcrud_codegen_progress_handler", default=None)
+
+
+def progress(message: str) -> None:
+    """
+    Report the progress of the generation, it is printed unless a handler is set in the current context
+    """
+    handler = _progress_handler.get()
+    if handler is None:
+        print(message)
+    else:
+        handler(message)
+
+
+@contextmanager
+def progress_handler(handler: Callable[[str], None]) -> Iterator[None]:
+    """
+    Send the progress messages of the generations run in this context (thread or task) to the handler, so that
+    concurrent generations do not interleave on stdout
+    """
+    token = _progress_handler.set(handler)
+    try:
+        yield
+    finally:
+        _progress_handler.reset(token)
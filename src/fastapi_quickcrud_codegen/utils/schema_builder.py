@@ -1,6 +1,5 @@
 import uuid
 import warnings
-from copy import deepcopy
 from typing import (Optional,
                     Any)
 from typing import (Type,
@@ -15,6 +14,7 @@ from pydantic import (BaseModel)
 from sqlalchemy import UniqueConstraint, Table, Column
 from sqlalchemy.orm import decl_api
 
+from ..generator.output_sink import OutputSink
 from ..misc.exceptions import (SchemaException,
                                ColumnTypeNotSupportedException)
 from ..misc.get_table_name import get_table_name
@@ -23,6 +23,13 @@ from ..misc.type import (Ordering,
                          ExtraFieldType,
                          SqlType, )
 from ..model.model_builder import ModelCodeGen
+from .column_schema import (ColumnSchema,
+                            ColumnCategory,
+                            UNSUPPORTED_DATA_TYPES,
+                            PARTIAL_SUPPORTED_DATA_TYPES,
+                            extra_default_value,
+                            get_field_description,
+                            get_column_schemas)
 
 FOREIGN_PATH_PARAM_KEYWORD = "__pk__"
 BaseModelT = TypeVar('BaseModelT', bound=BaseModel)
@@ -35,10 +42,11 @@ TableInstance = NewType('TableInstance', Table)
 
 
 class ApiParameterSchemaBuilder:
-    unsupported_data_types = ["BLOB"]
-    partial_supported_data_types = ["INTERVAL", "JSON", "JSONB"]
+    unsupported_data_types = UNSUPPORTED_DATA_TYPES
+    partial_supported_data_types = PARTIAL_SUPPORTED_DATA_TYPES
 
-    def __init__(self, db_model: decl_api.DeclarativeMeta, sql_type, exclude_column=[], constraints=None):
+    def __init__(self, db_model: decl_api.DeclarativeMeta, sql_type, sink: OutputSink, exclude_column=[],
+                 constraints=None, explicit_imports: bool = False, shared_models: bool = False):
         self.class_name = db_model.__name__
         self.root_table_name = get_table_name(db_model)
         self.constraints = constraints
@@ -49,23 +57,22 @@ class ApiParameterSchemaBuilder:
         self.db_name: str = db_model.__tablename__
         self.__columns = db_model.__table__.c
 
-        self.code_gen = ModelCodeGen(self.root_table_name, sql_type)
+        self.code_gen = ModelCodeGen(self.root_table_name, sql_type, sink, explicit_imports=explicit_imports,
+                                     shared_models=shared_models)
         self.code_gen.gen_model(db_model)
 
-        self.uuid_type_columns = []
-        self.str_type_columns = []
-        self.number_type_columns = []
-        self.datetime_type_columns = []
-        self.timedelta_type_columns = []
-        self.bool_type_columns = []
-        self.json_type_columns = []
-        self.array_type_columns = []
         self.foreign_table_response_model_sets: Dict[TableNameT, ResponseModelT] = {}
-        self.all_field: List[dict] = self._extract_all_field()
+        self.all_field: List[ColumnSchema] = self._extract_all_field()
+        self.uuid_type_columns: List[str] = [i.column_name for i in self.all_field
+                                             if i.category == ColumnCategory.UUID]
         self.primary_key_str = self._extract_primary()
         self.unique_fields: List[str] = self._extract_unique()
         self.code_gen.build_constant(constants=[("PRIMARY_KEY_NAME", self.primary_key_str),
                                                 ("UNIQUE_LIST", self.unique_fields)])
+        if shared_models:
+            self.code_gen.build_shared_response_model(class_name=self.class_name + "ResponseModel",
+                                                      fields=[(i.name, i.field_type, f"Body({i.default})")
+                                                              for i in self.all_field])
         self.sql_type = sql_type
 
     def _extract_primary(self) -> Union[tuple, Tuple[Union[str, Any],
@@ -149,93 +156,20 @@ class ApiParameterSchemaBuilder:
         else:
             return []
 
-    @staticmethod
-    def _get_field_description(column: Column) -> str:
-        if not hasattr(column, 'comment') or not column.comment:
-            return None
-        return f'"{column.comment}"'
-
-    def _extract_all_field(self, columns=None) -> List[dict]:
-        fields: List[dict] = []
-        if not columns:
-            columns = self.__columns
-        for column in columns:
-            column_name = str(column.key)
-            column_foreign = [i.target_fullname for i in column.foreign_keys]
-            default = self._extra_default_value(column)
-            if column_name in self._exclude_column:
+    _get_field_description = staticmethod(get_field_description)
+
+    def _extract_all_field(self) -> List[ColumnSchema]:
+        fields: List[ColumnSchema] = []
+        for column_schema in get_column_schemas(self.__db_model):
+            if column_schema.name in self._exclude_column:
                 continue
-            column_type = str(column.type)
-            description = self._get_field_description(column)
-            try:
-
-                if column_type == "UUID":
-                    python_type = uuid.UUID
-                else:
-                    python_type = column.type.python_type
-                if column_type in self.unsupported_data_types:
-                    raise ColumnTypeNotSupportedException(
-                        f'The type of column {column_name} ({column_type}) not supported yet')
-                if column_type in self.partial_supported_data_types:
-                    warnings.warn(
-                        f'The type of column {column_name} ({column_type}) '
-                        f'is not support data query (as a query parameters )')
-            except NotImplementedError:
-                if column_type == "UUID":
-                    python_type = uuid.UUID
-                else:
-                    raise ColumnTypeNotSupportedException(
-                        f'The type of column {column_name} ({column_type}) not supported yet')
-                # string filter
-            python_type_str = deepcopy(python_type.__name__)
-            if python_type_str in ['str']:
-                self.str_type_columns.append(column_name)
-            # uuid filter
-            elif python_type_str in ['UUID']:
-                self.uuid_type_columns.append(column.name)
-                python_type_str = "uuid.UUID"
-            # number filter
-            elif python_type_str in ['int', 'float', 'Decimal']:
-                self.number_type_columns.append(column_name)
-            # date filter
-            elif python_type_str in ['date', 'time', 'datetime']:
-                self.datetime_type_columns.append(column_name)
-            # timedelta filter
-            elif python_type_str in ['timedelta']:
-                self.timedelta_type_columns.append(column_name)
-            # bool filter
-            elif python_type_str in ['bool']:
-                self.bool_type_columns.append(column_name)
-            # json filter
-            elif python_type_str in ['dict']:
-                self.json_type_columns.append(column_name)
-            # array filter
-            elif python_type_str in ['list']:
-                self.array_type_columns.append(column_name)
-                base_column_detail, = column.base_columns
-                if hasattr(base_column_detail.type, 'item_type'):
-                    item_type = base_column_detail.type.item_type.python_type
-                    fields.append({'column_name': column_name,
-                                   'column_type': f"List[{item_type.__name__}]",
-                                   'column_default': default,
-                                   'column_description': description})
-                    continue
-            else:
-                raise ColumnTypeNotSupportedException(
-                    f'The type of column {column_name} ({column_type}) not supported yet')
-
-            if column_type == "JSONB":
-                fields.append({'column_name': column_name,
-                               'column_type': f'Union[{python_type_str}, list]',
-                               'column_default': default,
-                               'column_description': description,
-                               'column_foreign': column_foreign})
-            else:
-                fields.append({'column_name': column_name,
-                               'column_type': python_type_str,
-                               'column_default': default,
-                               'column_description': description,
-                               'column_foreign': column_foreign})
+            if column_schema.unsupported_reason:
+                raise ColumnTypeNotSupportedException(column_schema.unsupported_reason)
+            if column_schema.is_partial_supported:
+                warnings.warn(
+                    f'The type of column {column_schema.name} ({column_schema.sql_type_name}) '
+                    f'is not support data query (as a query parameters )')
+            fields.append(column_schema)
         return fields
 
     @staticmethod
@@ -250,43 +184,27 @@ class ApiParameterSchemaBuilder:
             <br/>&emsp;&emsp;{primary_name}    :    DESC
             <br/>&emsp;&emsp;{primary_name} (default sort by ASC)'''
 
-    @staticmethod
-    def _extra_default_value(column: Column) -> str:
-        if not column.nullable:
-            if column.default is not None:
-                default = column.default.arg
-            elif column.server_default is not None:
-                default = "None"
-            elif column.primary_key and column.autoincrement is True:
-                default = "None"
-            else:
-                default = "..."
-        else:
-            if column.default is not None:
-                default = column.default.arg
-            else:
-                default = "None"
-        return default
+    _extra_default_value = staticmethod(extra_default_value)
 
-    def _assign_str_matching_pattern(self, field_of_param: dict, result_: List[dict]) -> List[dict]:
+    def _assign_str_matching_pattern(self, field_of_param: ColumnSchema, result_: List[dict]) -> List[dict]:
         if self.sql_type == SqlType.postgresql:
             operator = "List[PGSQLMatchingPatternInString]"
         else:
             operator = "List[MatchingPatternInStringBase]"
 
         for i in [
-            {'column_name': field_of_param['column_name'] + ExtraFieldTypePrefix.Str + ExtraFieldType.Matching_pattern,
+            {'column_name': field_of_param.name + ExtraFieldTypePrefix.Str + ExtraFieldType.Matching_pattern,
              'column_type': f'Optional[{operator}]',
              'column_default': '[MatchingPatternInStringBase.case_sensitive]',
              'column_description': "None"},
-            {'column_name': field_of_param['column_name'] + ExtraFieldTypePrefix.Str,
-             'column_type': f'Optional[List[{field_of_param["column_type"]}]]',
+            {'column_name': field_of_param.name + ExtraFieldTypePrefix.Str,
+             'column_type': f'Optional[List[{field_of_param.field_type}]]',
              'column_default': "None",
-             'column_description': field_of_param['column_description']}
+             'column_description': field_of_param.description}
         ]:
             result_.append(i)
         for i in [
-            {'column_name': field_of_param['column_name'],
+            {'column_name': field_of_param.name,
              'column_type': f'Optional[str]',
              'column_default': 'None',
              'column_description': "None"}
@@ -298,15 +216,14 @@ class ApiParameterSchemaBuilder:
     def _assign_list_comparison(field_of_param, result_: List[dict]) -> List[dict]:
         for i in [
             {
-                'column_name': field_of_param[
-                                   'column_name'] + f'{ExtraFieldTypePrefix.List}{ExtraFieldType.Comparison_operator}',
+                'column_name': field_of_param.name + f'{ExtraFieldTypePrefix.List}{ExtraFieldType.Comparison_operator}',
                 'column_type': 'Optional[ItemComparisonOperators]',
                 'column_default': 'ItemComparisonOperators.In',
                 'column_description': "None"},
-            {'column_name': field_of_param['column_name'] + ExtraFieldTypePrefix.List,
-             'column_type': f'Optional[List[{field_of_param["column_type"]}]]',
+            {'column_name': field_of_param.name + ExtraFieldTypePrefix.List,
+             'column_type': f'Optional[List[{field_of_param.field_type}]]',
              'column_default': 'None',
-             'column_description': field_of_param['column_description']}
+             'column_description': field_of_param.description}
 
         ]:
             result_.append(i)
@@ -315,14 +232,12 @@ class ApiParameterSchemaBuilder:
     @staticmethod
     def _assign_range_comparison(field_of_param, result_: List[dict]) -> List[dict]:
         for i in [
-            {'column_name': field_of_param[
-                                'column_name'] + f'{ExtraFieldTypePrefix.From}{ExtraFieldType.Comparison_operator}',
+            {'column_name': field_of_param.name + f'{ExtraFieldTypePrefix.From}{ExtraFieldType.Comparison_operator}',
              'column_type': 'Optional[RangeFromComparisonOperators]',
              'column_default': 'RangeFromComparisonOperators.Greater_than_or_equal_to',
              'column_description': "None"},
 
-            {'column_name': field_of_param[
-                                'column_name'] + f'{ExtraFieldTypePrefix.To}{ExtraFieldType.Comparison_operator}',
+            {'column_name': field_of_param.name + f'{ExtraFieldTypePrefix.To}{ExtraFieldType.Comparison_operator}',
              'column_type': 'Optional[RangeToComparisonOperators]',
              'column_default': 'RangeToComparisonOperators.Less_than.Less_than_or_equal_to',
              'column_description': "None"},
@@ -330,61 +245,63 @@ class ApiParameterSchemaBuilder:
             result_.append(i)
 
         for i in [
-            {'column_name': field_of_param['column_name'] + ExtraFieldTypePrefix.From,
-             'column_type': f'Optional[NewType(ExtraFieldTypePrefix.From, {field_of_param["column_type"]})]',
+            {'column_name': field_of_param.name + ExtraFieldTypePrefix.From,
+             'column_type': f'Optional[NewType(ExtraFieldTypePrefix.From, {field_of_param.field_type})]',
              'column_default': "None",
-             'column_description': field_of_param['column_description']},
+             'column_description': field_of_param.description},
 
-            {'column_name': field_of_param['column_name'] + ExtraFieldTypePrefix.To,
-             'column_type': f'Optional[NewType(ExtraFieldTypePrefix.To, {field_of_param["column_type"]})]',
+            {'column_name': field_of_param.name + ExtraFieldTypePrefix.To,
+             'column_type': f'Optional[NewType(ExtraFieldTypePrefix.To, {field_of_param.field_type})]',
              'column_default': "None",
-             'column_description': field_of_param['column_description']}
+             'column_description': field_of_param.description}
         ]:
             result_.append(i)
         return result_
 
-    def _get_fizzy_query_param(self, exclude_column: List[str] = None, fields=None) -> List[dict]:
+    def _get_fizzy_query_param(self, exclude_column: List[str] = None,
+                               fields: List[ColumnSchema] = None) -> List[dict]:
         if not fields:
             fields = self.all_field
         if not exclude_column:
             exclude_column = []
-        fields_: List[dict] = deepcopy(fields)
         result = []
-        for field_ in fields_:
-            if field_['column_name'] in exclude_column:
+        for field_ in fields:
+            if field_.name in exclude_column:
                 continue
-            field_['column_default'] = None
-            if field_['column_name'] in self.str_type_columns or field_['column_name'] in self.uuid_type_columns:
+            if field_.category in (ColumnCategory.STR, ColumnCategory.UUID):
                 result = self._assign_str_matching_pattern(field_, result)
                 result = self._assign_list_comparison(field_, result)
 
-            elif field_['column_name'] in self.bool_type_columns:
+            elif field_.category == ColumnCategory.BOOL:
                 result = self._assign_list_comparison(field_, result)
 
-            elif field_['column_name'] in self.number_type_columns or \
-                    field_['column_name'] in self.datetime_type_columns:
+            elif field_.category in (ColumnCategory.NUMBER, ColumnCategory.DATETIME):
                 result = self._assign_range_comparison(field_, result)
                 result = self._assign_list_comparison(field_, result)
 
         return result
 
-    def _assign_pagination_param(self, result_: List[tuple]) -> List[Union[Tuple, Dict]]:
-        all_column_ = [i['column_name'] for i in self.all_field]
+    def _assign_pagination_param(self, result_: List[tuple], cursor: bool = False) -> List[Union[Tuple, Dict]]:
+        for i in [
+            ('limit', 'Optional[int]', "Query(None)"),
+            ('cursor', 'Optional[str]', 'Query(None, description="next_cursor of the previous page")') if cursor
+            else ('offset', 'Optional[int]', "Query(None)"),
+        ]:
+            result_.append(i)
+        return self._assign_order_by_param(result_)
+
+    def _assign_order_by_param(self, result_: List[tuple]) -> List[Union[Tuple, Dict]]:
+        all_column_ = [i.name for i in self.all_field]
 
         regex_validation = "(?=(" + '|'.join(all_column_) + r")?\s?:?\s*?(?=(" + '|'.join(
             list(map(str, Ordering))) + r"))?)"
 
-        for i in [
-            ('limit', 'Optional[int]', "Query(None)"),
-            ('offset', 'Optional[int]', "Query(None)"),
-            ('order_by_columns', f'Optional[List[pydantic.constr(regex="{regex_validation}")]]',
-             f'''Query(
+        result_.append(('order_by_columns', f'Optional[List[pydantic.constr(regex="{regex_validation}")]]',
+                        f'''Query(
                 None,
                 description="""{self._get_many_order_by_columns_description_builder(
                  all_columns=all_column_,
-                 primary_name='any name of column')}""")''')
-        ]:
-            result_.append(i)
+                 primary_name='any name of column')}""")'''))
         return result_
 
     def create_one(self) -> Tuple:
@@ -392,22 +309,21 @@ class ApiParameterSchemaBuilder:
         response_fields = []
 
         # Create Request and Response Model
-        all_field = deepcopy(self.all_field)
-        for i in all_field:
-            request_fields.append((i['column_name'],
-                                   i['column_type'],
-                                   f'Body({i["column_default"]}, description={i["column_description"]})'))
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
-                                    f'Body({i["column_default"]}, description={i["column_description"]})'))
+        for i in self.all_field:
+            request_fields.append((i.name,
+                                   i.field_type,
+                                   f'Body({i.default}, description={i.description})'))
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    f'Body({i.default}, description={i.description})'))
 
         self.code_gen.build_dataclass(class_name=self.class_name + "CreateOneRequestBodyModel",
                                       fields=request_fields,
                                       value_of_list_to_str_columns=self.uuid_type_columns,
                                       filter_none=True)
 
-        self.code_gen.build_base_model(class_name=self.class_name + "CreateOneResponseModel",
-                                       fields=response_fields)
+        self.code_gen.build_response_model(class_name=self.class_name + "CreateOneResponseModel",
+                                           fields=response_fields)
 
         return None, \
                self.class_name + "CreateOneRequestBodyModel", \
@@ -417,15 +333,14 @@ class ApiParameterSchemaBuilder:
         insert_fields = []
         response_fields = []
 
-        all_field = deepcopy(self.all_field)
-        for i in all_field:
-            insert_fields.append((i['column_name'],
-                                  i['column_type'],
-                                  f'field(default=Body({i["column_default"]}, description={i["column_description"]}))'))
+        for i in self.all_field:
+            insert_fields.append((i.name,
+                                  i.field_type,
+                                  f'field(default=Body({i.default}, description={i.description}))'))
 
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
-                                    f'Body({i["column_default"]}, description={i["column_description"]})'))
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    f'Body({i.default}, description={i.description})'))
 
         self.code_gen.build_dataclass(class_name=self.class_name + "CreateManyItemRequestModel",
                                       fields=insert_fields)
@@ -437,9 +352,8 @@ class ApiParameterSchemaBuilder:
                                       value_of_list_to_str_columns=self.uuid_type_columns,
                                       filter_none=True)
 
-        self.code_gen.build_base_model(class_name=self.class_name + "CreateManyItemResponseModel",
-                                       fields=response_fields,
-                                       orm_mode=True)
+        self.code_gen.build_response_model(class_name=self.class_name + "CreateManyItemResponseModel",
+                                           fields=response_fields)
 
         self.code_gen.build_base_model_root(class_name=self.class_name + "CreateManyItemListResponseModel",
                                             field=(
@@ -450,16 +364,15 @@ class ApiParameterSchemaBuilder:
                self.class_name + "CreateManyItemListRequestModel", \
                self.class_name + "CreateManyItemListResponseModel"
 
-    def find_many(self) -> Tuple:
+    def find_many(self, optional_total: bool = False, cursor: bool = False) -> Tuple:
 
         query_param: List[dict] = self._get_fizzy_query_param()
-        query_param: List[Tuple] = self._assign_pagination_param(query_param)
+        query_param: List[Tuple] = self._assign_pagination_param(query_param, cursor=cursor)
 
         response_fields = []
-        all_field = deepcopy(self.all_field)
-        for i in all_field:
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
+        for i in self.all_field:
+            response_fields.append((i.name,
+                                    i.field_type,
                                     None))
         request_fields = []
         for i in query_param:
@@ -473,27 +386,56 @@ class ApiParameterSchemaBuilder:
 
         self.code_gen.build_dataclass(class_name=self.class_name + "FindManyQueryParamModel", fields=request_fields,
                                       value_of_list_to_str_columns=self.uuid_type_columns, filter_none=True)
-        self.code_gen.build_base_model(class_name=self.class_name + "FindManyResponseModel", fields=response_fields)
+        self.code_gen.build_response_model(class_name=self.class_name + "FindManyResponseModel", fields=response_fields)
 
         self.code_gen.build_base_model_paginate(class_name=self.class_name + "FindManyItemListResponseModel",
                                                 field=(
                                                     f'{self.class_name + "FindManyResponseModel"}',
                                                     None),
-                                                base_model="ExcludeUnsetBaseModel")
+                                                base_model="ExcludeUnsetBaseModel",
+                                                optional_total=optional_total, cursor=cursor)
 
         return self.class_name + "FindManyRequestBody", \
                None, \
                f'{self.class_name}FindManyItemListResponseModel'
 
-    def find_one(self) -> Tuple:
+    def export(self) -> Tuple:
+        query_param: List[dict] = self._get_fizzy_query_param()
+        query_param: List[Tuple] = self._assign_order_by_param(query_param)
+
+        # the fields of a row of the export
+        response_fields = []
+        for i in self.all_field:
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    None))
+        request_fields = []
+        for i in query_param:
+            assert isinstance(i, Tuple) or isinstance(i, dict)
+            if isinstance(i, Tuple):
+                request_fields.append(i)
+            if isinstance(i, dict):
+                request_fields.append((i['column_name'],
+                                       i['column_type'],
+                                       f'Query({i["column_default"]}, description={i["column_description"]})'))
+
+        self.code_gen.build_dataclass(class_name=self.class_name + "ExportQueryParamModel", fields=request_fields,
+                                      value_of_list_to_str_columns=self.uuid_type_columns, filter_none=True)
+        self.code_gen.build_response_model(class_name=self.class_name + "ExportResponseModel", fields=response_fields)
+
+        return self.class_name + "ExportQueryParamModel", \
+               None, \
+               self.class_name + "ExportResponseModel"
+
+    def find_one(self, projection: bool = False) -> Tuple:
         query_param: List[dict] = self._get_fizzy_query_param(self.primary_key_str)
         response_fields = []
-        all_field = deepcopy(self.all_field)
 
-        for i in all_field:
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
-                                    f'Body({i["column_default"]})'))
+        for i in self.all_field:
+            # with projection, the response only has the columns which are asked for
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    None if projection else f'Body({i.default})'))
 
         request_fields = []
         for i in query_param:
@@ -504,7 +446,7 @@ class ApiParameterSchemaBuilder:
         self.code_gen.build_dataclass(class_name=self.class_name + "FindOneRequestBodyModel", fields=request_fields,
                                       value_of_list_to_str_columns=self.uuid_type_columns, filter_none=True)
 
-        self.code_gen.build_base_model(class_name=self.class_name + "FindOneResponseModel", fields=response_fields)
+        self.code_gen.build_response_model(class_name=self.class_name + "FindOneResponseModel", fields=response_fields)
         self.code_gen.build_base_model_root(class_name=self.class_name + "FindOneItemListResponseModel",
                                             field=(
                                                 f'{self.class_name + "FindOneResponseModel"}',
@@ -519,11 +461,10 @@ class ApiParameterSchemaBuilder:
     def delete_one(self) -> Tuple:
         query_param: List[dict] = self._get_fizzy_query_param(self.primary_key_str)
         response_fields = []
-        all_field = deepcopy(self.all_field)
-        for i in all_field:
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
-                                    f"Body({i['column_default']})"))
+        for i in self.all_field:
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    f"Body({i.default})"))
 
         request_fields = []
         for i in query_param:
@@ -537,8 +478,8 @@ class ApiParameterSchemaBuilder:
                                       filter_none=True,
                                       value_of_list_to_str_columns=self.uuid_type_columns)
 
-        self.code_gen.build_base_model(class_name=self.class_name + "DeleteOneResponseModel",
-                                       fields=response_fields)
+        self.code_gen.build_response_model(class_name=self.class_name + "DeleteOneResponseModel",
+                                           fields=response_fields)
         return self.class_name + "PrimaryKeyModel", \
                self.class_name + "DeleteOneRequestQueryModel", \
                None, \
@@ -547,11 +488,10 @@ class ApiParameterSchemaBuilder:
     def delete_many(self) -> Tuple:
         query_param: List[dict] = self._get_fizzy_query_param()
         response_fields = []
-        all_field = deepcopy(self.all_field)
-        for i in all_field:
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
-                                    f"Body({i['column_default']})"))
+        for i in self.all_field:
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    f"Body({i.default})"))
 
         request_fields = []
         for i in query_param:
@@ -565,8 +505,8 @@ class ApiParameterSchemaBuilder:
                                       filter_none=True,
                                       value_of_list_to_str_columns=self.uuid_type_columns)
 
-        self.code_gen.build_base_model(class_name=self.class_name + "DeleteManyItemResponseModel",
-                                       fields=response_fields)
+        self.code_gen.build_response_model(class_name=self.class_name + "DeleteManyItemResponseModel",
+                                           fields=response_fields)
 
         self.code_gen.build_base_model_root(class_name=self.class_name + "DeleteManyItemListResponseModel",
                                             field=(
@@ -581,17 +521,16 @@ class ApiParameterSchemaBuilder:
         query_param: List[dict] = self._get_fizzy_query_param(self.primary_key_str)
 
         response_fields = []
-        all_field = deepcopy(self.all_field)
         request_body_fields = []
 
-        for i in all_field:
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
-                                    f"Body({i['column_default']})"))
-            if i['column_name'] != self.primary_key_str:
-                request_body_fields.append((i['column_name'],
-                                            i['column_type'],
-                                            f"Body(None, description={i['column_description']})"))
+        for i in self.all_field:
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    f"Body({i.default})"))
+            if i.name != self.primary_key_str:
+                request_body_fields.append((i.name,
+                                            i.field_type,
+                                            f"Body(None, description={i.description})"))
 
         request_query_fields = []
         for i in query_param:
@@ -610,8 +549,8 @@ class ApiParameterSchemaBuilder:
                                       filter_none=True,
                                       value_of_list_to_str_columns=self.uuid_type_columns)
 
-        self.code_gen.build_base_model(class_name=self.class_name + "PatchOneResponseModel",
-                                       fields=response_fields)
+        self.code_gen.build_response_model(class_name=self.class_name + "PatchOneResponseModel",
+                                           fields=response_fields)
 
         return self.class_name + "PrimaryKeyModel", \
                self.class_name + "PatchOneRequestQueryModel", \
@@ -622,17 +561,16 @@ class ApiParameterSchemaBuilder:
         query_param: List[dict] = self._get_fizzy_query_param(self.primary_key_str)
 
         response_fields = []
-        all_field = deepcopy(self.all_field)
         request_body_fields = []
 
-        for i in all_field:
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
-                                    f"Body({i['column_default']})"))
-            if i['column_name'] not in [self.primary_key_str]:
-                request_body_fields.append((i['column_name'],
-                                            i['column_type'],
-                                            f"Body({i['column_default']}, description={i['column_description']})"))
+        for i in self.all_field:
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    f"Body({i.default})"))
+            if i.name not in [self.primary_key_str]:
+                request_body_fields.append((i.name,
+                                            i.field_type,
+                                            f"Body({i.default}, description={i.description})"))
 
         request_query_fields = []
         for i in query_param:
@@ -652,8 +590,8 @@ class ApiParameterSchemaBuilder:
                                       filter_none=False)
 
         # I have removed filter none and valuexxx for response model
-        self.code_gen.build_base_model(class_name=self.class_name + "UpdateOneResponseModel",
-                                       fields=response_fields)
+        self.code_gen.build_response_model(class_name=self.class_name + "UpdateOneResponseModel",
+                                           fields=response_fields)
         return self.class_name + "PrimaryKeyModel", \
                self.class_name + "UpdateOneRequestQueryModel", \
                self.class_name + "UpdateOneRequestBodyModel", \
@@ -672,17 +610,16 @@ class ApiParameterSchemaBuilder:
         query_param: List[dict] = self._get_fizzy_query_param()
 
         response_fields = []
-        all_field = deepcopy(self.all_field)
         request_body_fields = []
 
-        for i in all_field:
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
-                                    f"Body({i['column_default']})"))
-            if i['column_name'] not in [self.primary_key_str]:
-                request_body_fields.append((i['column_name'],
-                                            i['column_type'],
-                                            f"Body({i['column_default']}, description={i['column_description']})"))
+        for i in self.all_field:
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    f"Body({i.default})"))
+            if i.name not in [self.primary_key_str]:
+                request_body_fields.append((i.name,
+                                            i.field_type,
+                                            f"Body({i.default}, description={i.description})"))
 
         request_query_fields = []
         for i in query_param:
@@ -700,8 +637,8 @@ class ApiParameterSchemaBuilder:
                                       value_of_list_to_str_columns=self.uuid_type_columns,
                                       filter_none=False)
 
-        self.code_gen.build_base_model(class_name=self.class_name + "UpdateManyResponseItemModel",
-                                       fields=response_fields)
+        self.code_gen.build_response_model(class_name=self.class_name + "UpdateManyResponseItemModel",
+                                           fields=response_fields)
 
         self.code_gen.build_base_model_root(class_name=self.class_name + "UpdateManyItemListResponseModel",
                                             field=(
@@ -725,17 +662,16 @@ class ApiParameterSchemaBuilder:
         query_param: List[dict] = self._get_fizzy_query_param()
 
         response_fields = []
-        all_field = deepcopy(self.all_field)
         request_body_fields = []
 
-        for i in all_field:
-            response_fields.append((i['column_name'],
-                                    i['column_type'],
-                                    f"Body({i['column_default']})"))
-            if i['column_name'] not in [self.primary_key_str]:
-                request_body_fields.append((i['column_name'],
-                                            i['column_type'],
-                                            f"Body(None, description={i['column_description']})"))
+        for i in self.all_field:
+            response_fields.append((i.name,
+                                    i.field_type,
+                                    f"Body({i.default})"))
+            if i.name not in [self.primary_key_str]:
+                request_body_fields.append((i.name,
+                                            i.field_type,
+                                            f"Body(None, description={i.description})"))
 
         request_query_fields = []
         for i in query_param:
@@ -754,8 +690,8 @@ class ApiParameterSchemaBuilder:
                                       filter_none=True,
                                       value_of_list_to_str_columns=self.uuid_type_columns)
 
-        self.code_gen.build_base_model(class_name=self.class_name + "PatchManyItemResponseModel",
-                                       fields=response_fields)
+        self.code_gen.build_response_model(class_name=self.class_name + "PatchManyItemResponseModel",
+                                           fields=response_fields)
 
         self.code_gen.build_base_model_root(class_name=f'{self.class_name}PatchManyItemListResponseModel',
                                             field=(
@@ -1,88 +1,114 @@
-from typing import Type, List
+from typing import Type, List, Optional
 
+from ..generator.output_sink import OutputSink
 from ..misc.type import CrudMethods
 from ..misc.crud_model import CRUDModel
-from ..misc.type import SqlType, CRUDRequestMapping
+from ..misc.type import SqlType, CRUDRequestMapping, GenerationPhase, CountStrategy, Pagination
+from ..misc.get_table_name import get_table_name
+from ..utils.instrumentation import GenerationInstrumentation
 from ..utils.schema_builder import ApiParameterSchemaBuilder
 
 
 def sqlalchemy_to_pydantic(
         db_model: Type, *,
         crud_methods: List[CrudMethods],
+        sink: OutputSink,
         sql_type: str = SqlType.postgresql,
         exclude_columns: List[str] = None,
         constraints=None,
+        instrumentation: Optional[GenerationInstrumentation] = None,
+        explicit_imports: bool = False,
+        shared_models: bool = False,
+        count_strategy: CountStrategy = CountStrategy.fetch_all,
+        pagination: Pagination = Pagination.offset,
+        projection: bool = False,
         ) -> CRUDModel:
+    if instrumentation is None:
+        instrumentation = GenerationInstrumentation()
+    table_name = get_table_name(db_model)
     request_response_mode_set = {}
-    model_builder = ApiParameterSchemaBuilder(db_model,
-                                              constraints=constraints,
-                                              exclude_column=exclude_columns,
-                                              sql_type=sql_type,
-                                              # foreign_include=foreign_include,
-                                              )
-    for crud_method in crud_methods:
-        if crud_method.value == CrudMethods.CREATE_ONE.value:
-            model_builder.create_one()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
+    with instrumentation.phase(GenerationPhase.schema_extraction, table_name):
+        model_builder = ApiParameterSchemaBuilder(db_model,
+                                                  constraints=constraints,
+                                                  exclude_column=exclude_columns,
+                                                  sql_type=sql_type,
+                                                  sink=sink,
+                                                  explicit_imports=explicit_imports,
+                                                  shared_models=shared_models,
+                                                  # foreign_include=foreign_include,
+                                                  )
+    with instrumentation.phase(GenerationPhase.model_rendering, table_name):
+        for crud_method in crud_methods:
+            if crud_method.value == CrudMethods.CREATE_ONE.value:
+                model_builder.create_one()
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
 
-        elif crud_method.value == CrudMethods.CREATE_MANY.value:
-            model_builder.create_many()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
-        elif crud_method.value == CrudMethods.DELETE_ONE.value:
-            model_builder.delete_one()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
-        elif crud_method.value == CrudMethods.DELETE_MANY.value:
-            model_builder.delete_many()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
-        elif crud_method.value == CrudMethods.FIND_ONE.value:
-            model_builder.find_one()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
-        elif crud_method.value == CrudMethods.FIND_MANY.value:
-            model_builder.find_many()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
-        elif crud_method.value == CrudMethods.PATCH_ONE.value:
-            model_builder.patch_one()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
-        elif crud_method.value == CrudMethods.UPDATE_ONE.value:
-            model_builder.update_one()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
-        elif crud_method.value == CrudMethods.UPDATE_MANY.value:
-            model_builder.update_many()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
-        elif crud_method.value == CrudMethods.PATCH_MANY.value:
-            model_builder.patch_many()
-            request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
-            if request_method not in request_response_mode_set:
-                request_response_mode_set[request_method] = {}
-            request_response_mode_set[request_method][crud_method.value] = True
-    model_builder.code_gen.gen()
+            elif crud_method.value == CrudMethods.CREATE_MANY.value:
+                model_builder.create_many()
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+            elif crud_method.value == CrudMethods.DELETE_ONE.value:
+                model_builder.delete_one()
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+            elif crud_method.value == CrudMethods.DELETE_MANY.value:
+                model_builder.delete_many()
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+            elif crud_method.value == CrudMethods.FIND_ONE.value:
+                model_builder.find_one(projection=projection)
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+            elif crud_method.value == CrudMethods.FIND_MANY.value:
+                # the total is left out of the response when the client does not ask for it
+                model_builder.find_many(optional_total=count_strategy != CountStrategy.fetch_all,
+                                        cursor=pagination == Pagination.cursor)
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+            elif crud_method.value == CrudMethods.PATCH_ONE.value:
+                model_builder.patch_one()
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+            elif crud_method.value == CrudMethods.UPDATE_ONE.value:
+                model_builder.update_one()
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+            elif crud_method.value == CrudMethods.UPDATE_MANY.value:
+                model_builder.update_many()
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+            elif crud_method.value == CrudMethods.PATCH_MANY.value:
+                model_builder.patch_many()
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+            elif crud_method.value == CrudMethods.EXPORT.value:
+                model_builder.export()
+                request_method = CRUDRequestMapping.get_request_method_by_crud_method(crud_method.value).value
+                if request_method not in request_response_mode_set:
+                    request_response_mode_set[request_method] = {}
+                request_response_mode_set[request_method][crud_method.value] = True
+        model_builder.code_gen.gen()
 
     return CRUDModel(
         **{**request_response_mode_set,
@@ -0,0 +1,51 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import warnings
+from typing import Dict, Optional
+
+from ..generator.output_sink import FileSystemOutputSink
+from ..misc.constant import OPENAPI
+
+REGENERATE_OPENAPI_OPTION = "--regenerate-openapi"
+
+
+def write_openapi_document(root_directory: str) -> bool:
+    """
+    Write openapi.json of the generated project by running its app.py in a subprocess, so the generator never
+    imports the generated code
+
+    The document is removed and a warning is issued if the app can not be imported, e.g. the database driver is not
+    installed, the app then builds the document on the first request as usual
+
+    :return: True if the document is written
+    """
+    result = subprocess.run([sys.executable, "app.py", REGENERATE_OPENAPI_OPTION], cwd=root_directory,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if not result.returncode:
+        return True
+    path = os.path.join(root_directory, OPENAPI)
+    if os.path.isfile(path):
+        os.remove(path)
+    stderr_tail = "\n".join(result.stderr.strip().splitlines()[-5:])
+    warnings.warn(f"Skip {OPENAPI}, the generated app can not be imported:\n{stderr_tail}")
+    return False
+
+
+def render_openapi_document(artifacts: Dict[str, str]) -> Optional[str]:
+    """
+    openapi.json of a project generated in memory, the project is written into a temporary folder to run it
+    """
+    root_directory = tempfile.mkdtemp()
+    try:
+        sink = FileSystemOutputSink(root_directory)
+        sink.merge(artifacts)
+        sink.flush()
+        if not write_openapi_document(root_directory):
+            return None
+        with open(os.path.join(root_directory, OPENAPI)) as f:
+            return f.read()
+    finally:
+        shutil.rmtree(root_directory)
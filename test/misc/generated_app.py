@@ -0,0 +1,98 @@
+import json
+import subprocess
+import sys
+import tempfile
+from typing import Any, Sequence, Tuple
+
+from src.fastapi_quickcrud_codegen import crud_router_builder
+
+# the head of the scripts run in a generated project: the app is imported without starting the server, and
+# request() calls the ASGI app directly. The arguments of the script are the json of its first argument
+APP_CLIENT = """
+import asyncio
+import json
+import sys
+from urllib.parse import urlencode
+
+ARGUMENTS = json.loads(sys.argv[1])
+for module_name in ARGUMENTS["blocked_modules"]:
+    # the import of the module fails, as if it is not installed
+    sys.modules[module_name] = None
+import uvicorn
+uvicorn.run = lambda *args, **kwargs: None
+from app import app
+
+
+async def request(method, path, query=(), body=None):
+    messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}]
+    response = {"headers": {}, "body": b""}
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # a streaming response waits for a disconnect while it sends the body
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+        else:
+            response["body"] += message.get("body", b"")
+
+    query_string = query if isinstance(query, str) else urlencode([tuple(i) for i in query])
+    await app({"type": "http", "method": method, "path": path, "raw_path": path.encode(),
+               "query_string": query_string.encode(), "root_path": "", "scheme": "http", "http_version": "1.1",
+               "headers": [(b"content-type", b"application/json")], "server": ("test", 80), "client": ("test", 1)},
+              receive, send)
+    return {"status": response["status"], "headers": response["headers"], "body": response["body"].decode()}
+"""
+
+# create the rows, then send the GET requests
+REQUESTS_MAIN = """
+async def main():
+    await app.router.startup()
+    if ARGUMENTS["rows"] is not None:
+        await request("POST", ARGUMENTS["path"], body=ARGUMENTS["rows"])
+    return [await request("GET", path, query) for path, query in ARGUMENTS["requests"]]
+"""
+
+
+def build_project(work_directory: str, db_model_list: list, is_async: bool = False, **kwargs) -> str:
+    """
+    Generate the project into a new folder of the work directory, on an in-memory SQLite database by default
+
+    :return: the folder of the project
+    """
+    project_directory = tempfile.mkdtemp(dir=work_directory)
+    kwargs.setdefault("database_url", "sqlite+aiosqlite://" if is_async else "sqlite://")
+    crud_router_builder(db_model_list=db_model_list, is_async=is_async, output_directory=project_directory, **kwargs)
+    return project_directory
+
+
+def run_app(project_directory: str, main: str, blocked_modules: Sequence[str] = (), **arguments) -> Tuple[Any, str]:
+    """
+    Run APP_CLIENT and main in the project, main defines the coroutine main() whose result is printed as json
+
+    :return: the result of main() and the output of the script, the generated app echoes its sql statements into it
+    """
+    script = APP_CLIENT + main + "\n\nprint(json.dumps(asyncio.run(main())))\n"
+    result = subprocess.run([sys.executable, "-c", script,
+                             json.dumps(dict(arguments, blocked_modules=list(blocked_modules)))],
+                            cwd=project_directory, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            universal_newlines=True)
+    if result.returncode:
+        raise AssertionError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stdout
+
+
+def request_app(project_directory: str, requests: list, rows: list = None, path: str = "/test",
+                blocked_modules: Sequence[str] = ()) -> list:
+    """
+    POST the rows to the path, then GET every [path, query] of the requests, the query is a string or a list of pairs
+
+    :return: {"status", "headers", "body"} of every request, the body is text
+    """
+    responses, _ = run_app(project_directory, REQUESTS_MAIN, blocked_modules=blocked_modules, rows=rows, path=path,
+                           requests=requests)
+    return responses
@@ -0,0 +1,13 @@
+import unittest
+
+from benchmark.generator_benchmark import run_benchmark, compare
+
+
+class Testing(unittest.TestCase):
+    def test_benchmark_report(self):
+        report = run_benchmark(tables=2, columns=16, repeat=1)
+        for phase_name in ["schema_extraction", "generation", "end_to_end"]:
+            assert report["phases"][phase_name]["seconds"] > 0
+            assert report["phases"][phase_name]["peak_memory_bytes"] > 0
+        assert report["phases"]["end_to_end.route_rendering"]["seconds"] > 0
+        assert compare(report, report, threshold=1.2) == []
@@ -0,0 +1,93 @@
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from benchmark.layout_benchmark import run_benchmark
+from src.fastapi_quickcrud_codegen import crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.misc.type import CrudMethods
+from test.misc.generated_app import build_project, run_app
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_bundle_layout'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    bool_value = Column(Boolean, nullable=False, default=False)
+    varchar_value = Column(String, comment="a comment")
+    int4_value = Column(Integer, nullable=False)
+
+
+class SampleTableTwo(Base):
+    __tablename__ = 'test_bundle_layout_two'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    date_value = Column(Date, nullable=False)
+    sample_table_id = Column(Integer, ForeignKey('test_bundle_layout.primary_key'))
+
+
+model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"]),
+              DbModel(db_model=SampleTableTwo, prefix="/two", tags=["sample api two"],
+                      crud_methods=[CrudMethods.FIND_ONE, CrudMethods.CREATE_ONE])]
+
+# every route of the app with its response model
+DESCRIBE_MAIN = """
+async def main():
+    return sorted([sorted(route.methods), route.path, route.response_model.schema()]
+                  for route in app.routes if getattr(route, "response_model", None))
+"""
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.work_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory)
+
+    def test_bundle_files(self):
+        project = crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                                           layout="bundle")
+        self.assertFalse([i for i in project if i.startswith(("model/", "route/"))])
+        self.assertIn("from routes import test_bundle_layout_router, test_bundle_layout_two_router\n",
+                      project["app.py"])
+        models_code = project["models.py"]
+        self.assertEqual(models_code.count("from common.db import Base\n"), 1)
+        self.assertNotIn("PRIMARY_KEY_NAME", models_code)
+        self.assertIn("class SampleTable(Base):", models_code)
+        self.assertIn("class SampleTableTwo(Base):", models_code)
+        routes_code = project["routes.py"]
+        self.assertEqual(routes_code.count("from fastapi import "), 1)
+        self.assertIn("from models import SampleTable, ", routes_code)
+        self.assertNotIn("from model.", routes_code)
+        self.assertIn("\n\n\ntest_bundle_layout_router = api\n", routes_code)
+        self.assertTrue(routes_code.endswith("\n\n\ntest_bundle_layout_two_router = api\n"))
+
+    def test_same_app(self):
+        modules_project, bundle_project = [build_project(self.work_directory, model_list, layout=layout,
+                                                         explicit_imports=layout == "bundle")
+                                           for layout in ["modules", "bundle"]]
+        self.assertEqual(run_app(modules_project, DESCRIBE_MAIN)[0], run_app(bundle_project, DESCRIBE_MAIN)[0])
+
+    def test_unsupported_options(self):
+        with self.assertRaises(ValueError):
+            crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                                     layout="bundle", startup_probe=True)
+        with self.assertRaises(ValueError):
+            crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                                     layout="packages")
+
+    def test_layout_benchmark(self):
+        report = run_benchmark(tables=3, columns=16, repeat=1)
+        # the model and route modules of every table and their two packages
+        self.assertEqual(report["layouts"]["modules"]["project_modules"], 8)
+        self.assertEqual(report["layouts"]["bundle"]["project_modules"], 2)
+        self.assertGreater(report["speedup"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
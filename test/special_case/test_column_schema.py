@@ -0,0 +1,40 @@
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen.utils.column_schema import ColumnCategory, get_column_schemas
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_column_schema'
+    __table_args__ = (UniqueConstraint('int4_value', 'varchar_value'),)
+    primary_key = Column(UUID, primary_key=True, comment='pk')
+    int4_value = Column(Integer, nullable=False)
+    varchar_value = Column(String, default='a')
+    jsonb_value = Column(JSONB)
+    array_value = Column(ARRAY(Integer))
+    blob_value = Column(LargeBinary)
+
+
+class Testing(unittest.TestCase):
+    def test_column_schema(self):
+        column_schemas = get_column_schemas(SampleTable)
+        assert get_column_schemas(SampleTable) is column_schemas
+
+        primary_key, int4_value, varchar_value, jsonb_value, array_value, blob_value = column_schemas
+        assert (primary_key.field_type, primary_key.category, primary_key.is_primary, primary_key.description) == \
+               ("uuid.UUID", ColumnCategory.UUID, True, '"pk"')
+        assert (int4_value.field_type, int4_value.category, int4_value.default, int4_value.is_unique) == \
+               ("int", ColumnCategory.NUMBER, "...", True)
+        assert (varchar_value.category, varchar_value.default) == (ColumnCategory.STR, 'a')
+        assert (jsonb_value.field_type, jsonb_value.is_partial_supported) == ("Union[dict, list]", True)
+        assert (array_value.field_type, array_value.category) == ("List[int]", ColumnCategory.ARRAY)
+        assert blob_value.category is None and blob_value.unsupported_reason
+
+        with self.assertRaises(AttributeError):
+            int4_value.name = 'changed'
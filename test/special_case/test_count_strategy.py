@@ -0,0 +1,86 @@
+import json
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.misc.type import CountStrategy, CrudMethods
+from test.misc.generated_app import build_project, request_app
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_count_strategy'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String, comment="a comment")
+    int4_value = Column(Integer, nullable=False)
+
+
+def _model_list(count_strategy: CountStrategy) -> list:
+    return [DbModel(db_model=SampleTable, prefix="/test", tags=["test"], count_strategy=count_strategy,
+                    crud_methods=[CrudMethods.FIND_MANY, CrudMethods.CREATE_MANY])]
+
+
+ROWS = [{"varchar_value": str(i), "int4_value": i} for i in range(5)]
+
+REQUESTS = [["/test", query] for query in ["", "limit=2", "limit=2&offset=4", "limit=2&offset=10",
+                                           "int4_value____from=3", "int4_value____from=10",
+                                           "limit=2&include_total=false"]]
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.work_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory)
+
+    def _request_app(self, count_strategy: CountStrategy, is_async: bool) -> list:
+        """
+        :return: [status, body, x-total-count] of every request
+        """
+        project_directory = build_project(self.work_directory, _model_list(count_strategy), is_async=is_async)
+        return [[i["status"], json.loads(i["body"]), i["headers"].get("x-total-count")]
+                for i in request_app(project_directory, REQUESTS, rows=ROWS)]
+
+    def test_default_unchanged(self):
+        route_code = crud_router_code_builder(db_model_list=_model_list(CountStrategy.fetch_all), is_async=False,
+                                              database_url="sqlite://")["route/test_count_strategy.py"]
+        self.assertIn("total = len(sql_executed_result_without_paginate.fetchall())", route_code)
+        self.assertNotIn("include_total", route_code)
+
+    def test_generated_code(self):
+        project = crud_router_code_builder(db_model_list=_model_list(CountStrategy.window), is_async=False,
+                                           database_url="sqlite://")
+        route_code = project["route/test_count_strategy.py"]
+        self.assertNotIn("sql_executed_result_without_paginate", route_code)
+        self.assertIn("func.count().over()", route_code)
+        self.assertIn("    total: Optional[int]\n", project["model/test_count_strategy.py"])
+
+    def test_same_totals(self):
+        expected = self._request_app(CountStrategy.fetch_all, is_async=False)
+        self.assertEqual([i[1]["total"] for i in expected], [5, 5, 5, 5, 2, 0, 5])
+        for count_strategy, is_async in [(CountStrategy.count, False), (CountStrategy.window, False),
+                                         (CountStrategy.count, True), (CountStrategy.concurrent, True)]:
+            responses = self._request_app(count_strategy, is_async=is_async)
+            # the total is not counted if the client does not ask for it
+            self.assertNotIn("total", responses[-1][1])
+            self.assertEqual(responses[-1][1]["result"], expected[-1][1]["result"])
+            self.assertEqual(responses[:-1], expected[:-1], count_strategy)
+
+    def test_concurrent_needs_async(self):
+        with self.assertRaises(ValueError):
+            crud_router_code_builder(db_model_list=_model_list(CountStrategy.concurrent), is_async=False,
+                                     database_url="sqlite://")
+        with self.assertRaises(ValueError):
+            DbModel(db_model=SampleTable, prefix="/test", tags=["test"], count_strategy="estimate")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.misc.type import CountStrategy, CrudMethods, Pagination
+from test.misc.generated_app import build_project, run_app
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_cursor_pagination'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String, nullable=False)
+    int4_value = Column(Integer, nullable=False)
+    timestamp_value = Column(DateTime, nullable=False)
+    nullable_value = Column(Integer)
+
+
+ROWS = [{"varchar_value": "abcabca"[i], "int4_value": i % 3, "timestamp_value": f"2022-01-0{i % 4 + 1}T10:00:00",
+         "nullable_value": None if i % 3 == 0 else i} for i in range(7)]
+
+
+def _model_list(pagination: Pagination) -> list:
+    return [DbModel(db_model=SampleTable, prefix="/test", tags=["test"], pagination=pagination,
+                    crud_methods=[CrudMethods.FIND_MANY, CrudMethods.CREATE_MANY])]
+
+
+# follow the next cursor of find many page by page
+PAGES_MAIN = """
+async def main():
+    await app.router.startup()
+    await request("POST", "/test", body=ARGUMENTS["rows"])
+    pages = {}
+    for order_by_columns in ARGUMENTS["orders"]:
+        pages[",".join(order_by_columns)] = []
+        query = [("limit", 3)] + [("order_by_columns", i) for i in order_by_columns]
+        page = json.loads((await request("GET", "/test", query))["body"])
+        while True:
+            pages[",".join(order_by_columns)].append([i["primary_key"] for i in page["result"]])
+            if not page["next_cursor"]:
+                break
+            page = json.loads((await request("GET", "/test", query + [("cursor", page["next_cursor"])]))["body"])
+    # a cursor of the default order, after the primary key 3
+    cursor = "eyJvcmRlciI6WyJwcmltYXJ5X2tleTpBU0MiXSwidmFsdWVzIjpbM119"
+    errors = [(await request("GET", "/test", [("cursor", "not a cursor")]))["status"],
+              (await request("GET", "/test", [("cursor", cursor), ("order_by_columns", "int4_value")]))["status"],
+              (await request("GET", "/test", [("limit", 2), ("order_by_columns", "nullable_value:DESC")]))["status"]]
+    return {"pages": pages, "errors": errors}
+"""
+
+ORDERS = [[], ["int4_value:DESC"], ["varchar_value", "int4_value:DESC"], ["timestamp_value:ASC"]]
+
+
+def _expected_pages(order_by_columns: list) -> list:
+    rows = [dict(i, primary_key=index + 1) for index, i in enumerate(ROWS)]
+    for order_by_column in reversed(order_by_columns + ["primary_key"]):
+        column, order_by = (order_by_column.split(":") + ["ASC"])[:2]
+        rows.sort(key=lambda row: row[column], reverse=order_by == "DESC")
+    primary_keys = [i["primary_key"] for i in rows]
+    return [primary_keys[i:i + 3] for i in range(0, len(primary_keys), 3)]
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.work_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory)
+
+    def test_generated_code(self):
+        project = crud_router_code_builder(db_model_list=_model_list(Pagination.cursor), is_async=False,
+                                           database_url="sqlite://")
+        self.assertIn("common/pagination.py", project)
+        model_code = project["model/test_cursor_pagination.py"]
+        self.assertIn("    next_cursor: Optional[str]\n", model_code)
+        self.assertNotIn("offset", model_code)
+        route_code = project["route/test_cursor_pagination.py"]
+        self.assertNotIn("offset", route_code)
+        self.assertIn('order.append(f"primary_key:{Ordering.ASC.upper()}")', route_code)
+
+        project = crud_router_code_builder(db_model_list=_model_list(Pagination.offset), is_async=False,
+                                           database_url="sqlite://")
+        self.assertNotIn("common/pagination.py", project)
+        self.assertNotIn("next_cursor", project["model/test_cursor_pagination.py"])
+
+    def test_pages(self):
+        for is_async in [False, True]:
+            project_directory = build_project(self.work_directory, _model_list(Pagination.cursor), is_async=is_async)
+            report, _ = run_app(project_directory, PAGES_MAIN, rows=ROWS, orders=ORDERS)
+            for order_by_columns in ORDERS:
+                self.assertEqual(report["pages"][",".join(order_by_columns)], _expected_pages(order_by_columns),
+                                 order_by_columns)
+            # an invalid cursor, a cursor of another order, and a nullable sort column, its NULL rows would be
+            # left out of the pages
+            self.assertEqual(report["errors"], [400, 400, 400])
+
+    def test_count_strategy(self):
+        with self.assertRaises(ValueError):
+            DbModel(db_model=SampleTable, prefix="/test", tags=["test"], pagination=Pagination.cursor,
+                    count_strategy=CountStrategy.count)
+
+
+if __name__ == '__main__':
+    unittest.main()
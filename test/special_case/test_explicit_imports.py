@@ -0,0 +1,61 @@
+import shutil
+import tempfile
+import unittest
+
+from benchmark.generator_benchmark import DATABASE_URL, _db_model_list, load_schema
+from benchmark.import_time_benchmark import run_benchmark
+from src.fastapi_quickcrud_codegen.utils.import_builder import ImportBuilder, referenced_names
+from test.misc.generated_app import build_project, run_app
+
+# the schemas of the app with star imports and with explicit imports must be the same
+OPENAPI_MAIN = """
+async def main():
+    return app.openapi()
+"""
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.work_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory)
+
+    def test_referenced_names(self):
+        code = "PRIMARY_KEY_NAME = 'id'\n\n" \
+               "class A(Base):\n    id = Column(Integer, primary_key=True)\n\n" \
+               "@dataclass\nclass B:\n    a: Optional[List[uuid.UUID]] = Query(None)\n"
+        assert referenced_names(code) == {"Base", "Column", "Integer", "dataclass", "Optional", "List", "uuid",
+                                          "Query"}
+
+    def test_star_imports_are_resolved_in_order(self):
+        import_helper = ImportBuilder()
+        import_helper.add(import_=set(["Optional", "List"]), from_="typing")
+        import_helper.add(import_=set(["*"]), from_="sqlalchemy")
+        import_helper.add(import_=set(["*"]), from_="sqlalchemy.dialects.postgresql")
+        import_helper.add(import_="uuid")
+        code = import_helper.to_code({"Optional", "Column", "JSONB", "ARRAY", "Integer", "uuid", "int"})
+        assert code == "from typing import Optional\n" \
+                       "from sqlalchemy import Column, Integer\n" \
+                       "from sqlalchemy.dialects.postgresql import ARRAY, JSONB\n" \
+                       "import uuid\n"
+
+    def test_same_api_as_star_imports(self):
+        models = load_schema(3, 16, self.work_directory)
+        schemas = []
+        for explicit_imports in [False, True]:
+            project_directory = build_project(self.work_directory, _db_model_list(models), database_url=DATABASE_URL,
+                                              explicit_imports=explicit_imports)
+            with open(f"{project_directory}/model/benchmark_table_0.py") as f:
+                assert ("import *" in f.read()) is not explicit_imports
+            schemas.append(run_app(project_directory, OPENAPI_MAIN)[0])
+        assert schemas[0] == schemas[1]
+
+    def test_import_time_benchmark(self):
+        report = run_benchmark(tables=2, columns=16, repeat=1)
+        assert report["modes"]["explicit_imports"]["module_names"] < report["modes"]["star_imports"]["module_names"]
+        assert report["speedup"] > 0
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.misc.type import CrudMethods
+from test.misc.generated_app import build_project, request_app
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_export'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String, nullable=False)
+    int4_value = Column(Integer, nullable=False)
+    numeric_value = Column(Numeric(10, 2))
+    timestamp_value = Column(DateTime, nullable=False)
+
+
+ROWS = [{"varchar_value": f"välue, {i}", "int4_value": i % 3, "numeric_value": i * 1.25 if i != 3 else None,
+         "timestamp_value": f"2022-01-0{i + 1}T10:00:00"} for i in range(7)]
+
+
+def _model_list(crud_methods: list) -> list:
+    return [DbModel(db_model=SampleTable, prefix="/test", tags=["test"], crud_methods=crud_methods)]
+
+
+REQUESTS = [
+    ["/test/export", []],
+    ["/test/export", [("int4_value____list", 1), ("int4_value____list", 2), ("order_by_columns", "int4_value:DESC"),
+                      ("order_by_columns", "primary_key")]],
+    ["/test/export", [("format", "csv"), ("order_by_columns", "primary_key:DESC")]],
+    ["/test/export", [("format", "csv"), ("varchar_value____str", "nothing")]],
+    ["/test/export", [("order_by_columns", "unknown")]],
+    ["/test/2", []],
+]
+
+
+def _expected_rows() -> list:
+    return [{"primary_key": index + 1, "varchar_value": i["varchar_value"], "int4_value": i["int4_value"],
+             "numeric_value": i["numeric_value"], "timestamp_value": i["timestamp_value"]}
+            for index, i in enumerate(ROWS)]
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.work_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory)
+
+    def test_generated_code(self):
+        project = crud_router_code_builder(db_model_list=_model_list([CrudMethods.FIND_ONE, CrudMethods.EXPORT]),
+                                           is_async=False, database_url="sqlite://")
+        self.assertIn("common/export.py", project)
+        self.assertIn("common/fast_response.py", project)
+        route_code = project["route/test_export.py"]
+        # registered before the find one route
+        self.assertLess(route_code.index('@api.get("/export"'), route_code.index('@api.get("/{primary_key}"'))
+        self.assertIn("stmt = stmt.execution_options(stream_results=True)", route_code)
+
+        project = crud_router_code_builder(db_model_list=_model_list([CrudMethods.FIND_ONE, CrudMethods.FIND_MANY]),
+                                           is_async=False, database_url="sqlite://")
+        self.assertNotIn("common/export.py", project)
+        self.assertNotIn("common/fast_response.py", project)
+        self.assertNotIn("Export", project["model/test_export.py"])
+
+    def test_export(self):
+        for is_async in [False, True]:
+            project_directory = build_project(self.work_directory,
+                                              _model_list([CrudMethods.FIND_ONE, CrudMethods.EXPORT,
+                                                           CrudMethods.CREATE_MANY]), is_async=is_async)
+            responses = [[i["status"], i["headers"].get("content-type"), i["body"]]
+                         for i in request_app(project_directory, REQUESTS, rows=ROWS)]
+            rows = _expected_rows()
+
+            self.assertEqual(responses[0][:2], [200, "application/x-ndjson"])
+            self.assertEqual([json.loads(i) for i in responses[0][2].splitlines()], rows)
+            self.assertEqual([json.loads(i)["primary_key"] for i in responses[1][2].splitlines()],
+                             [3, 6, 2, 5])
+
+            self.assertEqual(responses[2][:2], [200, "text/csv; charset=utf-8"])
+            csv_rows = list(csv.reader(io.StringIO(responses[2][2])))
+            self.assertEqual(csv_rows[0], list(rows[0]))
+            self.assertEqual(csv_rows[1:], [[str(i["primary_key"]), i["varchar_value"], str(i["int4_value"]),
+                                             "" if i["numeric_value"] is None else str(i["numeric_value"]),
+                                             i["timestamp_value"]] for i in reversed(rows)])
+            # no matching row, only the header
+            self.assertEqual(responses[3][2], "primary_key,varchar_value,int4_value,numeric_value,timestamp_value\r\n")
+            self.assertEqual(responses[4][0], 400)
+            self.assertEqual(responses[5][0], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
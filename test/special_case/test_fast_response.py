@@ -0,0 +1,92 @@
+import json
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.misc.type import CountStrategy, CrudMethods, Pagination
+from test.misc.generated_app import build_project, request_app
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_fast_response'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    bool_value = Column(Boolean, nullable=False, default=False)
+    varchar_value = Column(String, nullable=False)
+    numeric_value = Column(Numeric(10, 2))
+    timestamp_value = Column(DateTime, nullable=False)
+    date_value = Column(Date)
+
+
+ROWS = [{"bool_value": i % 2 == 0, "varchar_value": f"välue {i}", "numeric_value": i * 1.25 if i != 3 else None,
+         "timestamp_value": f"2022-01-0{i + 1}T10:00:00.12345{i}", "date_value": f"2022-02-0{i + 1}"}
+        for i in range(5)]
+
+
+def _model_list(fast_response: bool, **kwargs) -> list:
+    return [DbModel(db_model=SampleTable, prefix="/test", tags=["test"], fast_response=fast_response,
+                    crud_methods=[CrudMethods.FIND_ONE, CrudMethods.FIND_MANY, CrudMethods.CREATE_MANY], **kwargs)]
+
+
+REQUESTS = [
+    ["/test", []],
+    ["/test", [("limit", 2), ("offset", 1), ("order_by_columns", "numeric_value:DESC")]],
+    ["/test", [("varchar_value____str", "nothing")]],
+    ["/test/2", []],
+    ["/test/10", []],
+]
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.work_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory)
+
+    def _request_app(self, model_list: list, orjson: bool = True) -> list:
+        """
+        :return: [status, content type, x-total-count, body] of every request
+        """
+        project_directory = build_project(self.work_directory, model_list)
+        requests = [i for i in REQUESTS if model_list[0].pagination == Pagination.offset or "offset" not in str(i)]
+        responses = request_app(project_directory, requests, rows=ROWS, blocked_modules=[] if orjson else ["orjson"])
+        return [[i["status"], i["headers"].get("content-type"), i["headers"].get("x-total-count"), i["body"]]
+                for i in responses]
+
+    def test_generated_code(self):
+        project = crud_router_code_builder(db_model_list=_model_list(True), is_async=False, database_url="sqlite://")
+        self.assertIn("common/fast_response.py", project)
+        route_code = project["route/test_fast_response.py"]
+        self.assertIn("from common.fast_response import FastJSONResponse\n", route_code)
+        self.assertNotIn("parse_obj_as(SampleTableFindManyItemListResponseModel, response_format)\n"
+                         "    response.headers[\"x-total-count\"] = str(len(response_data_list))", route_code)
+        project = crud_router_code_builder(db_model_list=_model_list(False), is_async=False, database_url="sqlite://")
+        self.assertNotIn("common/fast_response.py", project)
+        self.assertNotIn("FastJSONResponse", project["route/test_fast_response.py"])
+
+    def test_same_responses(self):
+        for kwargs in [{}, {"count_strategy": CountStrategy.window}, {"pagination": Pagination.cursor},
+                       {"projection": True}]:
+            expected = self._request_app(_model_list(False, **kwargs))
+            self.assertEqual(expected[-2][0], 200)
+            self.assertEqual(expected[-1][0], 404)
+            for orjson in [True, False]:
+                responses = self._request_app(_model_list(True, **kwargs), orjson=orjson)
+                for response, expected_response in zip(responses, expected):
+                    self.assertEqual(response[:3], expected_response[:3], (kwargs, orjson))
+                    if response[1] == "application/json":
+                        self.assertEqual(json.loads(response[3]), json.loads(expected_response[3]), (kwargs, orjson))
+                    else:
+                        self.assertEqual(response[3], expected_response[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
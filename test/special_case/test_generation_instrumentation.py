@@ -0,0 +1,62 @@
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_builder, crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.misc.type import GenerationPhase
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_instrumentation_one'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String)
+
+
+class SampleTableTwo(Base):
+    __tablename__ = 'test_instrumentation_two'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    int4_value = Column(Integer, nullable=False)
+
+
+model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"]),
+              DbModel(db_model=SampleTableTwo, prefix="/two", tags=["sample api"])]
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.output_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_directory)
+
+    def test_phase_events(self):
+        events = []
+        crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://", workers=2,
+                                 on_event=events.append)
+        phases = {(i.phase, i.target) for i in events}
+        for table_name in ['test_instrumentation_one', 'test_instrumentation_two']:
+            for phase in [GenerationPhase.schema_extraction, GenerationPhase.model_rendering,
+                          GenerationPhase.route_rendering]:
+                assert (phase, table_name) in phases
+        for file_name in ['typing.py', 'utils.py', 'http_exception.py', 'db.py', 'sql_session.py', 'app.py']:
+            assert (GenerationPhase.common_module_rendering, file_name) in phases
+        assert GenerationPhase.file_io not in {i.phase for i in events}
+        assert all(i.seconds >= 0 for i in events)
+
+    def test_profile(self):
+        events = []
+        profile = os.path.join(self.output_directory, 'generation.pstats')
+        crud_router_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                            output_directory=os.path.join(self.output_directory, 'project'),
+                            on_event=events.append, profile=profile)
+        assert events[-1].phase == GenerationPhase.file_io
+        assert pstats.Stats(profile).total_calls > 0
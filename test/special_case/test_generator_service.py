@@ -0,0 +1,107 @@
+import contextlib
+import io
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from src.fastapi_quickcrud_codegen.misc.type import CrudMethods, ProjectLayout
+from src.fastapi_quickcrud_codegen.service import DbModelSpec, GenerationRequest, create_app, generate_archive, \
+    load_declarative_classes
+from src.fastapi_quickcrud_codegen.utils.model_source import class_sources
+
+SOURCE_TEMPLATE = '''from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_generator_service_{index}'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String, comment="a comment")
+    int4_value = Column(Integer, nullable=False)
+
+# not a declarative class
+class Helper:
+    pass
+'''
+
+
+def _request(index: int, database_url: str = "sqlite://") -> GenerationRequest:
+    return GenerationRequest(source=SOURCE_TEMPLATE.format(index=index),
+                             db_models=[DbModelSpec(class_name="SampleTable",
+                                                    crud_methods=[CrudMethods.FIND_ONE, CrudMethods.CREATE_ONE])],
+                             database_url=database_url)
+
+
+def _unzip(archive: bytes) -> dict:
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        return {i: zip_file.read(i).decode() for i in zip_file.namelist()}
+
+
+class Testing(unittest.TestCase):
+    def test_class_sources(self):
+        self.assertEqual(class_sources(SOURCE_TEMPLATE.format(index=0)),
+                         {"SampleTable": SOURCE_TEMPLATE.format(index=0).split("\n\n\n")[1].split("\n\n")[0] + "\n",
+                          "Helper": "class Helper:\n    pass\n"})
+
+    def test_concurrent_generation(self):
+        expected = {index: _unzip(generate_archive(_request(index))) for index in range(4)}
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), ThreadPoolExecutor(max_workers=4) as executor:
+            archives = list(executor.map(lambda index: generate_archive(_request(index)), list(range(4)) * 2))
+        # the progress goes to the logger, nothing is printed
+        self.assertEqual(stdout.getvalue(), "")
+        for index, archive in enumerate(archives):
+            self.assertEqual(_unzip(archive), expected[index % 4])
+
+        project = expected[1]
+        self.assertIn("fastapi_quick_crud_template/app.py", project)
+        model_code = project["fastapi_quick_crud_template/model/test_generator_service_1.py"]
+        self.assertIn("__tablename__ = 'test_generator_service_1'", model_code)
+        self.assertNotIn("class Helper", model_code)
+        route_code = project["fastapi_quick_crud_template/route/test_generator_service_1.py"]
+        self.assertIn('prefix="/test_generator_service_1"', route_code)
+
+    def test_source_cache(self):
+        source = SOURCE_TEMPLATE.format(index=0)
+        self.assertIs(load_declarative_classes(source)["SampleTable"],
+                      load_declarative_classes(source)["SampleTable"])
+        self.assertEqual(list(load_declarative_classes(source)), ["SampleTable"])
+
+    def test_invalid_request(self):
+        with self.assertRaises(HTTPException) as context:
+            generate_archive(GenerationRequest(source="class Broken(", db_models=[], database_url="sqlite://"))
+        self.assertEqual(context.exception.status_code, 422)
+
+        request = _request(0)
+        request.db_models[0].class_name = "Helper"
+        with self.assertRaises(HTTPException) as context:
+            generate_archive(request)
+        self.assertEqual(context.exception.status_code, 422)
+
+        with self.assertRaises(HTTPException) as context:
+            generate_archive(_request(0, database_url="unknown://"))
+        self.assertEqual(context.exception.status_code, 422)
+
+    def test_bundle_layout(self):
+        request = _request(0)
+        request.layout = ProjectLayout.bundle
+        project = _unzip(generate_archive(request))
+        self.assertIn("fastapi_quick_crud_template/models.py", project)
+        self.assertNotIn("fastapi_quick_crud_template/model/test_generator_service_0.py", project)
+
+        request.startup_probe = True
+        with self.assertRaises(HTTPException) as context:
+            generate_archive(request)
+        self.assertEqual(context.exception.status_code, 422)
+
+    def test_app(self):
+        app = create_app()
+        self.assertIn("/generate", app.openapi()["paths"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+import unittest
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HEAVY_PACKAGES = {'sqlalchemy', 'pydantic', 'jinja2', 'fastapi', 'starlette'}
+
+
+def imported_packages(statement: str) -> set:
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=REPOSITORY_ROOT,
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    packages = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            module = line.rsplit('|', 1)[1].strip()
+            packages.add(module.split('.')[0])
+    return packages
+
+
+class Testing(unittest.TestCase):
+    def test_import_package(self):
+        assert not imported_packages('import src.fastapi_quickcrud_codegen') & HEAVY_PACKAGES
+
+    def test_import_db_model(self):
+        assert not imported_packages('from src.fastapi_quickcrud_codegen import DbModel, CrudMethods') & \
+                   HEAVY_PACKAGES
+
+    def test_import_builder(self):
+        assert 'jinja2' in imported_packages('from src.fastapi_quickcrud_codegen import crud_router_builder')
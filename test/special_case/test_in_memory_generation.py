@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_builder, crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from test.misc.common import *
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_in_memory_one'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    bool_value = Column(Boolean, nullable=False, default=False)
+    varchar_value = Column(String)
+
+
+class SampleTableTwo(Base):
+    __tablename__ = 'test_in_memory_two'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    int4_value = Column(Integer, nullable=False)
+
+
+model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"]),
+              DbModel(db_model=SampleTableTwo, prefix="/two", tags=["sample api"])]
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.output_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_directory)
+
+    def test_same_as_written_project(self):
+        project = crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://")
+        assert not os.path.exists(template_root_directory)
+
+        crud_router_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                            output_directory=self.output_directory)
+        written_project = {}
+        for directory, _, file_names in os.walk(self.output_directory):
+            for file_name in file_names:
+                path = os.path.join(directory, file_name)
+                with open(path) as f:
+                    written_project[os.path.relpath(path, self.output_directory)] = f.read()
+        assert not os.path.exists(template_root_directory)
+        assert project == written_project
+        assert 'api = APIRouter(tags=[\'sample api\'],prefix="/two")' in project['route/test_in_memory_two.py']
@@ -0,0 +1,90 @@
+import shutil
+import unittest
+from unittest import mock
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.misc.type import CrudMethods
+from src.fastapi_quickcrud_codegen.utils import manifest
+from src.fastapi_quickcrud_codegen.utils.manifest import generator_digest
+from src.fastapi_quickcrud_codegen.utils.progress import progress_handler
+from test.misc.common import *
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_incremental_one'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String)
+
+
+class SampleTableTwo(Base):
+    __tablename__ = 'test_incremental_two'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    int4_value = Column(Integer, nullable=False)
+
+
+def generate(second_prefix, incremental=True):
+    model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"],
+                          crud_methods=[CrudMethods.FIND_ONE]),
+                  DbModel(db_model=SampleTableTwo, prefix=second_prefix, tags=["sample api"],
+                          crud_methods=[CrudMethods.FIND_ONE])]
+    crud_router_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                        incremental=incremental)
+
+
+def snapshot():
+    result = {}
+    for directory, _, file_names in os.walk(template_root_directory):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            with open(path) as f:
+                result[os.path.relpath(path, template_root_directory)] = (os.stat(path).st_mtime_ns, f.read())
+    return result
+
+
+class Testing(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(template_root_directory)
+
+    def test_only_changed_model_is_generated(self):
+        generate("/two")
+        first_run = snapshot()
+
+        generate("/two")
+        assert snapshot() == first_run
+
+        generate("/changed")
+        third_run = snapshot()
+        changed_files = {i for i in third_run if third_run[i] != first_run.get(i)}
+        assert changed_files == {'model/test_incremental_two.py', 'route/test_incremental_two.py',
+                                 '.codegen_manifest.json'}
+        assert 'prefix="/changed"' in third_run['route/test_incremental_two.py'][1]
+        assert third_run['route/test_incremental_two.py'][1].count('api = APIRouter') == 1
+
+    def test_full_run_updates_manifest(self):
+        generate("/a")
+        generate("/b", incremental=False)
+        generate("/a")
+        with open(os.path.join(template_root_directory, 'route/test_incremental_two.py')) as f:
+            assert 'prefix="/a"' in f.read()
+
+    def test_generator_change(self):
+        generate("/two")
+        messages = []
+        with progress_handler(messages.append):
+            generate("/two")
+            assert [i for i in messages if "it is up to date" in i]
+            messages.clear()
+            # another version of the generator
+            generator_digest.cache_clear()
+            with mock.patch.object(manifest, "GENERATOR_ROOT_DIRECTORY", os.path.dirname(manifest.__file__)):
+                generate("/two")
+            generator_digest.cache_clear()
+        assert not [i for i in messages if "it is up to date" in i]
@@ -0,0 +1,45 @@
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_parallel_one'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    bool_value = Column(Boolean, nullable=False, default=False)
+    float4_value = Column(Float, nullable=False)
+    varchar_value = Column(String)
+
+
+class SampleTableTwo(Base):
+    __tablename__ = 'test_parallel_two'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    int4_value = Column(Integer, nullable=False)
+
+
+class SampleTableThree(Base):
+    __tablename__ = 'test_parallel_three'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    text_value = Column(Text)
+
+
+def generate(**kwargs):
+    model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"]),
+                  DbModel(db_model=SampleTableTwo, prefix="/two", tags=["sample api"]),
+                  DbModel(db_model=SampleTableThree, prefix="/three", tags=["sample api"])]
+    return crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://", **kwargs)
+
+
+class Testing(unittest.TestCase):
+    def test_thread_pool(self):
+        assert generate(workers=3) == generate()
+
+    def test_process_pool(self):
+        assert generate(workers=2, use_process_pool=True) == generate()
@@ -0,0 +1,91 @@
+import json
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.misc.type import CountStrategy, CrudMethods, Pagination
+from test.misc.generated_app import REQUESTS_MAIN, build_project, run_app
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_projection'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String, nullable=False)
+    int4_value = Column(Integer, nullable=False)
+    text_value = Column(Text)
+
+
+ROWS = [{"varchar_value": str(i), "int4_value": i % 3, "text_value": "a long text " * 10} for i in range(5)]
+
+
+def _model_list(**kwargs) -> list:
+    return [DbModel(db_model=SampleTable, prefix="/test", tags=["test"], projection=True,
+                    crud_methods=[CrudMethods.FIND_ONE, CrudMethods.FIND_MANY, CrudMethods.CREATE_MANY], **kwargs)]
+
+
+REQUESTS = [
+    ["/test", [("limit", 2)]],
+    ["/test", [("limit", 2), ("fields", "primary_key"), ("fields", "text_value")]],
+    ["/test", [("fields", "int4_value"), ("order_by_columns", "int4_value:DESC"), ("limit", 2)]],
+    ["/test", [("fields", "unknown")]],
+    ["/test/1", []],
+    ["/test/1", [("fields", "int4_value")]],
+]
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.work_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory)
+
+    def _request_app(self, model_list: list) -> tuple:
+        """
+        :return: [status, body] of REQUESTS and the output of the app, the sql statements are echoed into it
+        """
+        project_directory = build_project(self.work_directory, model_list)
+        responses, output = run_app(project_directory, REQUESTS_MAIN, rows=ROWS, path="/test", requests=REQUESTS)
+        return [[i["status"], json.loads(i["body"])] for i in responses], output
+
+    def test_default_unchanged(self):
+        model_list = _model_list()
+        model_list[0].projection = False
+        project = crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://")
+        self.assertNotIn("fields: Optional[List[str]]", project["route/test_projection.py"])
+        self.assertIn("int4_value: int = Body(...)", project["model/test_projection.py"])
+
+    def test_projection(self):
+        for kwargs in [{}, {"count_strategy": CountStrategy.window}]:
+            responses, output = self._request_app(_model_list(**kwargs))
+            # the text column is only selected on request
+            self.assertEqual([sorted(i) for i in responses[0][1]["result"]],
+                             [["int4_value", "primary_key", "varchar_value"]] * 2)
+            first_select = output[output.index("SELECT test_projection."):].split("\nFROM")[0]
+            self.assertTrue(first_select.startswith("SELECT test_projection.primary_key, "
+                                                    "test_projection.varchar_value, test_projection.int4_value"),
+                            first_select)
+            self.assertNotIn("text_value", first_select)
+            self.assertEqual(responses[1][1]["result"], [{"primary_key": 1, "text_value": ROWS[0]["text_value"]},
+                                                         {"primary_key": 2, "text_value": ROWS[1]["text_value"]}])
+            self.assertEqual(responses[2][1], {"total": 5, "result": [{"int4_value": 2}, {"int4_value": 1}]})
+            self.assertEqual(responses[3][0], 400)
+            self.assertEqual(responses[4][1], dict(ROWS[0], primary_key=1))
+            self.assertEqual(responses[5][1], {"int4_value": 0})
+
+    def test_cursor_projection(self):
+        responses, _ = self._request_app(_model_list(pagination=Pagination.cursor))
+        self.assertEqual(responses[2][1]["result"], [{"int4_value": 2}, {"int4_value": 1}])
+        self.assertTrue(responses[2][1]["next_cursor"])
+
+
+if __name__ == '__main__':
+    unittest.main()
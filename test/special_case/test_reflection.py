@@ -0,0 +1,63 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import warnings
+
+from src.fastapi_quickcrud_codegen import crud_router_builder_from_metadata
+from src.fastapi_quickcrud_codegen.reflection import reflect_metadata
+
+SCHEMA = '''
+create table customer (id integer primary key, name varchar(50) not null, note text,
+                       created_at datetime default CURRENT_TIMESTAMP, unique(name));
+create table invoice (id integer primary key, customer_id integer references customer(id),
+                      amount numeric(10, 2), "paid at" datetime, attachment blob);
+create table no_pk (value integer);
+create table link (customer_id integer, invoice_id integer, primary key (customer_id, invoice_id));
+create table tmp_import (id integer primary key);
+'''
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.database_path = os.path.join(self.directory, 'legacy.db')
+        with sqlite3.connect(self.database_path) as connection:
+            connection.executescript(SCHEMA)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_reflect_with_patterns(self):
+        metadata = reflect_metadata(self.database_path, include=['*'], exclude=['tmp_*'])
+        assert set(metadata.tables) == {'customer', 'invoice', 'no_pk', 'link'}
+
+    def test_reflect_async_url(self):
+        metadata = reflect_metadata(f'sqlite+aiosqlite:///{self.database_path}', exclude=['tmp_*'])
+        assert set(metadata.tables) == {'customer', 'invoice', 'no_pk', 'link'}
+
+    def test_generate_from_database(self):
+        output_directory = os.path.join(self.directory, 'project')
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            db_model_list = crud_router_builder_from_metadata(database_url="sqlite://",
+                                                              source=self.database_path,
+                                                              is_async=False,
+                                                              exclude=['tmp_*'],
+                                                              output_directory=output_directory)
+        messages = [str(i.message) for i in caught_warnings]
+        assert 'Skip table no_pk: it has no primary key' in messages
+        assert 'Skip table link: composite primary key is not supported' in messages
+        assert [i.db_model.__tablename__ for i in db_model_list] == ['customer', 'invoice']
+        assert db_model_list[1].exclude_columns == ['attachment']
+
+        with open(os.path.join(output_directory, 'model', 'invoice.py')) as f:
+            model_code = f.read()
+        assert "class Invoice(Base):" in model_code
+        assert "customer_id = Column(INTEGER(), ForeignKey('customer.id'), nullable=True)" in model_code
+        assert "paid_at = Column('paid at', DATETIME(), nullable=True, key='paid_at')" in model_code
+        compile(model_code, 'invoice.py', 'exec')
+        with open(os.path.join(output_directory, 'model', 'customer.py')) as f:
+            assert "server_default=text('CURRENT_TIMESTAMP')" in f.read()
+        assert not os.path.exists(os.path.join(output_directory, 'route', 'tmp_import.py'))
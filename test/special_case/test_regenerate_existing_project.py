@@ -0,0 +1,42 @@
+import shutil
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from test.misc.common import *
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_regenerate'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String)
+
+
+def generate():
+    crud_router_builder(db_model_list=[DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"])],
+                        is_async=False,
+                        database_url="sqlite://")
+    project = {}
+    for directory, _, file_names in os.walk(template_root_directory):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            with open(path) as f:
+                project[os.path.relpath(path, template_root_directory)] = f.read()
+    return project
+
+
+class Testing(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(template_root_directory)
+
+    def test_regenerate_does_not_append(self):
+        first_run = generate()
+        assert generate() == first_run
+        assert not [i for i in first_run if i.endswith('.tmp')]
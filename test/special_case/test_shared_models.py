@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from test.misc.generated_app import build_project, run_app
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_shared_models'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    bool_value = Column(Boolean, nullable=False, default=False)
+    varchar_value = Column(String, comment="a comment")
+    int4_value = Column(Integer, nullable=False)
+
+
+model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"])]
+
+# the response model of every route, field by field, and the number of pydantic classes of the model module
+DESCRIBE_MAIN = """
+import inspect
+import typing
+
+import pydantic
+import model.test_shared_models as model_module
+
+
+def shape(type_):
+    if inspect.isclass(type_) and issubclass(type_, pydantic.BaseModel):
+        return {name: [shape(field.outer_type_), field.required, repr(field.default), field.field_info.description]
+                for name, field in type_.__fields__.items()}
+    if typing.get_origin(type_):
+        return [repr(typing.get_origin(type_)), [shape(i) for i in typing.get_args(type_)]]
+    return repr(type_)
+
+
+async def main():
+    routes = {f"{sorted(route.methods)} {route.path}": shape(route.response_model) for route in app.routes
+              if getattr(route, "response_model", None)}
+    classes = {id(value) for value in vars(model_module).values() if inspect.isclass(value)
+               and issubclass(value, pydantic.BaseModel) and value.__module__ == model_module.__name__}
+    return {"routes": routes, "classes": len(classes)}
+"""
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.work_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_directory)
+
+    def _describe_app(self, shared_models):
+        project_directory = build_project(self.work_directory, model_list, shared_models=shared_models)
+        return run_app(project_directory, DESCRIBE_MAIN)[0]
+
+    def test_same_response_models_with_less_classes(self):
+        separate = self._describe_app(shared_models=False)
+        shared = self._describe_app(shared_models=True)
+        assert shared["routes"] == separate["routes"]
+        assert shared["classes"] < separate["classes"]
+
+    def test_aliases_and_subclasses(self):
+        project = crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                                           shared_models=True)
+        code = project['model/test_shared_models.py']
+        assert 'class SampleTableResponseModel(BaseModel):' in code
+        assert 'SampleTableFindOneResponseModel = SampleTableResponseModel\n' in code
+        assert 'SampleTableDeleteManyItemResponseModel = SampleTableResponseModel\n' in code
+        # the create response model keeps the description of the column
+        assert 'class SampleTableCreateManyItemResponseModel(SampleTableResponseModel):' in code
+        assert 'varchar_value: str = Body(None, description="a comment")' in code
+        assert 'SampleTableDeleteManyItemListResponseModel = SampleTablePatchManyItemListResponseModel\n' in code
+
+    def test_default_is_unchanged(self):
+        project = crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://")
+        assert 'SampleTableResponseModel' not in project['model/test_shared_models.py']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_builder, crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.misc.type import CrudMethods
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_startup_probe_one'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String)
+
+
+class SampleTableTwo(Base):
+    __tablename__ = 'test_startup_probe_two'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    int4_value = Column(Integer, nullable=False)
+
+
+model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"]),
+              DbModel(db_model=SampleTableTwo, prefix="/two", tags=["sample api"],
+                      crud_methods=[CrudMethods.FIND_ONE, CrudMethods.FIND_MANY])]
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.output_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_directory)
+
+    def _run_probe(self, *args):
+        return subprocess.run([sys.executable, "startup_probe.py", *args], cwd=self.output_directory,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+    def test_report_by_table(self):
+        crud_router_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                            output_directory=self.output_directory, startup_probe=True, startup_budget=60)
+        result = self._run_probe("--output", "report.json")
+        assert result.returncode == 0, result.stderr
+        with open(os.path.join(self.output_directory, "report.json")) as f:
+            report = json.load(f)
+        assert report["budget_seconds"] == 60
+        assert list(report["tables"]) == ["test_startup_probe_one", "test_startup_probe_two"]
+        assert report["tables"]["test_startup_probe_two"]["routes"] == 2
+        assert report["tables"]["test_startup_probe_one"]["pydantic_classes"] > 0
+        assert report["total_seconds"] > 0
+        assert "model.test_startup_probe_one" in report["import_time"]
+        assert "route.test_startup_probe_two" in report["import_time"]
+
+    def test_budget_exceeded(self):
+        crud_router_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                            output_directory=self.output_directory, startup_probe=True)
+        result = self._run_probe("--budget", "0.000001")
+        assert result.returncode == 1
+        assert "startup budget exceeded" in result.stdout
+
+    def test_not_generated_by_default(self):
+        project = crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://")
+        assert "startup_probe.py" not in project
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_builder, crud_router_code_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_static_openapi'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    bool_value = Column(Boolean, nullable=False, default=False)
+    varchar_value = Column(String)
+
+
+model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"])]
+
+# the served schema must be the document on disk, not one built by FastAPI
+CHECK_SERVED_SCHEMA = """
+import json
+from app import app, OPENAPI_PATH
+with open(OPENAPI_PATH) as f:
+    assert app.openapi() == json.load(f)
+app.openapi_schema = None
+assert app.openapi() == json.load(open(OPENAPI_PATH))
+"""
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.output_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_directory)
+
+    def test_openapi_document_is_generated(self):
+        crud_router_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                            output_directory=self.output_directory, static_openapi=True)
+        with open(os.path.join(self.output_directory, 'openapi.json')) as f:
+            document = json.load(f)
+        assert '/one/{primary_key}' in document['paths']
+        assert 'varchar_value____str' in json.dumps(document['paths']['/one']['get'])
+
+        subprocess.run([sys.executable, "-c", CHECK_SERVED_SCHEMA], cwd=self.output_directory, check=True,
+                       stdout=subprocess.DEVNULL)
+
+    def test_in_memory_project(self):
+        project = crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                                           static_openapi=True)
+        assert '/one' in json.loads(project['openapi.json'])['paths']
+        assert 'load_openapi_schema()' in project['app.py']
+
+    def test_default_app_is_unchanged(self):
+        project = crud_router_code_builder(db_model_list=model_list, is_async=False, database_url="sqlite://")
+        assert 'openapi.json' not in project
+        assert project['app.py'].endswith('\n\nuvicorn.run(app, host="0.0.0.0", port=8000)')
+
+    def test_failed_app_import_is_a_warning(self):
+        with self.assertWarns(UserWarning):
+            project = crud_router_code_builder(db_model_list=model_list, is_async=True,
+                                               database_url="postgresql+no_such_driver://localhost/db",
+                                               static_openapi=True)
+        assert 'openapi.json' not in project
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy import *
+from sqlalchemy.orm import declarative_base
+
+from src.fastapi_quickcrud_codegen import crud_router_builder
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from src.fastapi_quickcrud_codegen.generator.output_sink import FileSystemOutputSink, OutputSink
+from src.fastapi_quickcrud_codegen.model.template_registry import get_template
+from src.fastapi_quickcrud_codegen.utils.code_buffer import CodeBuffer
+from src.fastapi_quickcrud_codegen.utils.create_file import create_folder
+
+Base = declarative_base()
+metadata = Base.metadata
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_streaming_output'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String)
+
+
+model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"])]
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.output_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_directory)
+
+    def test_code_buffer_is_same_as_render(self):
+        template = get_template('common/app.jinja2')
+        context = {"model_list": [{"model_name": "a", "file_name": "A"}]}
+        code = CodeBuffer("header\n")
+        code.render(template, context)
+        assert str(code) == "header\n" + template.render(context)
+        assert "".join(code) == str(code)
+
+    def test_chunks_are_written_on_flush(self):
+        for workers in [None, 2]:
+            output_directory = os.path.join(self.output_directory, str(workers))
+            sink = FileSystemOutputSink(output_directory, workers=workers)
+            sink.add('route/a.py', iter(["first ", "second"]))
+            sink.add('route/a.py', " third")
+            sink.add('route/__init__.py', "")
+            # nothing touches the disk while the code is rendered
+            assert not os.path.exists(output_directory)
+            with mock.patch('src.fastapi_quickcrud_codegen.generator.output_sink.create_folder',
+                            side_effect=create_folder) as create_folder_mock:
+                sink.flush()
+            create_folder_mock.assert_called_once_with(os.path.join(output_directory, 'route'))
+            assert _read(os.path.join(output_directory, 'route', 'a.py')) == "first second third"
+            assert _read(os.path.join(output_directory, 'route', '__init__.py')) == ""
+            assert sorted(os.listdir(os.path.join(output_directory, 'route'))) == ['__init__.py', 'a.py']
+
+    def test_in_memory_sink_joins_chunks(self):
+        sink = OutputSink()
+        sink.add('a.py', iter(["first ", "second"]))
+        sink.add('a.py', " third")
+        assert sink.artifacts == {'a.py': "first second third"}
+
+    def test_failed_generation_keeps_previous_project(self):
+        crud_router_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                            output_directory=self.output_directory)
+        app_path = os.path.join(self.output_directory, 'app.py')
+        previous_app = _read(app_path)
+
+        with mock.patch('src.fastapi_quickcrud_codegen.crud_generator.CommonCodeGen.build_app',
+                        side_effect=RuntimeError("broken template")):
+            with self.assertRaises(RuntimeError):
+                crud_router_builder(db_model_list=model_list, is_async=False, database_url="sqlite://",
+                                    output_directory=self.output_directory)
+
+        assert _read(app_path) == previous_app
+        for directory, _, file_names in os.walk(self.output_directory):
+            assert not [i for i in file_names if i.endswith('.tmp')]
+
+
+if __name__ == '__main__':
+    unittest.main()
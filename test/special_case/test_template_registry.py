@@ -0,0 +1,39 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.fastapi_quickcrud_codegen.model.template_registry import TemplateRegistry, COMPILED_TEMPLATE_MANIFEST, \
+    get_template
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.compiled_template_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.compiled_template_dir)
+
+    def test_template_is_compiled_once(self):
+        assert get_template('route/find_one.jinja2') is get_template('route/find_one.jinja2')
+
+    def test_compiled_bundle(self):
+        source_registry = TemplateRegistry(compiled_template_dir=self.compiled_template_dir)
+        source_registry.compile()
+
+        compiled_registry = TemplateRegistry(compiled_template_dir=self.compiled_template_dir)
+        assert compiled_registry.environment.loader.__class__.__name__ == 'ModuleLoader'
+        context = {"model_name": "SampleTable", "path": "/{primary_key}", "is_async": True}
+        for name in ['route/find_one.jinja2', 'route/find_many.jinja2', 'route/delete_many.jinja2']:
+            assert compiled_registry.get_template(name).render(context) == \
+                   TemplateRegistry(compiled_template_dir=Path(tempfile.gettempdir()) / 'missing').get_template(
+                       name).render(context)
+
+    def test_stale_compiled_bundle_is_ignored(self):
+        TemplateRegistry(compiled_template_dir=self.compiled_template_dir).compile()
+        manifest_path = self.compiled_template_dir / COMPILED_TEMPLATE_MANIFEST
+        manifest_path.write_text(json.dumps({'digest': 'stale'}))
+
+        registry = TemplateRegistry(compiled_template_dir=self.compiled_template_dir)
+        assert registry.environment.loader.__class__.__name__ == 'FileSystemLoader'
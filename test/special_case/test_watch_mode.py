@@ -0,0 +1,107 @@
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+from src.fastapi_quickcrud_codegen.cli import ModelWatcher, build_parser
+from src.fastapi_quickcrud_codegen.utils.progress import progress_handler
+
+BASE_SOURCE = '''
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+'''
+
+MODELS_SOURCE = '''
+from sqlalchemy import *
+from test_watch_base import Base
+
+
+class SampleTable(Base):
+    __tablename__ = 'test_watch_one'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    varchar_value = Column(String)
+
+
+class SampleTableTwo(Base):
+    __tablename__ = 'test_watch_two'
+    primary_key = Column(Integer, primary_key=True, autoincrement=True)
+    int4_value = Column(Integer, nullable=False)
+'''
+
+LIST_SOURCE = '''
+from src.fastapi_quickcrud_codegen.db_model import DbModel
+from test_watch_models import SampleTable, SampleTableTwo
+
+is_async = False
+database_url = "sqlite://"
+db_model_list = [DbModel(db_model=SampleTable, prefix="/one", tags=["sample api"]),
+                 DbModel(db_model=SampleTableTwo, prefix="/two", tags=["sample api"])]
+'''
+
+
+class Testing(unittest.TestCase):
+    def setUp(self):
+        self.source_directory = tempfile.mkdtemp()
+        self.output_directory = tempfile.mkdtemp()
+        for file_name, source in [('test_watch_base.py', BASE_SOURCE), ('test_watch_models.py', MODELS_SOURCE),
+                                  ('test_watch_list.py', LIST_SOURCE)]:
+            self.write(file_name, source)
+
+    def tearDown(self):
+        for module_name in ['test_watch_base', 'test_watch_models', 'test_watch_list']:
+            sys.modules.pop(module_name, None)
+        if self.source_directory in sys.path:
+            sys.path.remove(self.source_directory)
+        shutil.rmtree(self.source_directory)
+        shutil.rmtree(self.output_directory)
+
+    def write(self, file_name, source):
+        path = os.path.join(self.source_directory, file_name)
+        modification_time = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        with open(path, 'w') as f:
+            f.write(textwrap.dedent(source))
+        if modification_time is not None:
+            os.utime(path, ns=(modification_time + 10 ** 9, modification_time + 10 ** 9))
+
+    def read_output(self):
+        result = {}
+        for file_name in ['route/test_watch_one.py', 'route/test_watch_two.py', 'model/test_watch_two.py']:
+            path = os.path.join(self.output_directory, file_name)
+            with open(path) as f:
+                result[file_name] = (os.stat(path).st_mtime_ns, f.read())
+        return result
+
+    def test_regenerate_changed_model(self):
+        watcher = ModelWatcher(os.path.join(self.source_directory, 'test_watch_list.py'),
+                               output_directory=self.output_directory)
+        watcher.generate()
+        first_run = self.read_output()
+        assert not watcher.poll()
+
+        self.write('test_watch_models.py', MODELS_SOURCE.replace("int4_value = Column(Integer, nullable=False)",
+                                                                 "int4_value = Column(Integer, nullable=False)\n"
+                                                                 "    text_value = Column(Text)"))
+        assert watcher.poll()
+        second_run = self.read_output()
+        assert second_run['route/test_watch_one.py'] == first_run['route/test_watch_one.py']
+        assert 'text_value' not in first_run['model/test_watch_two.py'][1]
+        assert 'text_value' in second_run['model/test_watch_two.py'][1]
+        assert not watcher.poll()
+
+    def test_status_goes_to_progress_handler(self):
+        watcher = ModelWatcher(os.path.join(self.source_directory, 'test_watch_list.py'),
+                               output_directory=self.output_directory)
+        messages = []
+        with progress_handler(messages.append), mock.patch('time.sleep', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                watcher.watch()
+        assert messages[-1].startswith('\nWatching ')
+
+    def test_parser(self):
+        args = build_parser().parse_args(['watch', 'my_models.py', '--async', '--database-url', 'sqlite://'])
+        assert (args.target, args.is_async, args.database_url, args.attribute) == \
+               ('my_models.py', True, 'sqlite://', 'db_model_list')